@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import asyncio
+import argparse
+
+from utils import KeyboardHandler
+from main import GameOfLifeController
+import patterns
+
+
+class AsyncGameOfLifeController(GameOfLifeController):
+    """
+    Controller on an asyncio loop: stdin is a loop reader, generations and
+    frames are separate tasks, and every control source goes through
+    command(). Nothing polls, a paused or sleeping game just waits on events.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stop = None
+        self._resume = None # set while running, cleared while paused
+        self._wake = None   # cuts a tick's sleep short
+        self._dirty = None  # there is something new to draw
+        self._clients = {}  # control socket writer -> its handler task
+
+    ## ---------------------------------------
+    def command(self, key):
+        """
+        Apply one control key, from the keyboard or any other source
+
+        :param key: Str - 'q', ' ', '+', '-' or 's', anything else is ignored
+        :return: Bool - True if the key was a command
+        """
+        if key.lower() == 'q':
+            self._stop.set()
+        elif key == ' ':
+            self.engine.toggle_pause()
+            if self.engine.paused:
+                self._resume.clear()
+            else:
+                self._resume.set()
+        elif key == '+': # + speed (decrease delay)
+            self.engine.adjust_speed(-0.05)
+        elif key == '-': # - speed (increase delay)
+            self.engine.adjust_speed(0.05)
+        elif key == 's': # save the current generation
+            self.export()
+        else:
+            return False
+        self._wake.set()
+        self._dirty.set()
+        return True
+
+    def _read_stdin(self):
+        """Loop reader callback, stdin has bytes"""
+        data = os.read(sys.stdin.fileno(), 1024)
+        if not data: # stdin closed
+            asyncio.get_running_loop().remove_reader(sys.stdin.fileno())
+            return
+        for key in data.decode(errors='ignore'):
+            self.command(key)
+
+    async def _handle_client(self, reader, writer):
+        """Control socket client, every byte it sends is a key"""
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while data := await reader.read(1024):
+                for key in data.decode(errors='ignore'):
+                    self.command(key)
+                writer.write(f"Gen {self.engine.generation} | paused {self.engine.paused} | speed {self.engine.tsleep:.2f}\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._clients.pop(writer, None)
+    ## ---------------------------------------
+
+    async def _tick(self, gens):
+        """Generation task"""
+        while True:
+            await self._resume.wait()
+            self.engine.update_generation()
+            self._auto_checkpoint()
+            self._dirty.set()
+            if self._pause_on_cycle():
+                self._resume.clear()
+
+            if gens and self.engine.generation >= gens:
+                self._stop.set()
+                return
+            # sleep tsleep or until a command wakes us, tsleep 0 still yields
+            # so keys and frames get their turn
+            timer = asyncio.get_running_loop().call_later(self.engine.tsleep, self._wake.set)
+            await self._wake.wait()
+            self._wake.clear()
+            timer.cancel()
+
+    async def _render(self, fps):
+        """Frame task, at most fps frames a second of the newest generation"""
+        drawn = None
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            grid_state = self.engine.get_grid_state()
+            self.display.print_grid(grid_state)
+            if drawn is not None:
+                self.frames_dropped += max(0, grid_state['generation'] - drawn - 1)
+            drawn = grid_state['generation']
+            self.frames_drawn += 1
+            await asyncio.sleep(1 / fps)
+
+    async def run(self, delay=0.2, gens=1000, fps=30, control_socket=None):
+        """
+        Run the game until q, the generation limit or Ctrl-C
+
+        :param delay: Float - Delay between generations
+        :param gens: Int - Stop after this many generations (0 to run forever)
+        :param fps: Int - Target frames per second
+        :param control_socket: Str - Unix socket path that also accepts keys
+        """
+        loop = asyncio.get_running_loop()
+        self.engine.tsleep = delay
+        self._stop = asyncio.Event()
+        self._resume = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._dirty = asyncio.Event()
+        if not self.engine.paused:
+            self._resume.set()
+        self._dirty.set()
+
+        self.keyboard_handler = KeyboardHandler(use_thread=False)
+        self.keyboard_handler.start()
+        loop.add_reader(sys.stdin.fileno(), self._read_stdin)
+        server = None
+        if control_socket:
+            server = await asyncio.start_unix_server(self._handle_client, path=control_socket)
+
+        self.display.hide_cursor()
+        self.display.clear_screen()
+        tasks = [
+            asyncio.create_task(self._tick(gens)),
+            asyncio.create_task(self._render(fps)),
+        ]
+        try:
+            await self._stop.wait()
+            # last generation on screen before leaving
+            self.display.print_grid(self.engine.get_grid_state())
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if server:
+                server.close()
+                # closing a client ends its handler's read loop
+                handlers = list(self._clients.values())
+                for writer in list(self._clients):
+                    writer.close()
+                await asyncio.gather(*handlers, return_exceptions=True)
+                await server.wait_closed()
+                os.unlink(control_socket)
+            loop.remove_reader(sys.stdin.fileno())
+            self.keyboard_handler.terminate()
+            self.close()
+            self.display.show_cursor()
+
+
+def main():
+    """Run the asyncio controller"""
+    parser = argparse.ArgumentParser(description="Game of Life on an asyncio loop")
+    parser.add_argument('--rows', type=int, default=None)
+    parser.add_argument('--cols', type=int, default=None)
+    parser.add_argument('--mode', default='original', choices=['original', 'other'])
+    parser.add_argument('--backend', default='object')
+    parser.add_argument('--rule', default=None, help="B/S rulestring or name such as highlife")
+    parser.add_argument('--delay', type=float, default=0.2)
+    parser.add_argument('--gens', type=int, default=0, help="0 runs until q")
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--control-socket', default=None, help="unix socket that also accepts keys")
+    parser.add_argument('--pattern', default=None, help="start from a .rle, .cells or .lif file")
+    parser.add_argument('--resume', default=None, help="carry on from a checkpoint file")
+    parser.add_argument('--checkpoint', default=None, help="checkpoint file (default gol.ckpt)")
+    parser.add_argument('--checkpoint-every', type=int, default=0, help="generations between checkpoints, 0 for never")
+    parser.add_argument('--record', default=None, help="record every generation to this file")
+    parser.add_argument('--keyframe-every', type=int, default=64, help="recording frames between keyframes")
+    parser.add_argument('--compress', default=None, choices=['zlib', 'lzma'], help="compress recording frames")
+    parser.add_argument('--hud', action='store_true', help="show phase timings and counts on the status line")
+    parser.add_argument('--profile', default=None, help="save per generation timings to this .csv or .json file")
+    args = parser.parse_args()
+
+    pattern = patterns.load(args.pattern) if args.pattern else None
+    rule, mode, backend = args.rule or (pattern and pattern.rule), args.mode, args.backend
+    if args.resume:
+        import checkpoint # needs numpy
+        header = checkpoint.read_header(args.resume)
+        rule, mode = header.rule, header.mode
+        if header.multistate:
+            backend = 'generations'
+    rec = None
+    if args.record:
+        import recorder # needs numpy
+        rec = recorder.Recorder(args.record, args.keyframe_every, args.compress)
+    prof = None
+    if args.hud or args.profile:
+        from profiler import Profiler
+        prof = Profiler(args.profile, hud=args.hud)
+    controller = AsyncGameOfLifeController(
+        mode=mode, rows=args.rows, cols=args.cols, backend=backend, rule=rule,
+        checkpoint_path=args.checkpoint or args.resume, checkpoint_every=args.checkpoint_every,
+        recorder=rec, profiler=prof
+    )
+    controller.setup_game(fullscreen=not (args.rows or args.cols or args.resume), pattern=pattern, resume=args.resume)
+    try:
+        asyncio.run(controller.run(args.delay, args.gens, args.fps, args.control_socket))
+    except KeyboardInterrupt:
+        print("\nGame interrupted by user")
+
+
+if __name__ == "__main__":
+    main()
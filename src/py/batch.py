@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import random
+import argparse
+import importlib
+
+from utils import get_seed
+from engine import GameOfLifeEngine, backends
+import patterns
+
+
+# engines that replace GameOfLifeEngine instead of plugging in as a backend
+engines = {
+    'hashlife': ('hashlife', 'HashLifeEngine'),
+    'sparse': ('sparse', 'SparseEngine'),
+    'generations': ('generations', 'GenerationsEngine'),
+    'smoothlife': ('smoothlife', 'SmoothLifeEngine'),
+    'block': ('blocks', 'BlockEngine'),
+    'block-numpy': ('blocks', 'NumpyBlockEngine'),
+}
+
+
+def make_engine(mode='original', rows=None, cols=None, backend='object', tile_size=None, workers=None,
+                compact=False, rule=None, density=None, immortal=None):
+    """
+    Build the engine for a backend name, both backends and engines are accepted
+    
+    :param backend: Str - A key of engine.backends or of engines
+    :param density: Float - Chance of a live cell on random boards (None for 1 in 8)
+    :param immortal: Float - Chance of an immortal cell on random boards in 'other' mode (None for 1 in 100)
+    """
+    if backend in engines:
+        module, name = engines[backend]
+        cls = getattr(importlib.import_module(module), name)
+        engine = cls(mode=mode, rows=rows, cols=cols, rule=rule)
+    else:
+        engine = GameOfLifeEngine(
+            mode=mode,
+            rows=rows,
+            cols=cols,
+            backend=backend,
+            tile_size=tile_size,
+            workers=workers,
+            compact=compact,
+            rule=rule
+        )
+    if density is not None:
+        engine.density = density
+    if immortal is not None:
+        engine.immortal_ratio = immortal
+    return engine
+
+
+def run(seed, mode='original', rows=64, cols=64, gens=100, backend='object', tile_size=None, workers=None,
+        compact=False, rule=None, stop=True, pattern=None, save=None, resume=None, checkpoint_path=None,
+        checkpoint_every=0, record=None, keyframe_every=64, compression=None, profile=None, density=None,
+        immortal=None):
+    """
+    Run a board with no rendering and no keyboard, return a summary dict
+    
+    :param seed: Int - Seed of the random board (see seeding) and of the global RNG
+    :param gens: Int - Generations to run
+    :param rule: Str - Life-like rule (None for B3/S23)
+    :param stop: Bool - Stop early once the board died out or repeats
+    :param pattern: Str - Pattern file to start from instead of a random board,
+                    its rule is used unless rule is given
+    :param save: Str - Pattern file to write the last generation to
+    :param resume: Str - Checkpoint file to carry on from, gens more generations
+                   are run with its rule, mode and seed
+    :param checkpoint_path: Str - Checkpoint file, written every checkpoint_every
+                            generations and after the last one
+    :param record: Str - Recording file, every generation from the first one on
+    :param compression: Str - Recording payloads compressed with None, 'zlib' or 'lzma'
+    :param profile: Str - .csv or .json file for per generation phase timings,
+                    their totals are added to the summary
+    :param density: Float - Chance of a live cell on the random board (None for 1 in 8)
+    :param immortal: Float - Chance of an immortal cell on the random board in 'other' mode (None for 1 in 100)
+    """
+    if resume or checkpoint_path:
+        import checkpoint # needs numpy
+    if record:
+        import recorder
+    if resume:
+        header = checkpoint.read_header(resume)
+        seed, mode, rule = header.seed, header.mode, header.rule
+        if header.multistate:
+            backend = 'generations'
+    random.seed(seed)
+    if pattern:
+        pattern = patterns.load(pattern)
+        rule = rule or pattern.rule
+    engine = make_engine(mode, rows, cols, backend, tile_size, workers, compact, rule, density, immortal)
+    rec = prof = None
+    try:
+        t = time.perf_counter()
+        if resume:
+            checkpoint.restore(engine, resume)
+        else:
+            if not pattern:
+                engine.seed = seed # the same board on every backend
+            engine.initialize_grid(pattern)
+        init_time = time.perf_counter() - t
+        if record:
+            rec = recorder.Recorder(record, keyframe_every, compression)
+            rec.attach(engine)
+        if profile:
+            from profiler import Profiler
+            prof = Profiler(profile, hud=False)
+            prof.attach(engine)
+        
+        start = engine.generation
+        t = time.perf_counter()
+        for _ in range(gens):
+            if stop and engine.cycle:
+                break
+            engine.update_generation()
+            if checkpoint_every and checkpoint_path and engine.generation % checkpoint_every == 0:
+                checkpoint.save(engine, checkpoint_path)
+        if rec:
+            rec.close() # waits for the writer, part of the run
+        run_time = time.perf_counter() - t
+        if prof:
+            prof.close()
+        ran = engine.generation - start
+        cycle = engine.cycle
+        if checkpoint_path:
+            checkpoint.save(engine, checkpoint_path)
+        if save:
+            patterns.save(engine, save)
+        
+        summary = {
+            'seed': seed,
+            'pattern': pattern.path if pattern else None,
+            'resume': resume,
+            'mode': mode,
+            'rule': str(engine.rule),
+            'rows': engine.rows,
+            'cols': engine.cols,
+            'backend': backend,
+            'density': None if pattern or resume else engine.density,
+            'immortal': None if pattern or resume or mode == 'original' else engine.immortal_ratio,
+            'generations': engine.generation,
+            'population': engine.population(),
+            'outcome': cycle.kind if cycle else 'running',
+            'period': cycle.period if cycle else None,
+            'cycle_start': cycle.start if cycle else None,
+            'init_s': round(init_time, 6),
+            'run_s': round(run_time, 6),
+            'gens_per_s': round(ran / run_time, 3) if run_time else None,
+            'cells_per_s': round(ran * engine.rows * engine.cols / run_time) if run_time else None,
+        }
+        if prof:
+            summary['profile'] = prof.totals()
+        return summary
+    finally:
+        if rec:
+            rec.close()
+        if prof:
+            prof.detach()
+        engine.close()
+
+
+def run_ensemble(seed, boards, rows=64, cols=64, gens=100, rule=None, densities=(0.125,), stop=True):
+    """
+    Run boards random boards together on an ensemble.EnsembleEngine,
+    return a summary dict with per board lists
+
+    :param boards: Int - Number of boards
+    :param densities: Float[] - Live cell densities, boards are split evenly between them
+    :param stop: Bool - Stop early once every board died out or repeats
+    """
+    import numpy as np
+    from ensemble import EnsembleEngine # needs numpy
+    random.seed(seed)
+    engine = EnsembleEngine(boards, rows, cols, rule)
+    density = np.asarray(densities, dtype=float)[np.arange(boards) * len(densities) // boards]
+    t = time.perf_counter()
+    engine.initialize_grid(density=density)
+    init_time = time.perf_counter() - t
+    t = time.perf_counter()
+    results = engine.run(gens, stop)
+    run_time = time.perf_counter() - t
+    outcomes, counts = np.unique(results['outcome'], return_counts=True)
+    return {
+        'seed': seed,
+        'boards': boards,
+        'rule': str(engine.rule),
+        'rows': rows,
+        'cols': cols,
+        'generations': engine.generation,
+        'outcomes': {str(kind): int(n) for kind, n in zip(outcomes, counts)},
+        'init_s': round(init_time, 6),
+        'run_s': round(run_time, 6),
+        'gens_per_s': round(engine.generation / run_time, 3) if run_time else None,
+        'cells_per_s': round(engine.generation * boards * rows * cols / run_time) if run_time else None,
+        'density': density.tolist(),
+        **{name: values.tolist() for name, values in results.items()},
+    }
+
+
+def main(argv=None):
+    """Headless batch runner"""
+    parser = argparse.ArgumentParser(description="Run the Game of Life without the terminal UI")
+    parser.add_argument('--rows', type=int, default=64)
+    parser.add_argument('--cols', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=None, help="random if not given")
+    parser.add_argument('--mode', default='original', choices=['original', 'other'])
+    parser.add_argument('--gens', type=int, default=100)
+    parser.add_argument('--rule', default=None, help="B/S rulestring or name such as highlife (default B3/S23)")
+    parser.add_argument('--backend', default='object', choices=list(backends) + list(engines))
+    parser.add_argument('--tile-size', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--compact', action='store_true', help="object backend cells in a CellStore")
+    parser.add_argument('--pattern', default=None, help="start from a .rle, .cells or .lif file")
+    parser.add_argument('--save', default=None, help="write the last generation to a .rle, .cells or .lif file")
+    parser.add_argument('--resume', default=None, help="carry on from a checkpoint file for --gens more generations")
+    parser.add_argument('--checkpoint', default=None, help="checkpoint file, written after the run")
+    parser.add_argument('--checkpoint-every', type=int, default=0, help="also checkpoint every this many generations")
+    parser.add_argument('--record', default=None, help="record every generation to this file")
+    parser.add_argument('--keyframe-every', type=int, default=64, help="recording frames between keyframes")
+    parser.add_argument('--compress', default=None, choices=['zlib', 'lzma'], help="compress recording frames")
+    parser.add_argument('--profile', default=None, help="save per generation phase timings to this .csv or .json file")
+    parser.add_argument('--boards', type=int, default=None, help="run this many random boards as one ensemble")
+    parser.add_argument('--density', type=float, nargs='+', default=[0.125],
+                        help="live cell density, for an ensemble several with boards split evenly between them")
+    parser.add_argument('--immortal', type=float, default=None,
+                        help="chance of an immortal cell on the random board in other mode (default 0.01)")
+    parser.add_argument('--keep-going', action='store_true', help="run all gens even once the board repeats")
+    parser.add_argument('--output', default=None, help="append the summary as a JSON line to this file")
+    args = parser.parse_args(argv)
+    if args.backend == 'hashlife' and args.mode != 'original':
+        parser.error("--backend hashlife only runs --mode original, ImmortalCell has no quadtree form")
+    
+    seed = get_seed() if args.seed is None else args.seed
+    if args.boards:
+        summary = run_ensemble(seed, args.boards, args.rows, args.cols, args.gens, args.rule, args.density,
+                               stop=not args.keep_going)
+        if args.output:
+            with open(args.output, 'a') as f:
+                f.write(json.dumps(summary) + "\n")
+        print(f"Seed {summary['seed']} | ensemble {summary['boards']} x {summary['rule']} "
+              f"[{summary['cols']} * {summary['rows']}] | Gen {summary['generations']} | "
+              f"{summary['gens_per_s']} gen/s | {summary['cells_per_s']} cells/s | "
+              + " ".join(f"{kind} {n}" for kind, n in summary['outcomes'].items()))
+        return 0
+    summary = run(
+        seed,
+        mode=args.mode,
+        rows=args.rows,
+        cols=args.cols,
+        gens=args.gens,
+        backend=args.backend,
+        tile_size=args.tile_size,
+        workers=args.workers,
+        compact=args.compact,
+        rule=args.rule,
+        stop=not args.keep_going,
+        pattern=args.pattern,
+        save=args.save,
+        resume=args.resume,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+        record=args.record,
+        keyframe_every=args.keyframe_every,
+        compression=args.compress,
+        profile=args.profile,
+        density=args.density[0],
+        immortal=args.immortal
+    )
+    
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(summary) + "\n")
+    
+    print(f"Seed {summary['seed']} | {summary['backend']} {summary['mode']} {summary['rule']} "
+          f"[{summary['cols']} * {summary['rows']}] | Gen {summary['generations']} | "
+          f"{summary['gens_per_s']} gen/s | {summary['cells_per_s']} cells/s | "
+          f"Population {summary['population']} | {summary['outcome']}"
+          + (f" period {summary['period']} since gen {summary['cycle_start']}" if summary['period'] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
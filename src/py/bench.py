@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+
+import io
+import sys
+import json
+import time
+import random
+import statistics
+import platform
+import argparse
+import resource
+import contextlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+from main import seed as default_seed
+from patterns import Pattern
+import batch
+import main2
+
+
+## --------------------------------------------------------------------
+# Reproducible benchmarks: every case is (engine, workload, size), runs in
+# a fresh process (so peak RSS is its own) from a fixed seed, and reports
+# generations/s, cells/s, peak RSS and the bytes and time of a rendered
+# frame. Results are JSON, a saved run is the baseline of the next one.
+## --------------------------------------------------------------------
+
+# name -> make_engine keywords, or a main2 engine class
+engines = {
+    'object': {'backend': 'object'},
+    'compact': {'backend': 'object', 'compact': True},
+    'tiles': {'backend': 'object', 'tile_size': 16},
+    'numpy': {'backend': 'numpy'},
+    'parallel': {'backend': 'parallel'},
+    'sparse': {'backend': 'sparse'},
+    'hashlife': {'backend': 'hashlife'},
+    'generations': {'backend': 'generations'},
+    'block': {'backend': 'block'},
+    'block-numpy': {'backend': 'block-numpy'},
+    'list': main2.GameOfLifeEngine,
+    'bits': main2.BitPackedEngine,
+}
+
+fixed = {
+    'r-pentomino': "x = 3, y = 3\nb2o$2o$bo!",
+    'gosper-gun': (
+        "x = 36, y = 9\n"
+        "24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4b"
+        "obo$10bo5bo7bo$11bo3bo$12b2o!"
+    ),
+}
+densities = {'soup-10': 0.10, 'soup-25': 0.25, 'soup-50': 0.50}
+workloads = list(fixed) + list(densities) + ['neighbors']
+
+# engines with a per cell neighbor count to time on their own
+neighbor_engines = ('object', 'list', 'numpy')
+
+# the CellStore trade: peak RSS of the object engine against its compact
+# cells on boards big enough for the cells to outweigh the interpreter
+memory_engines = ('object', 'compact')
+memory_sizes = (256, 512, 1024)
+
+
+def workload_pattern(workload, size, seed):
+    """Pattern of a workload, soups fill the whole size x size board"""
+    if workload in fixed:
+        return Pattern(text=fixed[workload], fmt='rle')
+    rng = random.Random(seed)
+    density = densities[workload]
+    rows = [''.join('O' if rng.random() < density else '.' for _ in range(size)) for _ in range(size)]
+    return Pattern(text='\n'.join(rows) + '\n', fmt='cells')
+
+
+def make(name, size):
+    """Engine of a benchmark name on a size x size board, Conway's rule"""
+    kind = engines[name]
+    with contextlib.redirect_stdout(io.StringIO()): # "Planet ..." banners
+        if isinstance(kind, dict):
+            return batch.make_engine(rows=size, cols=size, rule='B3/S23', **kind)
+        return kind(rows=size, cols=size, rule='B3/S23')
+
+
+def _display(engine):
+    if isinstance(engine, main2.GameOfLifeEngine):
+        return main2.GameOfLifeDisplay()
+    from engine import GameOfLifeDiffDisplay
+    return GameOfLifeDiffDisplay()
+
+
+def _population(engine):
+    if hasattr(engine, 'population'):
+        return engine.population()
+    return sum(1 for _ in engine.live_points())
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+
+def _render(engine, frames):
+    """Bytes and seconds of frames rendered frames, the first one is a full redraw"""
+    display = _display(engine)
+    sizes, times = [], []
+    for i in range(frames):
+        out = io.StringIO()
+        t = time.perf_counter()
+        with contextlib.redirect_stdout(out):
+            display.print_grid(engine.get_grid_state())
+        times.append(time.perf_counter() - t)
+        sizes.append(len(out.getvalue().encode()))
+        engine.update_generation()
+    rest = sizes[1:] or sizes
+    return {
+        'full_frame_bytes': sizes[0],
+        'frame_bytes': round(sum(rest) / len(rest)),
+        'render_ms': round(1000 * statistics.median(times), 3),
+    }
+
+
+def _neighbors(name, size, seed, budget):
+    """Neighbor counts per second of the engine's own counting code"""
+    engine = make(name, size)
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.initialize_grid(workload_pattern('soup-25', size, seed))
+    if name == 'numpy':
+        from npengine import count_neighbors
+        count = lambda: count_neighbors(engine.backend.alive)
+    elif name == 'list':
+        count = lambda: [engine._get_live_neighbors(r, c) for r in range(size) for c in range(size)]
+    else:
+        count = lambda: [engine.get_neighbors(r, c) for r in range(size) for c in range(size)]
+    passes, t = 0, time.perf_counter()
+    while not passes or time.perf_counter() - t < budget / 10:
+        count()
+        passes += 1
+    run_time = time.perf_counter() - t
+    getattr(engine, 'close', lambda: None)()
+    return {'neighbors_per_s': round(passes * size * size / run_time), 'run_s': round(run_time, 6)}
+
+
+def run_case(name, workload, size, gens, seed, budget, frames):
+    """
+    One benchmark case, meant to run in its own process
+
+    :param gens: Int - Generations to time, fewer if budget runs out first
+    :param budget: Float - Seconds of stepping at most
+    :param frames: Int - Frames rendered after the timed run (0 to skip)
+    """
+    case = {'engine': name, 'workload': workload, 'size': size, 'seed': seed}
+    if workload == 'neighbors':
+        case.update(_neighbors(name, size, seed, budget))
+        case['peak_rss_mb'] = _peak_rss_mb()
+        return case
+
+    random.seed(seed)
+    pattern = workload_pattern(workload, size, seed)
+    engine = make(name, size)
+    try:
+        t = time.perf_counter()
+        engine.initialize_grid(pattern)
+        init_time = time.perf_counter() - t
+
+        # every step timed, rates come from the median one so a stray
+        # slow step (GC, the scheduler) does not move them
+        steps = []
+        start = engine.generation
+        while engine.generation - start < gens and sum(steps) <= budget:
+            t = time.perf_counter()
+            engine.update_generation()
+            steps.append(time.perf_counter() - t)
+        step = statistics.median(steps)
+        case.update({
+            'generations': engine.generation - start,
+            'population': _population(engine),
+            'init_s': round(init_time, 6),
+            'run_s': round(sum(steps), 6),
+            'gens_per_s': round(1 / step, 3),
+            'cells_per_s': round(size * size / step),
+        })
+        if frames:
+            case.update(_render(engine, frames))
+        case['peak_rss_mb'] = _peak_rss_mb()
+        return case
+    finally:
+        getattr(engine, 'close', lambda: None)()
+
+
+def cases(names, loads, sizes):
+    for size in sizes:
+        for workload in loads:
+            for name in names:
+                if workload == 'neighbors' and name not in neighbor_engines:
+                    continue
+                yield name, workload, size
+
+
+def run(names=None, loads=None, sizes=(64, 256), gens=50, seed=default_seed, budget=5.0, frames=5, log=None):
+    """
+    Run the suite, every case in a fresh process one after the other
+
+    :param names: Str[] - Keys of engines (None for all)
+    :param loads: Str[] - Workloads (None for all)
+    :param sizes: Int[] - Board sides
+    :param log: Callable - Called with every finished case
+    :return: Dict - {'meta': .., 'results': [case, ..]}
+    """
+    import numpy
+    results = []
+    spawn = mp.get_context('spawn')
+    for name, workload, size in cases(names or list(engines), loads or workloads, sizes):
+        with ProcessPoolExecutor(1, mp_context=spawn) as pool:
+            case = pool.submit(run_case, name, workload, size, gens, seed, budget, frames).result()
+        results.append(case)
+        if log:
+            log(case)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'platform': platform.platform(),
+            'cpus': mp.cpu_count(),
+            'seed': seed,
+            'gens': gens,
+            'budget_s': budget,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def memory(sizes=memory_sizes, gens=5, seed=default_seed, budget=5.0, log=None):
+    """
+    Object against compact cells on a soup, peak RSS and speed side by side
+
+    :return: [(size, object case, compact case)]
+    """
+    report = run(memory_engines, ['soup-25'], sizes, gens, seed, budget, frames=0, log=log)
+    by_size = {}
+    for case in report['results']:
+        by_size.setdefault(case['size'], {})[case['engine']] = case
+    return [(size, *(by_size[size][name] for name in memory_engines)) for size in sizes]
+
+
+## ---------------------
+# baseline comparison, (metric, True if higher is better)
+metrics = [
+    ('gens_per_s', True),
+    ('neighbors_per_s', True),
+    ('peak_rss_mb', False),
+    ('frame_bytes', False),
+    ('render_ms', False),
+]
+
+
+def compare(report, baseline, tolerance=0.2):
+    """
+    Cases that got worse than the baseline by more than tolerance
+
+    :return: [(engine, workload, size, metric, baseline value, value)]
+    """
+    before = {(c['engine'], c['workload'], c['size']): c for c in baseline['results']}
+    regressions = []
+    for case in report['results']:
+        old = before.get((case['engine'], case['workload'], case['size']))
+        if not old:
+            continue
+        for metric, higher in metrics:
+            if metric not in case or not old.get(metric):
+                continue
+            ratio = case[metric] / old[metric]
+            if (ratio < 1 - tolerance) if higher else (ratio > 1 + tolerance):
+                regressions.append((case['engine'], case['workload'], case['size'], metric, old[metric], case[metric]))
+    return regressions
+## ---------------------
+
+
+def _line(case):
+    rate = (f"{case['gens_per_s']:>10.2f} gen/s {case['cells_per_s']:>12} cells/s"
+            if 'gens_per_s' in case else f"{case['neighbors_per_s']:>30} neighbors/s")
+    frame = f" {case['frame_bytes']:>8} B/frame {case['render_ms']:>9.2f} ms" if 'frame_bytes' in case else ''
+    return f"{case['engine']:>11} {case['workload']:>12} {case['size']:>5} {rate} {case['peak_rss_mb']:>7} MB{frame}"
+
+
+def main(argv=None):
+    """Benchmark suite"""
+    parser = argparse.ArgumentParser(description="Benchmark engines, neighbor counting and rendering")
+    parser.add_argument('--engines', nargs='+', default=None, choices=list(engines))
+    parser.add_argument('--workloads', nargs='+', default=None, choices=workloads)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[64, 256])
+    parser.add_argument('--gens', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=default_seed)
+    parser.add_argument('--budget', type=float, default=5.0, help="seconds of stepping per case at most")
+    parser.add_argument('--frames', type=int, default=5, help="frames rendered per case, 0 to skip")
+    parser.add_argument('--output', default=None, help="write the JSON report to this file")
+    parser.add_argument('--baseline', default=None, help="JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="relative change flagged as a regression")
+    parser.add_argument('--memory', action='store_true',
+                        help="only compare peak RSS of object and compact cells, sizes default to 256 512 1024")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        sizes = args.sizes if args.sizes != parser.get_default('sizes') else memory_sizes
+        for size, obj, compact in memory(sizes, min(args.gens, 5), args.seed, args.budget):
+            print(f"{size:>5}: object {obj['peak_rss_mb']} MB {obj['gens_per_s']} gen/s, "
+                  f"compact {compact['peak_rss_mb']} MB {compact['gens_per_s']} gen/s, "
+                  f"{compact['peak_rss_mb'] / obj['peak_rss_mb']:.2f}x the memory "
+                  f"at {obj['gens_per_s'] / compact['gens_per_s']:.1f}x the time")
+        return 0
+
+    report = run(args.engines, args.workloads, args.sizes, args.gens, args.seed, args.budget, args.frames,
+                 log=lambda case: print(_line(case), flush=True))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for name, workload, size, metric, old, new in regressions:
+            print(f"REGRESSION {name} {workload} {size}: {metric} {old} -> {new}")
+        if regressions:
+            return 1
+        print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+import os
+import functools
+from operator import or_, and_, getitem
+
+from cell import StandardCell, ImmortalCell
+from engine import GameOfLifeEngine
+from patterns import Pattern, placement
+import seeding
+
+
+## --------------------------------------------------------------------
+# Block stepping: the board is stored as 2x2 blocks, one 4 bit value each
+# (bit 3 top left, 2 top right, 1 bottom left, 0 bottom right). Four
+# blocks side by side make a 4x4 neighborhood, a 16 bit index
+# nw << 12 | ne << 8 | sw << 4 | se, and a 65536 entry table holds the
+# next state of its 2x2 centre. That centre straddles the four blocks, so
+# the block grid moves one cell down / right on even generations and back
+# on odd ones:
+#   phase 0  block (i, j) covers cells 2i .. 2i+1,   2j .. 2j+1
+#   phase 1  block (i, j) covers cells 2i+1 .. 2i+2, 2j+1 .. 2j+2
+# A phase 0 step reads blocks (i, j) .. (i+1, j+1), a phase 1 step blocks
+# (i-1, j-1) .. (i, j). The centre table (the 2x2 centre as it is, no
+# rule) moves a board between phases without stepping it.
+# Tables are built once per rule and kept in cache_dir.
+## --------------------------------------------------------------------
+
+cache_dir = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'gameoflife'
+)
+_version = 1
+
+_high = bytes((v << 4) & 0xFF for v in range(256)) # nibble -> high nibble
+_bits = bytes(bin(v).count('1') for v in range(256))
+_shift = [bytes((v & 1) << n for v in range(256)) for n in range(4)] # 0 / 1 -> bit n
+_test = [bytes(v >> n & 1 for v in range(256)) for n in range(4)]   # bit n -> 0 / 1
+
+
+def _bit(row, col):
+    """Bit of cell (row, col) of a 4x4 neighborhood in its 16 bit index"""
+    block = (row >> 1) * 2 + (col >> 1) # nw, ne, sw, se
+    return (3 - block) * 4 + 3 - ((row & 1) * 2 + (col & 1))
+
+
+def _build(rule):
+    """Next 2x2 centre of every 4x4 neighborhood under rule, the centre as it is for None"""
+    centre = [(row, col) for row in (1, 2) for col in (1, 2)]
+    masks = [
+        sum(1 << _bit(row + i, col + j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j)
+        for row, col in centre
+    ]
+    table = bytearray(1 << 16)
+    for index in range(1 << 16):
+        value = 0
+        for k, ((row, col), mask) in enumerate(zip(centre, masks)):
+            alive = index >> _bit(row, col) & 1
+            if rule is None:
+                value |= alive << (3 - k)
+            else:
+                value |= rule.table[alive * 9 + bin(index & mask).count('1')] << (3 - k)
+        table[index] = value
+    return bytes(table)
+
+
+@functools.lru_cache(maxsize=8)
+def table(rule=None, directory=cache_dir):
+    """
+    The 65536 entry table of a rule, read from directory or built and
+    written there (about a second in pure Python)
+
+    :param rule: Rule - 2 state Life-like rule (None for the centre table)
+    :param directory: Str - Cache directory (None for no disk cache)
+    :return: Bytes - 2x2 result of every 4x4 index
+    """
+    name = f"block-v{_version}-{str(rule).replace('/', '_') if rule else 'centre'}.lut"
+    path = directory and os.path.join(directory, name)
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) == 1 << 16:
+            return data
+    data = _build(rule)
+    if path:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # written aside then renamed, a reader never sees half a table
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError: # read only home, the table is just built again next time
+            pass
+    return data
+
+
+class BlockEngine(GameOfLifeEngine):
+    """
+    2 state Life-like rules on a torus, stepped a 2x2 block at a time
+    with one table lookup each instead of counting neighbors per cell.
+
+    Pure Python: a block row is a bytes object and every pass over it is
+    translate() or a map() of C functions, no Python code runs per cell.
+    ImmortalCells (mode 'other') are a block mask ORed in after the
+    lookup. rows and cols are rounded up to even, ages are not kept.
+    """
+    def __init__(self, mode='original', rows=None, cols=None, rule=None, cache=cache_dir):
+        """
+        :param rows: Int - Number of rows (None for auto-detect), rounded up to even
+        :param cols: Int - Number of columns (None for auto-detect), rounded up to even
+        :param rule: Str or Rule - 2 state Life-like rule
+        :param cache: Str - Directory of the lookup tables (None to build them every time)
+        """
+        super().__init__(mode=mode, rows=rows, cols=cols, rule=rule)
+        if self.rule.states != 2:
+            raise ValueError(f"{self.rule} has more than 2 states, use the generations engine")
+        self.rows += self.rows % 2
+        self.cols += self.cols % 2
+        self._tables = (self._prepare(table(self.rule, cache)), self._prepare(table(None, cache)))
+        self.blocks = None     # blocks of the current phase
+        self.phase = 0
+        self.aligned = None    # blocks of the current generation in phase 0
+        self._previous_aligned = None # aligned of the generation before, for born / died
+        self.immortal = None   # (phase 0, phase 1) ImmortalCell masks, None if there are none
+
+    ## ---------------------
+    def initialize_grid(self, pattern=None):
+        """
+        Fill the board from a pattern or at random
+
+        :param pattern: Cell[][], Int[][] or patterns.Pattern - Optional pattern,
+                        odd sides get one more dead row / column
+        """
+        rows = immortal = None
+        self.rows += self.rows % 2
+        self.cols += self.cols % 2
+        if isinstance(pattern, Pattern):
+            self.rows, self.cols, top, left = placement(pattern, self.rows, self.cols)
+            self.rows += self.rows % 2
+            self.cols += self.cols % 2
+            cells = [bytearray(self.cols) for _ in range(self.rows)]
+            for row, col, _ in pattern.cells():
+                cells[top + row][left + col] = 1
+            rows = [bytes(row) for row in cells]
+        elif pattern:
+            self.rows = len(pattern) + len(pattern) % 2
+            self.cols = len(pattern[0]) + len(pattern[0]) % 2
+            pad = bytes(self.cols)
+            rows, immortal = [], []
+            for grid_row in pattern:
+                rows.append((bytes(
+                    bool(cell) if isinstance(cell, (int, bool)) else cell.is_alive for cell in grid_row
+                ) + pad)[:self.cols])
+                immortal.append((bytes(isinstance(cell, ImmortalCell) for cell in grid_row) + pad)[:self.cols])
+            rows += [pad] * (self.rows - len(rows))
+            immortal += [pad] * (self.rows - len(immortal))
+        else:
+            ratio = self.immortal_ratio if self.mode != 'original' else 0.0
+            rows, immortal = zip(*seeding.rows(self._board_seed(), self.cols, self.density, ratio, 0, self.rows))
+        self.blocks = self._pack(rows)
+        self.phase = 0
+        self.immortal = None
+        if immortal and any(map(any, immortal)):
+            mask = self._pack(immortal)
+            self.immortal = (mask, self._apply(self._tables[1], mask, 0))
+        self.aligned = self.blocks
+        self._previous_aligned = None
+        self.current_generation = []
+        self.generation = 0
+        self._start_history()
+
+    def _prepare(self, data):
+        """A table as _apply takes it: one 256 byte row per high byte of the index"""
+        return [data[i:i + 256] for i in range(0, 1 << 16, 256)]
+
+    def _pack(self, rows):
+        """Blocks of rows of 0 / 1 bytes, phase 0"""
+        blocks = []
+        for top, bottom in zip(rows[0::2], rows[1::2]):
+            upper = bytes(map(or_, top[0::2].translate(_shift[3]), top[1::2].translate(_shift[2])))
+            lower = bytes(map(or_, bottom[0::2].translate(_shift[1]), bottom[1::2]))
+            blocks.append(bytes(map(or_, upper, lower)))
+        return blocks
+
+    def _cells(self, blocks):
+        """Rows of 0 / 1 bytes of phase 0 blocks"""
+        rows = []
+        for row in blocks:
+            for high, low in ((3, 2), (1, 0)):
+                cells = bytearray(self.cols)
+                cells[0::2] = row.translate(_test[high])
+                cells[1::2] = row.translate(_test[low])
+                rows.append(bytes(cells))
+        return rows
+    ## ---------------------
+
+    def _apply(self, tables, blocks, phase):
+        """
+        Look every block's 4x4 neighborhood up in a prepared table
+
+        :param phase: Int - Phase of blocks, the result is in the other one
+        """
+        # pairs[i][j]: blocks (i, j) and (i, j+1) as one byte, (i, j-1) and (i, j) in phase 1
+        if phase:
+            pairs = [bytes(map(or_, (row[-1:] + row[:-1]).translate(_high), row)) for row in blocks]
+            tops, bottoms = pairs[-1:] + pairs[:-1], pairs
+        else:
+            pairs = [bytes(map(or_, row.translate(_high), row[1:] + row[:1])) for row in blocks]
+            tops, bottoms = pairs, pairs[1:] + pairs[:1]
+        return [bytes(map(getitem, map(tables.__getitem__, top), bottom)) for top, bottom in zip(tops, bottoms)]
+
+    def _immortal(self, blocks, old, phase):
+        """blocks with the live ImmortalCells of old kept alive, blocks in phase"""
+        mask = self.immortal[phase]
+        kept = self._apply(self._tables[1], old, 1 - phase)
+        return [bytes(map(or_, row, map(and_, keep, m))) for row, keep, m in zip(blocks, kept, mask)]
+
+    def update_generation(self):
+        """Calculate the next generation"""
+        old = self.blocks
+        self.blocks = self._apply(self._tables[0], old, self.phase)
+        self.phase ^= 1
+        if self.immortal:
+            self.blocks = self._immortal(self.blocks, old, self.phase)
+        self._previous_aligned = self.aligned
+        self.aligned = self._apply(self._tables[1], self.blocks, 1) if self.phase else self.blocks
+        self.hash = self._hash_board()
+        self.generation += 1
+        self._record()
+
+    def population(self):
+        return sum(map(sum, (row.translate(_bits) for row in self.aligned)))
+
+    def _hash_board(self):
+        """Hash of the phase 0 blocks, 0 once they are all empty"""
+        empty = bytes(self.cols // 2)
+        if all(row == empty for row in self.aligned):
+            return 0
+        return hash(b''.join(self.aligned))
+
+    ## ---------------------
+    def live_points(self):
+        """(row, col, 1) of every live cell, row major"""
+        for row, cells in enumerate(self._cells(self.aligned)):
+            col = cells.find(1)
+            while col >= 0:
+                yield row, col, 1
+                col = cells.find(1, col + 1)
+
+    def to_grid(self):
+        """Export the board as an Int[][] pattern, as main2.py uses"""
+        return [list(row) for row in self._cells(self.aligned)]
+
+    def to_cells(self):
+        """Build the Cell[][] grid, born / died from the generation before"""
+        cells = self._cells(self.aligned)
+        immortal = self._cells(self.immortal[0]) if self.immortal else None
+        previous = self._cells(self._previous_aligned) if self._previous_aligned is not None else None
+        grid = []
+        for row, alive_row in enumerate(cells):
+            grid_row = []
+            for col, alive in enumerate(alive_row):
+                if immortal and immortal[row][col]:
+                    cell = ImmortalCell(is_alive=bool(alive), alive_char='R', death_char='.')
+                else:
+                    cell = StandardCell(is_alive=bool(alive), alive_char='@', death_char='.')
+                if previous:
+                    was_alive = bool(previous[row][col])
+                    cell.was_born_this_gen = bool(alive) and not was_alive
+                    cell.died_this_gen = was_alive and not alive
+                    cell.was_alive_last_gen = was_alive
+                grid_row.append(cell)
+            grid.append(grid_row)
+        return grid
+
+    def get_grid_state(self):
+        """Return current grid state"""
+        return {
+            'generation': self.generation,
+            'grid': self.to_cells(),
+            'rows': self.rows,
+            'cols': self.cols,
+            'paused': self.paused,
+            'speed': self.tsleep,
+            'tiles': None,
+            'cycle': self.cycle,
+            'seed': self.seed
+        }
+    ## ---------------------
+
+
+class NumpyBlockEngine(BlockEngine):
+    """
+    BlockEngine on numpy arrays: blocks are a uint8 [row][col] array and
+    a generation is three rolls, the index and one gather from the table.
+    """
+    def __init__(self, mode='original', rows=None, cols=None, rule=None, cache=cache_dir):
+        import numpy as np # needs numpy
+        self._np = np
+        super().__init__(mode=mode, rows=rows, cols=cols, rule=rule, cache=cache)
+
+    def _prepare(self, data):
+        return self._np.frombuffer(data, dtype=self._np.uint8)
+
+    def _pack(self, rows):
+        np = self._np
+        cells = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(self.rows, self.cols)
+        return (cells[0::2, 0::2] << 3 | cells[0::2, 1::2] << 2 | cells[1::2, 0::2] << 1 | cells[1::2, 1::2])
+
+    def _cells(self, blocks):
+        np = self._np
+        cells = np.empty((self.rows, self.cols), dtype=np.uint8)
+        for n, (r, c) in zip((3, 2, 1, 0), ((0, 0), (0, 1), (1, 0), (1, 1))):
+            cells[r::2, c::2] = blocks >> n & 1
+        return [row.tobytes() for row in cells]
+
+    def _apply(self, tables, blocks, phase):
+        np = self._np
+        step = 1 if phase else -1 # phase 1 reads up / left, phase 0 down / right
+        across = np.roll(blocks, step, axis=1)
+        down = np.roll(blocks, step, axis=0)
+        diagonal = np.roll(across, step, axis=0)
+        if phase:
+            nw, ne, sw, se = diagonal, down, across, blocks
+        else:
+            nw, ne, sw, se = blocks, across, down, diagonal
+        index = nw.astype(np.uint16) << 12
+        index |= ne.astype(np.uint16) << 8
+        index |= sw.astype(np.uint16) << 4
+        index |= se
+        return tables[index]
+
+    def _immortal(self, blocks, old, phase):
+        kept = self._apply(self._tables[1], old, 1 - phase)
+        return blocks | (kept & self.immortal[phase])
+
+    def population(self):
+        np = self._np
+        return int(np.frombuffer(_bits, dtype=np.uint8)[self.aligned].sum(dtype=np.int64))
+
+    def _hash_board(self):
+        if not self.aligned.any():
+            return 0
+        return hash(self.aligned.tobytes())
@@ -1,7 +1,15 @@
 import abc
 
+from rules import CONWAY
+
 class Cell(abc.ABC):
     """Abstract base class for all cell types."""
+    __slots__ = (
+        'is_alive', 'age',
+        'was_born_this_gen', 'was_alive_last_gen', 'died_this_gen',
+        '_next_state', '_next_age',
+    )
+    
     def __init__(self, is_alive=False, **kwargs):
         self.is_alive = is_alive
         self.age = 0
@@ -18,9 +26,11 @@ class Cell(abc.ABC):
         self._next_age = None
 
     @abc.abstractmethod
-    def update(self, neighbors):
+    def update(self, neighbors, table=CONWAY.table):
         """ Calculate the cell's next state based on neighbors.
             Must set self._next_state and self._next_age.
+            table is a compiled Rule.table, next state of a cell with
+            n live neighbors is table[n] if dead, table[9 + n] if alive.
         """
         pass
 
@@ -48,6 +58,13 @@ class Cell(abc.ABC):
         #self._next_age = 0
 
 
+    def idle(self, generations):
+        """ Catch up on generations skipped because nothing around changed.
+            Only age moves, a still cell keeps its state and flags.
+        """
+        if self.is_alive:
+            self.age += generations
+
     def die(self):
         """Mark the cell to die in the next state."""
         self._next_state = False
@@ -62,6 +79,8 @@ class Cell(abc.ABC):
 
 class StandardCell(Cell):
     """Standard Conway's Game of Life cell."""
+    __slots__ = ('alive_char', 'death_char')
+    
     def __init__(self, is_alive=False, alive_char='@', death_char='.', **kwargs):
         
         super().__init__(is_alive=is_alive, **kwargs) 
@@ -69,42 +88,22 @@ class StandardCell(Cell):
         self.alive_char = alive_char
         self.death_char = death_char
             
-    def update(self, neighbors):
+    def update(self, neighbors, table=CONWAY.table):
         live_neighbors = sum(1 for n in neighbors if n.is_alive)
         #print(f"update: {live_neighbors=}")
         #print(f"update: {self.is_alive=}")
         
-        if self.is_alive:
-            # Underpopulation
-            if live_neighbors < 2: 
-                self._next_state = False 
-                self._next_age = 0
-                self.died_this_gen = True 
-            # Equilibrium
-            elif live_neighbors in [2,3]: 
-                self._next_state = True  
-                self._next_age = self.age + 1
-                self.died_this_gen = False
-            # Overpopulation
-            elif live_neighbors > 3: 
-                self._next_state = False 
-                self._next_age = 0
-                self.died_this_gen = True   
-                
-            self.was_born_this_gen = False
-            self.was_alive_last_gen = True
-        else:
-            # Reproduction
-            if live_neighbors == 3: 
-                self._next_state = True
-                self.was_born_this_gen = True
-            else:
-                self._next_state = False 
-                self.was_born_this_gen = False
-
-            self._next_age = 0
-            self.was_alive_last_gen = False
-            self.died_this_gen = False
+        # Survival (Equilibrium) for a live cell, Birth (Reproduction) for
+        # a dead one, both looked up in the rule table.
+        # Conway: B3/S23, dies below 2 (Underpopulation) or above 3 (Overpopulation)
+        alive = self.is_alive
+        next_state = bool(table[alive * 9 + live_neighbors])
+        
+        self._next_state = next_state
+        self._next_age = self.age + 1 if alive and next_state else 0
+        self.was_born_this_gen = next_state and not alive
+        self.died_this_gen = alive and not next_state
+        self.was_alive_last_gen = alive
     
     
     # assumes that those are called after apply_update
@@ -123,16 +122,16 @@ class StandardCell(Cell):
             if self.was_born_this_gen: 
                 return display_handler.colors.get('bright_green', '')
             
-            if self.age > 10:
-                return display_handler.colors.get('dark_green', display_handler.colors['green'])
-            
-            return display_handler.colors.get('green', '')
+            # green getting darker with age
+            return display_handler.age_color(self.age)
 
 
 
 # TODO
 class ImmortalCell(Cell):
     """A cell type that never dies once born."""
+    __slots__ = ('alive_char', 'death_char')
+    
     def __init__(self, is_alive=False, alive_char='I', death_char='.', **kwargs):
         
         super().__init__(is_alive=is_alive, **kwargs) 
@@ -140,18 +139,22 @@ class ImmortalCell(Cell):
         self.alive_char = alive_char
         self.death_char = death_char
         
-    def update(self, neighbors):
+    def update(self, neighbors, table=CONWAY.table):
         live_neighbors = sum(1 for n in neighbors if n.is_alive)
         self._next_age = self.age + 1
         if self.is_alive:
             self._next_state = True # Never dies
         else:
-            if live_neighbors == 3:
+            if table[live_neighbors]: # rule's birth counts
                 self._next_state = True # Can be born
                 self._next_age = 0
             else:
                 self._next_state = False
 
+    def idle(self, generations):
+        # ages dead or alive
+        self.age += generations
+
     def get_display_char(self):
         return self.alive_char if self.is_alive else self.death_char
     
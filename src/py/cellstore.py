@@ -0,0 +1,187 @@
+from array import array
+
+
+NONE_STATE = 2  # _next_state None
+NONE_AGE = -1   # _next_age None
+
+
+class CellStore:
+    """
+    Struct-of-arrays grid: one typed array per Cell attribute plus a kind id
+    per cell, about 14 bytes a cell instead of a full Cell object.
+
+    kinds maps a kind id to (Cell subclass, alive char, death char), view()
+    hands out a lightweight object of that subclass reading and writing the
+    arrays, so update / apply_update / get_display_* run unchanged.
+
+    It trades speed for memory: every attribute access goes through a
+    property into an array and every cell touched is a new view, so a
+    generation takes 4-5x as long as on Cell objects (about 11 against 65
+    gen/s at 64x64). The memory only pays off on big boards, below 256x256
+    the interpreter outweighs the cells; bench.py --memory measures both,
+    peak RSS came to 0.58x at 512x512 and 0.34x at 1024x1024.
+    """
+    def __init__(self, rows, cols):
+        n = rows * cols
+        self.rows = rows
+        self.cols = cols
+        self.alive = bytearray(n)
+        self.age = array('i', bytes(4 * n))
+        self.born = bytearray(n)
+        self.last = bytearray(n)
+        self.died = bytearray(n)
+        self.next_state = bytearray([NONE_STATE]) * n
+        self.next_age = array('i', [NONE_AGE]) * n
+        self.kind = bytearray(n)
+        self.kinds = []
+        self._views = []
+
+    def kind_id(self, cls, alive_char, death_char):
+        """Kind id of a (Cell subclass, chars) combination, added if new"""
+        key = (cls, alive_char, death_char)
+        if key not in self.kinds:
+            self.kinds.append(key)
+            self._views.append(view_class(cls))
+        return self.kinds.index(key)
+
+    def set_cell(self, i, cell):
+        """Copy a Cell object (or a view) into slot i"""
+        cls = getattr(type(cell), '_cell_class', type(cell))
+        self.kind[i] = self.kind_id(cls, cell.alive_char, cell.death_char)
+        self.alive[i] = cell.is_alive
+        self.age[i] = cell.age
+        self.born[i] = cell.was_born_this_gen
+        self.last[i] = cell.was_alive_last_gen
+        self.died[i] = cell.died_this_gen
+
+    @classmethod
+    def from_cells(cls, grid):
+        """Build a store from a Cell[][] grid"""
+        store = cls(len(grid), len(grid[0]))
+        i = 0
+        for row in grid:
+            for cell in row:
+                store.set_cell(i, cell)
+                i += 1
+        return store
+
+    def view(self, i):
+        """Cell view of slot i"""
+        view = self._views[self.kind[i]].__new__(self._views[self.kind[i]])
+        view._store = self
+        view._i = i
+        return view
+
+    def grid(self):
+        """Cell[][] style access to the views"""
+        return CellGrid(self)
+
+    def copy(self):
+        """Detached copy, for snapshots"""
+        store = CellStore.__new__(CellStore)
+        store.__dict__.update({
+            k: v[:] if isinstance(v, (bytearray, array, list)) else v
+            for k, v in self.__dict__.items()
+        })
+        return store
+
+    def nbytes(self):
+        return sum(
+            len(a) * a.itemsize if isinstance(a, array) else len(a)
+            for a in (self.alive, self.age, self.born, self.last, self.died,
+                      self.next_state, self.next_age, self.kind)
+        )
+
+
+class CellGrid:
+    """grid[row][col] over a CellStore, views are created on access"""
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return self.store.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.store.rows:
+            raise IndexError(row)
+        return CellRow(self.store, row * self.store.cols)
+
+    def __iter__(self):
+        for row in range(self.store.rows):
+            yield self[row]
+
+
+class CellRow:
+    def __init__(self, store, start):
+        self.store = store
+        self.start = start
+
+    def __len__(self):
+        return self.store.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.store.cols:
+            raise IndexError(col)
+        return self.store.view(self.start + col)
+
+    def __iter__(self):
+        for col in range(self.store.cols):
+            yield self.store.view(self.start + col)
+
+
+## ---------------------
+# properties mapping the Cell attributes onto the store arrays
+
+def _flag(plane):
+    def get(self):
+        return bool(getattr(self._store, plane)[self._i])
+    def set(self, value):
+        getattr(self._store, plane)[self._i] = bool(value)
+    return property(get, set)
+
+def _get_age(self):
+    return self._store.age[self._i]
+
+def _set_age(self, value):
+    self._store.age[self._i] = value
+
+def _get_next_state(self):
+    state = self._store.next_state[self._i]
+    return None if state == NONE_STATE else bool(state)
+
+def _set_next_state(self, value):
+    self._store.next_state[self._i] = NONE_STATE if value is None else bool(value)
+
+def _get_next_age(self):
+    age = self._store.next_age[self._i]
+    return None if age == NONE_AGE else age
+
+def _set_next_age(self, value):
+    self._store.next_age[self._i] = NONE_AGE if value is None else value
+
+def _char(index):
+    def get(self):
+        return self._store.kinds[self._store.kind[self._i]][index]
+    return property(get)
+
+_view_attrs = {
+    '__slots__': ('_store', '_i'),
+    'is_alive': _flag('alive'),
+    'was_born_this_gen': _flag('born'),
+    'was_alive_last_gen': _flag('last'),
+    'died_this_gen': _flag('died'),
+    'age': property(_get_age, _set_age),
+    '_next_state': property(_get_next_state, _set_next_state),
+    '_next_age': property(_get_next_age, _set_next_age),
+    'alive_char': _char(1),
+    'death_char': _char(2),
+}
+
+_view_classes = {}
+
+def view_class(cls):
+    """Subclass of a Cell class whose state lives in a CellStore"""
+    if cls not in _view_classes:
+        _view_classes[cls] = type(cls.__name__ + 'View', (cls,), dict(_view_attrs, _cell_class=cls))
+    return _view_classes[cls]
+## ---------------------
@@ -0,0 +1,246 @@
+import os
+import mmap
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from cell import StandardCell, ImmortalCell
+from cellstore import CellStore
+from tiles import TileTracker
+
+
+## --------------------------------------------------------------------
+# Binary checkpoint of an engine, read and written through mmap:
+#   header   256 bytes, see _header
+#   planes   one after the other, each starting on a 64 byte boundary,
+#            row major. Flags are bits packed 8 to a byte with every row
+#            starting on a new byte, ages are uint32 (uint16 saturating
+#            at 65535 in version 1 files, still read).
+#   2 states     alive, born, died, last, immortal, age
+#   Generations  state (uint8), immortal, age
+# Planes are copied a band of rows at a time between the engine's arrays
+# and the mapped file, the file is never read into memory as a whole.
+## --------------------------------------------------------------------
+
+MAGIC = b'GOLCKPT\0'
+VERSION = 2
+MULTISTATE = 1 # flags bit, the board is a Generations state plane
+
+# magic, version, flags, rows, cols, generation, seed (-1 unknown), mode, rule
+_header = struct.Struct('<8sHHIIQq16s64s')
+_header_size = 256
+_align = 64
+_band_cells = 1 << 24 # cells converted at a time
+
+Header = namedtuple('Header', 'rows cols generation seed mode rule multistate version')
+
+
+def _layout(rows, cols, multistate, version=VERSION):
+    """[(name, dtype, shape, offset)] of the planes, and the file size"""
+    bits = (rows, (cols + 7) // 8)
+    if multistate:
+        planes = [('state', np.uint8, (rows, cols)), ('immortal', None, bits)]
+    else:
+        planes = [(name, None, bits) for name in ('alive', 'born', 'died', 'last', 'immortal')]
+    planes.append(('age', np.uint16 if version == 1 else np.uint32, (rows, cols)))
+
+    layout, offset = [], _header_size
+    for name, dtype, shape in planes:
+        layout.append((name, dtype, shape, offset))
+        size = shape[0] * shape[1] * (np.dtype(dtype).itemsize if dtype else 1)
+        offset += -(-size // _align) * _align
+    return layout, offset
+
+
+def _bands(rows, cols):
+    step = max(1, _band_cells // max(cols, 1))
+    for r0 in range(0, rows, step):
+        yield slice(r0, min(r0 + step, rows))
+
+
+## ---------------------
+# engine <-> planes, arrays [row][col] of the checkpoint's plane names
+
+def _get_planes(engine):
+    if engine.multistate:
+        return {'state': engine.state, 'immortal': engine.immortal, 'age': engine.age}
+    if engine.backend:
+        b = engine.backend
+        return {'alive': b.alive, 'born': b.born, 'died': b.died, 'last': b.last,
+                'immortal': b.immortal, 'age': b.age}
+    engine.sync_tiles()
+    shape = (engine.rows, engine.cols)
+    if engine.store:
+        store = engine.store
+        flags = {
+            name: np.frombuffer(getattr(store, plane), dtype=np.uint8).reshape(shape).view(bool)
+            for name, plane in (('alive', 'alive'), ('born', 'born'), ('died', 'died'), ('last', 'last'))
+        }
+        immortal_ids = [i for i, (cls, _, _) in enumerate(store.kinds) if issubclass(cls, ImmortalCell)]
+        flags['immortal'] = np.isin(np.frombuffer(store.kind, dtype=np.uint8), immortal_ids).reshape(shape)
+        flags['age'] = np.frombuffer(store.age, dtype=np.int32).reshape(shape)
+        return flags
+    if not engine.current_generation:
+        raise TypeError(f"{type(engine).__name__} has no cell planes to checkpoint, save it as a pattern file")
+    cells = [cell for row in engine.current_generation for cell in row]
+    def plane(attr, dtype=bool):
+        return np.fromiter((getattr(cell, attr) for cell in cells), dtype=dtype, count=len(cells)).reshape(shape)
+    return {
+        'alive': plane('is_alive'),
+        'born': plane('was_born_this_gen'),
+        'died': plane('died_this_gen'),
+        'last': plane('was_alive_last_gen'),
+        'immortal': np.fromiter((isinstance(cell, ImmortalCell) for cell in cells), dtype=bool,
+                                count=len(cells)).reshape(shape),
+        'age': plane('age', np.int64),
+    }
+
+
+def _new_planes(rows, cols, multistate):
+    """Empty arrays the engine will own, filled from the file band by band"""
+    shape = (rows, cols)
+    if multistate:
+        return {'state': np.empty(shape, np.uint8), 'immortal': np.empty(shape, bool),
+                'age': np.empty(shape, np.uint32)}
+    planes = {name: np.empty(shape, bool) for name in ('alive', 'born', 'died', 'last', 'immortal')}
+    planes['age'] = np.empty(shape, np.int32)
+    return planes
+
+
+def _set_planes(engine, planes):
+    if engine.multistate:
+        engine.load_planes(planes['state'], planes['age'], planes['immortal'])
+        return
+    if engine.backend:
+        engine.backend.load_planes(planes['alive'], planes['age'], planes['born'],
+                                   planes['died'], planes['last'], planes['immortal'])
+        engine.rows, engine.cols = engine.backend.rows, engine.backend.cols
+        return
+    engine.rows, engine.cols = planes['alive'].shape
+    if engine.compact:
+        store = CellStore(engine.rows, engine.cols)
+        standard = store.kind_id(StandardCell, '@', '.')
+        immortal = store.kind_id(ImmortalCell, 'R', '.') if planes['immortal'].any() else standard
+        for name in ('alive', 'born', 'died', 'last'):
+            getattr(store, name)[:] = planes[name].tobytes()
+        np.frombuffer(store.age, dtype=np.int32)[:] = planes['age'].ravel()
+        np.frombuffer(store.kind, dtype=np.uint8)[:] = np.where(planes['immortal'], immortal, standard).ravel()
+        engine.store = store
+        engine.current_generation = store.grid()
+        return
+    grid = []
+    for row in range(engine.rows):
+        grid_row = []
+        for col in range(engine.cols):
+            if planes['immortal'][row, col]:
+                cell = ImmortalCell(alive_char='R', death_char='.')
+            else:
+                cell = StandardCell(alive_char='@', death_char='.')
+            cell.is_alive = bool(planes['alive'][row, col])
+            cell.age = int(planes['age'][row, col])
+            cell.was_born_this_gen = bool(planes['born'][row, col])
+            cell.died_this_gen = bool(planes['died'][row, col])
+            cell.was_alive_last_gen = bool(planes['last'][row, col])
+            grid_row.append(cell)
+        grid.append(grid_row)
+    engine.current_generation = grid
+## ---------------------
+
+
+def save(engine, path):
+    """
+    Write a checkpoint of an engine's current generation. The file is
+    written next to path and renamed over it once complete, so a run
+    killed halfway keeps its previous checkpoint.
+
+    :param engine: GameOfLifeEngine or GenerationsEngine (not sparse / hashlife)
+    :param path: Str - Checkpoint file
+    :return: Int - Bytes written
+    """
+    planes = _get_planes(engine)
+    rows, cols = engine.rows, engine.cols
+    layout, size = _layout(rows, cols, engine.multistate)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w+b') as f:
+        f.truncate(size)
+        with mmap.mmap(f.fileno(), size) as mm:
+            _header.pack_into(
+                mm, 0, MAGIC, VERSION, MULTISTATE if engine.multistate else 0,
+                rows, cols, engine.generation, -1 if engine.seed is None else engine.seed,
+                engine.mode.encode(), str(engine.rule).encode(),
+            )
+            for name, dtype, shape, offset in layout:
+                out = np.ndarray(shape, dtype=dtype or np.uint8, buffer=mm, offset=offset)
+                source = planes[name]
+                for band in _bands(rows, cols):
+                    if dtype is None:
+                        out[band] = np.packbits(source[band], axis=1)
+                    elif name == 'age' and source.dtype.itemsize > 4:
+                        out[band] = np.minimum(source[band], 0xFFFFFFFF)
+                    else:
+                        out[band] = source[band]
+                del out
+            mm.flush()
+    os.replace(tmp, path)
+    return size
+
+
+def _read_header(mm):
+    magic, version, flags, rows, cols, generation, seed, mode, rule = _header.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a checkpoint file")
+    if not 1 <= version <= VERSION:
+        raise ValueError(f"Checkpoint version {version}, this reader knows 1 to {VERSION}")
+    return Header(
+        rows, cols, generation, None if seed < 0 else seed,
+        mode.rstrip(b'\0').decode(), rule.rstrip(b'\0').decode(), bool(flags & MULTISTATE), version,
+    )
+
+
+def read_header(path):
+    """Header of a checkpoint, to build a matching engine before restore"""
+    with open(path, 'rb') as f:
+        return _read_header(f.read(_header_size))
+
+
+def restore(engine, path):
+    """
+    Resume an engine from a checkpoint: board, ages, generation and seed.
+    The engine takes the checkpoint's size, cycle detection starts over.
+
+    :param engine: Engine of the checkpoint's rule, GenerationsEngine for multistate ones
+    :param path: Str - Checkpoint file
+    :return: Header - What the checkpoint held
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = _read_header(mm)
+        if header.multistate != engine.multistate:
+            raise ValueError(f"Checkpoint of {header.rule} does not fit a {type(engine).__name__}")
+        if header.rule != str(engine.rule):
+            raise ValueError(f"Checkpoint runs {header.rule}, the engine {engine.rule}")
+
+        rows, cols = header.rows, header.cols
+        layout, size = _layout(rows, cols, header.multistate, header.version)
+        if len(mm) < size:
+            raise ValueError(f"Checkpoint truncated, {len(mm)} of {size} bytes")
+        planes = _new_planes(rows, cols, header.multistate)
+        for name, dtype, shape, offset in layout:
+            source = np.ndarray(shape, dtype=dtype or np.uint8, buffer=mm, offset=offset)
+            out = planes[name]
+            for band in _bands(rows, cols):
+                if dtype is None:
+                    out[band] = np.unpackbits(source[band], axis=1, count=cols)
+                else:
+                    out[band] = source[band]
+            del source
+
+    _set_planes(engine, planes)
+    engine.generation = header.generation
+    engine.seed = header.seed
+    if engine.tile_size and not engine.backend and not engine.multistate:
+        engine.tiles = TileTracker(engine.rows, engine.cols, engine.tile_size)
+        engine._tile_synced = {}
+    engine._start_history()
+    return header
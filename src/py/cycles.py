@@ -0,0 +1,96 @@
+import sys
+import random
+import functools
+from array import array
+from collections import deque, namedtuple
+
+
+# fixed seed, keys must not draw from the global RNG that fills the boards
+_key_seed = 0x5EED
+_odd = bytes(i | 1 for i in range(256))
+
+
+@functools.lru_cache(maxsize=4)
+def zobrist_keys(n):
+    """
+    One random 64 bit key per cell. A board hashes to the XOR of the keys
+    of its live cells, so a generation updates it from the changed cells
+    only and an empty board hashes to 0.
+
+    :param n: Int - Number of cells
+    :return: array('Q') of n keys, shared between callers so read only
+    """
+    rng = random.Random(_key_seed)
+    # randbytes is limited to 2**31 bits a call
+    data = bytearray()
+    for start in range(0, 8 * n, 1 << 24):
+        data += rng.randbytes(min(1 << 24, 8 * n - start))
+    # odd keys, so key * state stays distinct for every state
+    low = 0 if sys.byteorder == 'little' else 7
+    data[low::8] = data[low::8].translate(_odd)
+    keys = array('Q')
+    keys.frombytes(data)
+    return keys
+
+
+def point_key(row, col):
+    """Key of a cell on an unbounded plane, where keys can't be drawn up front"""
+    return hash((_key_seed, row, col))
+
+
+class Cycle(namedtuple('Cycle', 'kind period start')):
+    """
+    Where a board ended up: kind is 'extinct', 'still' or 'oscillator',
+    period the generations between repeats and start the first generation
+    of the repeating state.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        if self.kind == 'extinct':
+            return f"Extinct at gen {self.start}"
+        if self.kind == 'still':
+            return f"Still life since gen {self.start}"
+        return f"Period {self.period} since gen {self.start}"
+
+
+class CycleDetector:
+    """
+    Remembers the board hashes of the last history generations and reports
+    the first one that comes back. Oscillators with a longer period than
+    history go unnoticed, a 64 bit collision would be a false report.
+    """
+    def __init__(self, history=1024):
+        """
+        :param history: Int - Generations kept in the hash table
+        """
+        self.history = history
+        self.reset()
+
+    def reset(self):
+        self.seen = {}       # hash -> generation it was first seen
+        self.order = deque() # hashes oldest first, for eviction
+        self.cycle = None
+
+    def record(self, generation, key):
+        """
+        Add a generation, return the Cycle once one is found (then the same
+        one on every later call) or None
+
+        :param generation: Int - Generation number of the board
+        :param key: Int - Its hash, 0 for an empty board
+        """
+        if self.cycle:
+            return self.cycle
+        if key == 0:
+            self.cycle = Cycle('extinct', 1, generation)
+        elif key in self.seen:
+            start = self.seen[key]
+            period = generation - start
+            self.cycle = Cycle('still' if period == 1 else 'oscillator', period, start)
+        else:
+            self.seen[key] = generation
+            self.order.append(key)
+            if len(self.order) > self.history:
+                del self.seen[self.order.popleft()]
+        return self.cycle
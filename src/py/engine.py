@@ -1,13 +1,30 @@
 import os
 import sys
+import copy
+import time
 import random
+import bisect
+import importlib
 
 from cell import StandardCell, ImmortalCell
+from tiles import TileTracker
+from cellstore import CellStore
+from rules import get_rule
+from cycles import CycleDetector, zobrist_keys
+from patterns import Pattern, placement
+import seeding
 #from main import seed
 
 cols_dflt = 20
 rows_dflt = 10
 
+# name -> (module, class), imported on demand so optional deps stay optional
+backends = {
+    'object': None,
+    'numpy': ('npengine', 'NumpyBackend'),
+    'parallel': ('parallel', 'ParallelBackend'),
+}
+
 ## --------------------------------------------------------------------
 # Underpopulation - If a live cell has is surrounded 
 #                   by less than two surrounding neighbours
@@ -45,14 +62,32 @@ rows_dflt = 10
 
 
 class GameOfLifeEngine:
-    def __init__(self, mode='original', rows=None, cols=None):
+    # runs GenerationsRule with more than the dead / alive states
+    multistate = False
+    # runs SmoothRule on float densities
+    continuous = False
+    
+    def __init__(self, mode='original', rows=None, cols=None, backend='object', tile_size=None, workers=None,
+                 compact=False, rule=None, history=1024):
         """
         Initialize the Game of Life engine
         
         :param rows: Int - Number of rows (None for auto-detect)
         :param cols: Int - Number of columns (None for auto-detect)
+        :param backend: Str - 'object' for Cell grids or a key of backends
+        :param tile_size: Int - Only recompute tiles near last changes (None for off)
+        :param workers: Int - Processes for the parallel backend (None for all cores)
+        :param compact: Bool - Keep the object backend's cells in a CellStore, less memory but slower, see there
+        :param rule: Str or Rule - Life-like rule such as 'B36/S23' (None for Conway's B3/S23)
+        :param history: Int - Generations of board hashes kept to spot cycles
         """
         self.mode = mode
+        self.rule = get_rule(rule)
+        if self.rule.states > 2 and not self.multistate:
+            raise ValueError(f"{self.rule} has {self.rule.states} states, run it on generations.GenerationsEngine")
+        if getattr(self.rule, 'continuous', False) != self.continuous:
+            raise ValueError(f"{self.rule} and the engine do not agree on continuous states, "
+                             "SmoothLife rules run on smoothlife.SmoothLifeEngine")
         self.rows = rows or self._detect_terminal_rows()
         self.cols = cols or self._detect_terminal_cols()
         if self.cols < cols_dflt:
@@ -61,13 +96,38 @@ class GameOfLifeEngine:
             self.rows = rows_dflt
         
         self.current_generation = []
-        self.next_generation = []
         self.generation = 0
+        # board hash, updated from the changed cells every generation
+        self.hash = 0
+        self._keys = None
+        self.cycles = CycleDetector(history)
+        self.cycle = None # cycles.Cycle once the board repeats or dies out
+        # callables run with the engine after every generation, see recorder.Recorder
+        self.on_generation = []
+        self.compact = compact
+        self.store = None
+        self.seed = None # seed of the random board, see seeding; drawn at the first random fill if None
+        self.density = 1 / 8 # chance of a live cell on a random board
+        self.immortal_ratio = 1 / 100 # chance of an immortal cell on a random board, not in 'original' mode
+        self.profiler = None # profiler.Profiler timing the phases of a generation, if attached
+        
+        self.tile_size = tile_size
+        self.tiles = None
+        self.workers = workers
+        # generation each tile's ages were last brought up to date
+        self._tile_synced = {}
         
         self.paused = False
         self.tsleep = 0
         
-        print(f"Planet {mode}: [{self.cols} * {self.rows}]")
+        if backend not in backends:
+            raise ValueError(f"Unknown backend {backend!r}, use one of {list(backends)}")
+        self.backend = None
+        if backends[backend]:
+            module, name = backends[backend]
+            self.backend = getattr(importlib.import_module(module), name)(self)
+        
+        print(f"Planet {mode} {self.rule}: [{self.cols} * {self.rows}]")
     
     ## ---------------------
     def _detect_terminal_rows(self):
@@ -106,50 +166,94 @@ class GameOfLifeEngine:
     def initialize_grid(self, pattern=None):
         """
         Initialize the grid with a pattern or random values
-        :param pattern: Cell[][] - Optional predefined pattern of cell objects
+        :param pattern: Cell[][] - Optional predefined pattern of cell objects,
+                        or a patterns.Pattern placed in the middle of the board
         """
-        if pattern:
+        if isinstance(pattern, Pattern) and not self.backend and not self.compact:
+            pattern = self._pattern_grid(pattern)
+        if self.backend:
+            self.backend.rows, self.backend.cols = self.rows, self.cols
+            self.backend.initialize(pattern)
+            self.rows, self.cols = self.backend.rows, self.backend.cols
+        elif self.compact:
+            if isinstance(pattern, Pattern):
+                self.store = self._pattern_store(pattern)
+                self.rows, self.cols = self.store.rows, self.store.cols
+            elif pattern:
+                self.store = CellStore.from_cells(pattern)
+                self.rows, self.cols = self.store.rows, self.store.cols
+            else:
+                self.store = self._create_random_store()
+            # views over the store, the object code below runs on them unchanged
+            self.current_generation = self.store.grid()
+        elif pattern:
             # Assume pattern is already a grid of Cell objects
             self.current_generation = [[cell for cell in row] for row in pattern]
             self.rows = len(pattern)
             self.cols = len(pattern[0]) if pattern else self.cols
         else:
             self.current_generation = self._create_random_grid()
-    
-    def _get_cell(self):
-        #aliviness = 
-        is_alive = (random.randint(0, 7) == 0)
-        #is_immortal = (random.randint(0, 70) == 0)
         
-        if self.mode == 'original':
-            return StandardCell(
-                is_alive=is_alive,
-                alive_char='@',
-                death_char='.',
-            )
-        else:
-            if random.randint(1, 100) == 1:
-                return ImmortalCell(
-                    is_alive=is_alive,
-                    alive_char='R',
-                    death_char='.',
-                )
-            else:
-                return StandardCell(
-                    is_alive=is_alive,
-                    alive_char='@',
-                    death_char='.',
-                )
+        if self.tile_size and not self.backend:
+            self.tiles = TileTracker(self.rows, self.cols, self.tile_size)
+            self._tile_synced = {}
+        self._start_history()
+    
+    def _pattern_grid(self, pattern):
+        """Cell[][] of a Pattern, dead StandardCells around it"""
+        rows, cols, top, left = placement(pattern, self.rows, self.cols)
+        grid = [
+            [StandardCell(is_alive=False, alive_char='@', death_char='.') for _ in range(cols)]
+            for _ in range(rows)
+        ]
+        for row, col, _ in pattern.cells():
+            grid[top + row][left + col] = StandardCell(is_alive=True, alive_char='@', death_char='.')
+        return grid
+    
+    def _pattern_store(self, pattern):
+        """_pattern_grid into a CellStore, no Cell objects on the way"""
+        rows, cols, top, left = placement(pattern, self.rows, self.cols)
+        store = CellStore(rows, cols)
+        store.kind_id(StandardCell, '@', '.') # kind 0, what the zeroed kind array already says
+        for row, col, _ in pattern.cells():
+            i = (top + row) * cols + left + col
+            store.alive[i] = store.born[i] = 1 # Cell.__init__ marks initial live cells as born
+        return store
+    
+    def _board_seed(self):
+        """Seed of a random board, drawn from the global RNG if not set so random.seed() still fixes it"""
+        if self.seed is None:
+            self.seed = random.getrandbits(32)
+        return self.seed
+
+    def _random_rows(self):
+        """seeding.rows of the whole board, immortal cells only outside 'original' mode"""
+        immortal = self.immortal_ratio if self.mode != 'original' else 0.0
+        return seeding.rows(self._board_seed(), self.cols, self.density, immortal, 0, self.rows)
 
     def _create_random_grid(self):
-        """Create a random grid of cell objects"""
+        """Create a random grid of cell objects, the same board as any other engine for the seed"""
         grid = []
-        for row in range(self.rows):
-            grid_row = []
-            for col in range(self.cols):
-                grid_row.append( self._get_cell() )
-            grid.append(grid_row)
+        for alive, immortal in self._random_rows():
+            grid.append([
+                ImmortalCell(is_alive=bool(is_alive), alive_char='R', death_char='.') if is_immortal
+                else StandardCell(is_alive=bool(is_alive), alive_char='@', death_char='.')
+                for is_alive, is_immortal in zip(alive, immortal)
+            ])
         return grid
+    
+    def _create_random_store(self):
+        """_create_random_grid into a CellStore, a row of each array at a time"""
+        store = CellStore(self.rows, self.cols)
+        standard = store.kind_id(StandardCell, '@', '.')
+        immortal = store.kind_id(ImmortalCell, 'R', '.') if self.mode != 'original' else standard
+        kinds = bytes([standard, immortal]) + bytes(254)
+        for row, (alive, is_immortal) in enumerate(self._random_rows()):
+            cells = slice(row * self.cols, (row + 1) * self.cols)
+            store.alive[cells] = alive
+            store.born[cells] = alive # Cell.__init__ marks initial live cells as born
+            store.kind[cells] = is_immortal.translate(kinds)
+        return store
     ## ---------------------
     
     def get_neighbors(self, row, col):
@@ -181,56 +285,229 @@ class GameOfLifeEngine:
     
     def _update_step(self, row, col):
         neighbors = self.get_neighbors(row, col)
-        self.current_generation[row][col].update(neighbors) # calculate its next state
-        self.current_generation[row][col].apply_update()
-        
-        if self.generation:
-            ## Determine the cell type for the next generation
-            next_cell_type = type(self.current_generation[row][col])
-            ## Ensure the next cell is the correct type
-            if not isinstance(self.next_generation[row][col], next_cell_type):
-                print(f"MISMATCH OF CELL TYPES {self.next_generation[row][col]} {next_cell_type}")
-                # Create new cell of correct type, initially dead
-                self.next_generation[row][col] = next_cell_type(is_alive=False)
-            
-            self.next_generation[row][col].is_alive = self.current_generation[row][col].is_alive
-            self.next_generation[row][col].age = self.current_generation[row][col].age
+        self.current_generation[row][col].update(neighbors, self.rule.table) # calculate its next state
     
 
     ## ---------------------
     def update_generation(self):
         """Calculate the next generation"""
-        if not self.generation:
-            for row in range(self.rows):
-                new_row = []
-                for col in range(self.cols):
-                    #self._update_step(row, col)
-                    neighbors = self.get_neighbors(row, col)
-                    self.current_generation[row][col].update(neighbors) 
-                    self.current_generation[row][col].apply_update()
-                    new_row.append(self.current_generation[row][col])
-                self.next_generation.append(new_row)
-        else:   
-            for row in range(self.rows):
-                for col in range(self.cols):                
+        if self.profiler and not self.backend:
+            self._update_profiled()
+            return
+        if self.backend:
+            self.backend.step()
+            self.hash = self.backend.hash
+            self.generation += 1
+            self._record()
+            return
+        if self.tiles:
+            self._update_tiles()
+            return
+        
+        # All next states are computed from the untouched grid first and only
+        # then applied, so no cell sees a neighbor that was already updated
+        for row in range(self.rows):
+            for col in range(self.cols):
+                self._update_step(row, col)
+        keys = self._keys
+        for row in range(self.rows):
+            for col in range(self.cols):
+                cell = self.current_generation[row][col]
+                was_alive = cell.is_alive
+                cell.apply_update()
+                if cell.is_alive != was_alive:
+                    self.hash ^= keys[row * self.cols + col]
+        self.generation += 1
+        self._record()
+    
+    def _update_tiles(self):
+        """update_generation restricted to the tiles the TileTracker keeps active"""
+        active = self.tiles.begin()
+        for tile in active:
+            self._sync_tile(tile)
+        
+        for tile in active:
+            rows, cols = self.tiles.ranges(tile)
+            for row in rows:
+                for col in cols:
                     self._update_step(row, col)
-            # Swap grids
-            self.current_generation, self.next_generation = self.next_generation, self.current_generation
+        for tile in active:
+            rows, cols = self.tiles.ranges(tile)
+            for row in rows:
+                for col in cols:
+                    cell = self.current_generation[row][col]
+                    was_alive = cell.is_alive
+                    cell.apply_update()
+                    if cell.is_alive != was_alive:
+                        self.tiles.mark(row, col)
+                        self.hash ^= self._keys[row * self.cols + col]
+        
+        self.generation += 1
+        for tile in active:
+            self._tile_synced[tile] = self.generation
+        self.tiles.end()
+        self._record()
+    
+    def _update_profiled(self):
+        """
+        update_generation, whole or restricted to the active tiles, timing
+        its phases and counting births and deaths into the profiler.
+        Neighbors are gathered a row at a time so they can be timed apart
+        from Cell.update, the result is the same.
+        """
+        profiler = self.profiler
+        clock = time.perf_counter
+        if self.tiles:
+            t = clock()
+            active = self.tiles.begin()
+            for tile in active:
+                self._sync_tile(tile)
+            blocks = [self.tiles.ranges(tile) for tile in active]
+            profiler.add('sync', clock() - t)
+        else:
+            blocks = [(range(self.rows), range(self.cols))]
+        
+        grid = self.current_generation
+        table = self.rule.table
+        gather = update = 0.0
+        for rows, cols in blocks:
+            for row in rows:
+                t0 = clock()
+                neighbors = [self.get_neighbors(row, col) for col in cols]
+                t1 = clock()
+                line = grid[row]
+                for col, cell_neighbors in zip(cols, neighbors):
+                    line[col].update(cell_neighbors, table)
+                gather += t1 - t0
+                update += clock() - t1
+        profiler.add('neighbors', gather)
+        profiler.add('update', update)
+        
+        t = clock()
+        births = deaths = 0
+        for rows, cols in blocks:
+            for row in rows:
+                for col in cols:
+                    cell = grid[row][col]
+                    was_alive = cell.is_alive
+                    cell.apply_update()
+                    if cell.is_alive != was_alive:
+                        if was_alive:
+                            deaths += 1
+                        else:
+                            births += 1
+                        if self.tiles:
+                            self.tiles.mark(row, col)
+                        self.hash ^= self._keys[row * self.cols + col]
+        profiler.add('apply', clock() - t)
+        profiler.count(births, deaths)
+        
         self.generation += 1
+        if self.tiles:
+            for tile in active:
+                self._tile_synced[tile] = self.generation
+            self.tiles.end()
+        self._record()
+    
+    def _sync_tile(self, tile):
+        """Age the cells of a tile for the generations it was skipped"""
+        skipped = self.generation - self._tile_synced.get(tile, self.generation)
+        if skipped:
+            rows, cols = self.tiles.ranges(tile)
+            for row in rows:
+                for col in cols:
+                    self.current_generation[row][col].idle(skipped)
+        self._tile_synced[tile] = self.generation
     ## ---------------------
     
+    ## ---------------------
+    def _hash_board(self):
+        """Hash of the whole board, XOR of the keys of the live cells"""
+        if self.backend:
+            return self.backend.hash
+        self._keys = zobrist_keys(self.rows * self.cols)
+        h = 0
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self.current_generation[row][col].is_alive:
+                    h ^= self._keys[row * self.cols + col]
+        return h
+    
+    def _start_history(self):
+        """Hash a new board and restart cycle detection from it"""
+        self.hash = self._hash_board()
+        self.cycles.reset()
+        self._record()
+    
+    def _record(self):
+        self.cycle = self.cycles.record(self.generation, self.hash)
+        for hook in self.on_generation:
+            hook(self)
+    
+    def is_active(self):
+        """False once the board died out or repeats, see cycle"""
+        return self.cycle is None
+    ## ---------------------
+    
+    
+    def sync_tiles(self):
+        """Bring the ages of every skipped tile up to date"""
+        if self.tiles:
+            for tile in list(self._tile_synced):
+                self._sync_tile(tile)
     
     def get_grid_state(self):
         """Return current grid state"""
+        self.sync_tiles()
         return {
             'generation': self.generation,
-            'grid': self.current_generation, # grid of cell objects
+            'grid': self.backend.to_cells() if self.backend else self.current_generation, # grid of cell objects
             'rows': self.rows,
             'cols': self.cols,
             'paused': self.paused,
-            'speed': self.tsleep
+            'speed': self.tsleep,
+            'tiles': (self.tiles.active_tiles, self.tiles.skipped_tiles) if self.tiles else None,
+            'cycle': self.cycle,
+            'seed': self.seed
         }
     
+    def live_points(self):
+        """(row, col, 1) of every live cell, row major, see patterns.save"""
+        if self.backend:
+            yield from self.backend.live_points()
+            return
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self.current_generation[row][col].is_alive:
+                    yield row, col, 1
+    
+    def population(self):
+        """Number of live cells"""
+        if self.backend:
+            return self.backend.population()
+        if self.store:
+            return sum(self.store.alive)
+        return sum(cell.is_alive for row in self.current_generation for cell in row)
+    
+    def close(self):
+        """Release what the backend holds (worker processes, shared memory)"""
+        if self.backend and hasattr(self.backend, 'close'):
+            self.backend.close()
+    
+    def snapshot(self):
+        """
+        Grid state that stays valid while the engine keeps stepping,
+        for a renderer running on another thread
+        """
+        state = self.get_grid_state()
+        if self.store and state['grid'] is self.current_generation:
+            # views read the live store, give them a copy of it
+            state['grid'] = self.store.copy().grid()
+        elif state['grid'] is self.current_generation:
+            # Cell objects are updated in place, so copy them
+            state['grid'] = [[copy.copy(cell) for cell in row] for row in state['grid']]
+        return state
+    
     ## ---------------------
     def toggle_pause(self):
         """Toggle pause state"""
@@ -252,7 +529,6 @@ class GameOfLifeDisplay:
     def __init__(self):
         """Initialize display handler"""
         self.old_settings = None
-        # TODO dyn according age
         self.colors = {
             'reset': 
                 '\033[0m',
@@ -262,6 +538,8 @@ class GameOfLifeDisplay:
                 '\033[32m',    
             'bright_green': 
                 '\033[92m',
+            'dark_green': 
+                '\033[2;32m',
             'red': 
                 #'\033[3;41m',
                 '\033[31m',
@@ -270,6 +548,26 @@ class GameOfLifeDisplay:
             'purple': 
                 '\033[2;95m'
         }
+        # live cells by age, (first age, color), older ones get darker
+        self.age_palette = [
+            (0, self.colors['green']),
+            (11, self.colors['dark_green']),
+            (30, '\033[38;5;28m'),
+            (100, '\033[38;5;22m'),
+        ]
+        # dying states of Generations rules, just died to almost dead
+        self.decay_palette = [
+            self.colors['red'],
+            '\033[2;31m',
+            '\033[38;5;88m',
+            '\033[38;5;52m',
+        ]
+        self._age_steps = [age for age, _ in self.age_palette]
+        self.profiler = None # profiler.Profiler timing frames, if attached
+
+    def age_color(self, age):
+        """Color of a live cell of this age, from age_palette"""
+        return self.age_palette[bisect.bisect_right(self._age_steps, age) - 1][1]
 
     ## --------------------------------
     def clear_screen(self):
@@ -288,6 +586,46 @@ class GameOfLifeDisplay:
         sys.stdout.flush()
     ## --------------------------------
     
+    def _status_line(self, grid_state):
+        """Status text padded / truncated to the grid width"""
+        # the engine's board seed, None for patterns and boards it didn't draw
+        status = f"Seed {grid_state['seed']} | " if grid_state.get('seed') is not None else ""
+        status += f"Gen {grid_state['generation']} | "
+        if grid_state['paused']:
+            status += "[PAUSE] | "
+        status += f"Speed {grid_state['speed']:.2f}s | "
+        if grid_state.get('tiles'):
+            active, skipped = grid_state['tiles']
+            status += f"Tiles {active}/{active + skipped} | "
+        if grid_state.get('cycle'):
+            status += f"{grid_state['cycle']} | "
+        if grid_state.get('info'): # anything else the engine wants shown
+            status += f"{grid_state['info']} | "
+        if self.profiler and self.profiler.show_hud:
+            status += f"{self.profiler.hud()} | "
+        
+        # Truncate/pad status to fit screen width
+        max_width = grid_state['cols'] * 2
+        if len(status) > max_width:
+            status = status[:max_width-3] + "..."
+        else:
+            status = status.ljust(max_width)
+        return status
+    
+    def _frame(self, grid_state):
+        """
+        (color, char) of every cell, [row][col]. Engines without Cell objects
+        hand a 'render' function over in grid_state that builds it directly.
+        """
+        if grid_state.get('render'):
+            return grid_state['render'](self)
+        grid = grid_state['grid']
+        frame = []
+        for row in range(grid_state['rows']):
+            cells = [grid[row][col] for col in range(grid_state['cols'])]
+            frame.append([(cell.get_display_color(self), cell.get_display_char()) for cell in cells])
+        return frame
+    
     def print_grid(self, grid_state):
         """
         Print the grid to console using polymorphic cell methods
@@ -295,46 +633,114 @@ class GameOfLifeDisplay:
         """
         rows = grid_state['rows']
         cols = grid_state['cols']
-        grid = grid_state['grid'] # engine.current_generation grid of cell objects
-        generation = grid_state['generation']
-        paused = grid_state['paused']
-        speed = grid_state['speed']
+        profiler = self.profiler
+        if profiler:
+            t0 = time.perf_counter()
+        frame = self._frame(grid_state)
+        if profiler:
+            t1 = time.perf_counter()
+            written = 0
         
         sys.stdout.write('\033[H') # Move cursor to home
         
         
         ## -----------------------------------------
-        status = f"Seed {random.seed()} | Gen {generation} | "
-        if paused:
-            status += "[PAUSE] | "
-        status += f"Speed {speed:.2f}s | "
-        
-        # Truncate/pad status to fit screen width
-        max_width = cols * 2
-        if len(status) > max_width:
-            status = status[:max_width-3] + "..."
-        else:
-            status = status.ljust(max_width)
-        sys.stdout.write(self.colors.get('yellow', '') + status + self.colors['reset'] + "\n")
+        status = self._status_line(grid_state)
+        status = self.colors.get('yellow', '') + status + self.colors['reset'] + "\n"
+        sys.stdout.write(status)
+        if profiler:
+            # bytes as bench.py counts them, the cursor move included
+            written += len(('\033[H' + status).encode())
         ## -----------------------------------------
         
+        codes = list(self.colors.values()) + [v for _, v in self.age_palette] + self.decay_palette
         for row in range(rows):
             line = ""
             for col in range(cols):
-                cell = grid[row][col]
-                char = cell.get_display_char()
-                color = cell.get_display_color(self)
+                color, char = frame[row][col]
                 line += f"{color}{char}{self.colors['reset']} "
                 #print(f"{color} ")
             
             # Ensure line fills the width
             target_length = cols * 2
             l = line
-            for k,v in self.colors.items(): l = l.replace(v,'')
+            for v in codes: l = l.replace(v,'')
             
             current_length = len(line) - len(l) #(line.count('\033[') * 6) 
             if current_length < target_length:
                 line += " " * (target_length - current_length)
             sys.stdout.write(line + "\n")
+            if profiler:
+                written += len(line.encode()) + 1
             
-        sys.stdout.flush()
\ No newline at end of file
+        sys.stdout.flush()
+        if profiler:
+            profiler.frame(t1 - t0, time.perf_counter() - t1, written)
+
+
+class GameOfLifeDiffDisplay(GameOfLifeDisplay):
+    """
+    Display that remembers the last frame it drew and only rewrites the cells
+    whose glyph or color changed, with one color escape per run of equal
+    colors and a single write per frame.
+    """
+    def __init__(self):
+        super().__init__()
+        self.previous = None # [row][col] -> (color, char) on screen
+        self.last_frame_bytes = 0
+    
+    def invalidate(self):
+        """Forget what is on screen, the next frame is drawn in full"""
+        self.previous = None
+    
+    def clear_screen(self):
+        """Clear screen and move cursor to home"""
+        super().clear_screen()
+        self.invalidate()
+    
+    def print_grid(self, grid_state):
+        """
+        Print the cells that changed since the last frame
+        :param grid_state: Dict - Grid state from engine
+        """
+        rows = grid_state['rows']
+        cols = grid_state['cols']
+        reset = self.colors['reset']
+        
+        previous = self.previous
+        if previous is not None and (len(previous) != rows or len(previous[0]) != cols):
+            previous = None
+        
+        out = ['\033[H', self.colors.get('yellow', ''), self._status_line(grid_state), reset]
+        color_now = None
+        profiler = self.profiler
+        if profiler:
+            t0 = time.perf_counter()
+        frame = self._frame(grid_state)
+        if profiler:
+            t1 = time.perf_counter()
+        for row in range(rows):
+            line = frame[row]
+            old = previous[row] if previous else None
+            cursor = None # column the terminal cursor is on, within this row
+            for col in range(cols):
+                color, char = line[col]
+                if old and old[col] == line[col]:
+                    continue
+                if cursor != col:
+                    # status is line 1, every cell is 2 columns wide
+                    out.append(f"\033[{row + 2};{col * 2 + 1}H")
+                if color != color_now:
+                    out.append(color)
+                    color_now = color
+                out.append(char + " ")
+                cursor = col + 1
+        out.append(reset)
+        
+        data = ''.join(out)
+        sys.stdout.write(data)
+        sys.stdout.flush()
+        self.last_frame_bytes = len(data.encode())
+        self.previous = frame
+        if profiler:
+            profiler.frame(t1 - t0, time.perf_counter() - t1, self.last_frame_bytes)
@@ -0,0 +1,155 @@
+import random
+
+import numpy as np
+
+from npengine import count_neighbors, rule_table
+from rules import get_rule
+from cycles import zobrist_keys
+
+
+class EnsembleEngine:
+    """
+    Many boards of the same size and rule stacked in one [board][row][col]
+    bool array, every generation of all of them is one vectorized pass.
+    Meant for density / rule studies over hundreds of small random boards,
+    there are no ages, immortal cells or rendering.
+
+    Per board results are arrays indexed by board: population(),
+    extinct_at, cycle_start and period. Boards keep running once they
+    settled, run() stops when all of them have.
+    """
+    def __init__(self, boards, rows=64, cols=64, rule=None, history=1024):
+        """
+        :param boards: Int - Number of boards
+        :param rows: Int - Rows of every board
+        :param cols: Int - Columns of every board
+        :param rule: Str or Rule - Life-like rule (None for B3/S23), 2 states only
+        :param history: Int - Generations of board hashes kept to spot cycles
+        """
+        self.rule = get_rule(rule)
+        if self.rule.states != 2 or getattr(self.rule, 'continuous', False):
+            raise ValueError(f"{self.rule} is not a 2 state Life-like rule")
+        self.boards = boards
+        self.rows = rows
+        self.cols = cols
+        self.history = history
+        self.alive = None
+        self.generation = 0
+
+        # rule_table flattened, indexed by alive * 9 + live neighbors like Rule.table
+        self._table = rule_table(self.rule).ravel()
+
+    ## ---------------------
+    def initialize_grid(self, pattern=None, density=0.125):
+        """
+        Fill the boards from an array or at random
+
+        :param pattern: Bool[][][] - [board][row][col] states, all boards the same size
+        :param density: Float or Float[] - Chance of a live cell, one per board or for all
+        """
+        if pattern is not None:
+            self.alive = np.array(pattern, dtype=bool)
+            if self.alive.ndim != 3:
+                raise ValueError("An ensemble pattern is [board][row][col]")
+            self.boards, self.rows, self.cols = self.alive.shape
+        else:
+            # seeded from the global RNG so random.seed() still fixes the boards
+            rng = np.random.default_rng(random.getrandbits(32))
+            density = np.broadcast_to(np.asarray(density, dtype=np.float32), (self.boards,))
+            self.alive = rng.random((self.boards, self.rows, self.cols), dtype=np.float32) < density[:, None, None]
+        self.generation = 0
+        words = -(-self.rows * -(-self.cols // 8) // 8)
+        self._keys = np.frombuffer(zobrist_keys(words), dtype=np.uint64)
+        self._start_history()
+
+    def _start_history(self):
+        self.extinct_at = np.full(self.boards, -1, dtype=np.int64)
+        self.cycle_start = np.full(self.boards, -1, dtype=np.int64)
+        self.period = np.zeros(self.boards, dtype=np.int64)
+        self._ring = np.zeros((self.history, self.boards), dtype=np.uint64)
+        self._ring_gen = np.full(self.history, -1, dtype=np.int64)
+        self._record()
+    ## ---------------------
+
+    def update_generation(self):
+        """Calculate the next generation of every board"""
+        index = self.alive.view(np.uint8) * np.uint8(9)
+        index += count_neighbors(self.alive)
+        self.alive = self._table.take(index)
+        self.generation += 1
+        self._record()
+
+    def step(self, generations=1):
+        """Advance every board generations times"""
+        for _ in range(generations):
+            self.update_generation()
+
+    def run(self, gens, stop=True):
+        """
+        Advance up to gens generations
+
+        :param stop: Bool - Stop early once every board died out or repeats
+        :return: Dict - results()
+        """
+        for _ in range(gens):
+            if stop and self.settled().all():
+                break
+            self.update_generation()
+        return self.results()
+
+    ## ---------------------
+    def hashes(self):
+        """64 bit hash of every board, 0 for an empty one"""
+        packed = np.packbits(self.alive, axis=-1).reshape(self.boards, -1)
+        pad = -packed.shape[1] % 8
+        if pad:
+            packed = np.pad(packed, ((0, 0), (0, pad)))
+        # zobrist keys are odd, so a non zero word times its key stays non zero
+        return np.bitwise_xor.reduce(packed.view(np.uint64) * self._keys, axis=1)
+
+    def _record(self):
+        """Spot the boards that died out or came back to a hash still in the ring"""
+        h = self.hashes()
+        open_ = self.period == 0
+        extinct = open_ & (h == 0)
+        self.extinct_at[extinct] = self.generation
+        self.cycle_start[extinct] = self.generation
+        self.period[extinct] = 1
+
+        match = (self._ring == h) & (self._ring_gen >= 0)[:, None]
+        repeat = open_ & ~extinct & match.any(axis=0)
+        if repeat.any():
+            start = self._ring_gen[match[:, repeat].argmax(axis=0)]
+            self.cycle_start[repeat] = start
+            self.period[repeat] = self.generation - start
+
+        slot = self.generation % self.history
+        self._ring[slot] = h
+        self._ring_gen[slot] = self.generation
+
+    def settled(self):
+        """Bool per board, died out or repeating"""
+        return self.period > 0
+
+    def population(self):
+        """Live cells per board"""
+        return np.count_nonzero(self.alive, axis=(1, 2))
+
+    def kinds(self):
+        """'extinct', 'still', 'oscillator' or 'running' per board, see cycles.Cycle"""
+        kinds = np.full(self.boards, 'running', dtype=object)
+        kinds[self.period > 1] = 'oscillator'
+        kinds[self.period == 1] = 'still'
+        kinds[self.extinct_at >= 0] = 'extinct'
+        return kinds
+
+    def results(self):
+        """Per board arrays: population, outcome, extinct_at, cycle_start, period (-1 / 0 if none)"""
+        return {
+            'population': self.population(),
+            'outcome': self.kinds(),
+            'extinct_at': self.extinct_at.copy(),
+            'cycle_start': self.cycle_start.copy(),
+            'period': self.period.copy(),
+        }
+    ## ---------------------
@@ -0,0 +1,192 @@
+import numpy as np
+
+from cell import ImmortalCell
+from engine import GameOfLifeEngine
+from npengine import count_neighbors, rule_table
+from rules import GenerationsRule
+from cycles import zobrist_keys
+from patterns import Pattern, placement
+import seeding
+
+
+class GenerationsEngine(GameOfLifeEngine):
+    """
+    Multi-state engine for Generations rules ('B2/S/C3' Brian's Brain,
+    'B2/S345/C4' Star Wars, any plain B/S rule as 2 states) on a torus.
+
+    State and age are uint8 arrays: 0 dead, 1 alive, 2 .. states-1 dying.
+    A generation is one batched pass over the arrays, births, survival,
+    ImmortalCell-style sticky cells (mode 'other') and decay together.
+    Frames are colored straight from the arrays through the display's
+    age_palette / decay_palette, there are no Cell objects.
+    """
+    multistate = True
+
+    def __init__(self, mode='original', rows=None, cols=None, rule=None):
+        """
+        :param rows: Int - Number of rows (None for auto-detect)
+        :param cols: Int - Number of columns (None for auto-detect)
+        :param rule: Str or Rule - Generations rule, a B/S rule runs with 2 states
+                     (None for Brian's Brain)
+        """
+        super().__init__(mode=mode, rows=rows, cols=cols, rule=rule or 'brianbrain')
+        self.rule = GenerationsRule.parse(self.rule)
+        self.table = rule_table(self.rule)
+        self.state = None
+        self.age = None
+        self.immortal = None
+
+        # state -> state after decay, dying cells move one on, the last one dies
+        decay = np.arange(1, self.rule.states + 1) % self.rule.states
+        decay[0] = 0
+        self._decay = decay.astype(np.uint8)
+
+    ## ---------------------
+    def initialize_grid(self, pattern=None):
+        """
+        Fill the arrays from a pattern or at random
+
+        :param pattern: Cell[][], Int[][] or patterns.Pattern - Optional pattern, ints are states
+        """
+        if isinstance(pattern, Pattern):
+            self._load_points(pattern)
+        elif pattern:
+            self._load_pattern(pattern)
+        else:
+            self._create_random_arrays()
+        self.generation = 0
+        self._start_keys()
+        self._start_history()
+
+    def _start_keys(self):
+        self._keys = np.frombuffer(zobrist_keys(self.rows * self.cols), dtype=np.uint64).reshape(self.rows, self.cols)
+
+    def load_planes(self, state, age, immortal):
+        """Take the arrays over from a checkpoint, states past the rule's last one die"""
+        self.rows, self.cols = state.shape
+        self.state = np.where(state < self.rule.states, state, 0).astype(np.uint8, copy=False)
+        self.age = age.astype(np.uint8, copy=False)
+        self.immortal = immortal
+        self._start_keys()
+
+    def _load_pattern(self, pattern):
+        self.rows = len(pattern)
+        self.cols = len(pattern[0])
+        shape = (self.rows, self.cols)
+        self.state = np.zeros(shape, dtype=np.uint8)
+        self.age = np.zeros(shape, dtype=np.uint8)
+        self.immortal = np.zeros(shape, dtype=bool)
+        for row in range(self.rows):
+            for col in range(self.cols):
+                cell = pattern[row][col]
+                if isinstance(cell, (int, bool)):
+                    self.state[row, col] = min(int(cell), self.rule.states - 1)
+                else:
+                    self.state[row, col] = 1 if cell.is_alive else 0
+                    self.age[row, col] = min(cell.age, 255)
+                    self.immortal[row, col] = isinstance(cell, ImmortalCell)
+
+    def _load_points(self, pattern):
+        """Place a Pattern in the middle of the board, RLE states kept"""
+        self.rows, self.cols, top, left = placement(pattern, self.rows, self.cols)
+        shape = (self.rows, self.cols)
+        rows, cols, states = pattern.coords()
+        self.state = np.zeros(shape, dtype=np.uint8)
+        self.state[np.frombuffer(rows, dtype=np.int32) + top, np.frombuffer(cols, dtype=np.int32) + left] = \
+            np.minimum(np.frombuffer(states, dtype=np.uint8), self.rule.states - 1)
+        self.age = np.zeros(shape, dtype=np.uint8)
+        self.immortal = np.zeros(shape, dtype=bool)
+
+    def _create_random_arrays(self):
+        """The board of GameOfLifeEngine._create_random_grid for the seed, drawn in bulk"""
+        ratio = self.immortal_ratio if self.mode != 'original' else 0.0
+        alive, self.immortal = seeding.planes(
+            self._board_seed(), self.rows, self.cols, self.density, ratio, workers=self.workers,
+        )
+        self.state = alive.astype(np.uint8)
+        self.age = np.zeros((self.rows, self.cols), dtype=np.uint8)
+    ## ---------------------
+
+    def update_generation(self):
+        """Calculate the next generation"""
+        state = self.state
+        alive = state == 1
+        n = count_neighbors(alive)
+
+        # only live cells count, dying ones neither survive nor give birth
+        birth = (state == 0) & self.table[0][n]
+        stay = alive & (self.table[1][n] | self.immortal)
+
+        # everything else decays, live cells that did not survive included
+        self.state = np.where(birth | stay, np.uint8(1), self._decay[state])
+        # age saturates at 255
+        self.age = np.where(stay, np.minimum(self.age, 254) + 1, 0).astype(np.uint8)
+
+        # a cell adds key * state to the hash, swap that for the changed ones
+        changed = state != self.state
+        keys = self._keys[changed]
+        self.hash ^= int(np.bitwise_xor.reduce(keys * state[changed]) ^ np.bitwise_xor.reduce(keys * self.state[changed]))
+        self.generation += 1
+        self._record()
+
+    def population(self):
+        """Number of live cells, dying ones not included"""
+        return int(np.count_nonzero(self.state == 1))
+
+    def live_points(self):
+        """(row, col, state) of every cell that is not dead, row major"""
+        for row, col in np.argwhere(self.state):
+            yield int(row), int(col), int(self.state[row, col])
+
+    def _hash_board(self):
+        """XOR of key * state over the cells, dying states count as well"""
+        return int(np.bitwise_xor.reduce((self._keys * self.state).ravel()))
+
+    ## ---------------------
+    def render(self, display, state, age, immortal):
+        """
+        (color, char) frame of the arrays, colors from the display palettes
+
+        :param display: GameOfLifeDisplay - Gives colors, age_palette, decay_palette
+        """
+        colors = display.colors
+        decay = display.decay_palette
+        steps = np.array([first for first, _ in display.age_palette])
+
+        # one color table: dead, immortal, the age grades, the decay grades
+        table = np.array(
+            [colors['grey'], colors['yellow']]
+            + [color for _, color in display.age_palette]
+            + decay,
+            dtype=object,
+        )
+        index = np.zeros(state.shape, dtype=np.intp)
+        alive = state == 1
+        index[alive] = 2 + np.searchsorted(steps, age[alive], side='right') - 1
+        index[alive & immortal] = 1
+        dying = state > 1
+        if dying.any():
+            # spread the dying states over the decay grades
+            grade = (state[dying].astype(np.intp) - 2) * len(decay) // max(1, self.rule.states - 2)
+            index[dying] = 2 + len(display.age_palette) + grade
+
+        chars = np.array(['.', '@', '+'], dtype=object)[np.minimum(state, 2)]
+        chars[alive & immortal] = 'R'
+        return np.stack([table[index], chars], axis=-1).tolist()
+
+    def get_grid_state(self):
+        """Return current grid state, grid is a copy of the state array"""
+        state, age, immortal = self.state.copy(), self.age.copy(), self.immortal
+        return {
+            'generation': self.generation,
+            'grid': state,
+            'render': lambda display: self.render(display, state, age, immortal),
+            'rows': self.rows,
+            'cols': self.cols,
+            'paused': self.paused,
+            'speed': self.tsleep,
+            'tiles': None,
+            'cycle': self.cycle,
+            'seed': self.seed
+        }
+    ## ---------------------
@@ -0,0 +1,353 @@
+from cell import StandardCell
+from engine import GameOfLifeEngine
+from patterns import Pattern
+
+
+class Node:
+    """
+    Quadtree node, a level k node covers 2**k x 2**k cells.
+    a, b, c, d are the nw, ne, sw, se children, n the population.
+    Nodes are canonical, two equal subtrees are the same object.
+    h hashes the contents, so equal subtrees still match across a collect.
+    """
+    __slots__ = ('k', 'a', 'b', 'c', 'd', 'n', 'h')
+
+    def __init__(self, k, a, b, c, d, n):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+        self.h = hash((a.h, b.h, c.h, d.h)) if k else n
+
+
+class _Full(Exception):
+    """The node and memo tables went over max_nodes in the middle of a jump"""
+
+
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+
+class HashLifeEngine(GameOfLifeEngine):
+    """
+    Life-like rules on an unbounded plane with HashLife: canonical quadtree
+    nodes and memoized successors, so step(2**k) costs about as much as the
+    distinct structure in the pattern rather than the generations jumped.
+
+    The grid seen through initialize_grid / get_grid_state is the window
+    [0, rows) x [0, cols) of that plane, cells leaving it keep going.
+    """
+    def __init__(self, mode='original', rows=None, cols=None, max_nodes=1 << 20, rule=None):
+        """
+        :param rows: Int - Window rows (None for auto-detect)
+        :param cols: Int - Window columns (None for auto-detect)
+        :param max_nodes: Int - Canonical nodes plus memoized successors kept, checked on
+                          every successor: a jump that goes over collects and starts
+                          again, in two halves if it can't fit in an empty cache
+        :param rule: Str or Rule - Life-like rule, B0 rules are refused
+        """
+        if mode != 'original':
+            raise ValueError("HashLife only runs the original rules, ImmortalCell has no quadtree form")
+        super().__init__(mode=mode, rows=rows, cols=cols, rule=rule)
+        if 0 in self.rule.birth:
+            raise ValueError(f"{self.rule} turns empty space on, HashLife needs it to stay empty")
+
+        self.max_nodes = max_nodes
+        self._limit = max_nodes
+        self.collections = 0
+        self._nodes = {}   # (a, b, c, d) -> Node
+        self._memo = {}    # (Node, j) -> successor 2**j generations ahead
+        self._zeros = [OFF]
+        self.root = self._zero(3)
+
+    ## ---------------------
+    def _join(self, a, b, c, d):
+        """Canonical node with children a, b, c, d"""
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._nodes[key] = node
+        return node
+
+    def _zero(self, k):
+        """Canonical empty node of level k"""
+        while len(self._zeros) <= k:
+            z = self._zeros[-1]
+            self._zeros.append(self._join(z, z, z, z))
+        return self._zeros[k]
+
+    def _centre(self, m):
+        """Node one level up with m in its middle"""
+        z = self._zero(m.k - 1)
+        return self._join(
+            self._join(z, z, z, m.a), self._join(z, z, m.b, z),
+            self._join(z, m.c, z, z), self._join(m.d, z, z, z),
+        )
+
+    def _life(self, a, b, c, d, e, f, g, h, i):
+        """Next state of e from its 8 neighbors, level 0 nodes"""
+        outer = a.n + b.n + c.n + d.n + f.n + g.n + h.n + i.n
+        # Birth / Survival from the rule table
+        return ON if self.rule.table[e.n * 9 + outer] else OFF
+
+    def _life_4x4(self, m):
+        """Centre 2x2 of a level 2 node one generation ahead"""
+        a, b, c, d = m.a, m.b, m.c, m.d
+        nw = self._life(a.a, a.b, b.a, a.c, a.d, b.c, c.a, c.b, d.a)
+        ne = self._life(a.b, b.a, b.b, a.d, b.c, b.d, c.b, d.a, d.b)
+        sw = self._life(a.c, a.d, b.c, c.a, c.b, d.a, c.c, c.d, d.c)
+        se = self._life(a.d, b.c, b.d, c.b, d.a, d.b, c.d, d.c, d.d)
+        return self._join(nw, ne, sw, se)
+
+    def _successor(self, m, j):
+        """Centre half of m, 2**j generations ahead (j <= m.k - 2)"""
+        if m.n == 0:
+            return m.a
+        if len(self._nodes) + len(self._memo) > self._limit:
+            raise _Full
+        key = (m, j)
+        s = self._memo.get(key)
+        if s is not None:
+            return s
+
+        if m.k == 2:
+            s = self._life_4x4(m)
+        else:
+            join = self._join
+            a, b, c, d = m.a, m.b, m.c, m.d
+            # nine overlapping level k-1 squares, each stepped to its centre
+            half = j if j < m.k - 2 else j - 1
+            c1 = self._successor(join(a.a, a.b, a.c, a.d), half)
+            c2 = self._successor(join(a.b, b.a, a.d, b.c), half)
+            c3 = self._successor(join(b.a, b.b, b.c, b.d), half)
+            c4 = self._successor(join(a.c, a.d, c.a, c.b), half)
+            c5 = self._successor(join(a.d, b.c, c.b, d.a), half)
+            c6 = self._successor(join(b.c, b.d, d.a, d.b), half)
+            c7 = self._successor(join(c.a, c.b, c.c, c.d), half)
+            c8 = self._successor(join(c.b, d.a, c.d, d.c), half)
+            c9 = self._successor(join(d.a, d.b, d.c, d.d), half)
+
+            if j < m.k - 2:
+                # already 2**j ahead, just take the centres
+                s = join(
+                    join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                    join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a),
+                )
+            else:
+                # two half steps of 2**(j-1) each
+                s = join(
+                    self._successor(join(c1, c2, c4, c5), half),
+                    self._successor(join(c2, c3, c5, c6), half),
+                    self._successor(join(c4, c5, c7, c8), half),
+                    self._successor(join(c5, c6, c8, c9), half),
+                )
+        self._memo[key] = s
+        return s
+    ## ---------------------
+
+    ## ---------------------
+    def collect(self):
+        """Drop the memo and every node not reachable from the root"""
+        self._memo = {}
+        self._nodes = {}
+        self._zeros = [OFF]
+        stack, seen = [self.root], set()
+        while stack:
+            node = stack.pop()
+            if node.k == 0 or id(node) in seen:
+                continue
+            seen.add(id(node))
+            self._nodes[(node.a, node.b, node.c, node.d)] = node
+            stack.extend((node.a, node.b, node.c, node.d))
+        self.collections += 1
+
+    def _maybe_collect(self):
+        if len(self._nodes) + len(self._memo) > self.max_nodes:
+            self.collect()
+    ## ---------------------
+
+    ## ---------------------
+    def step(self, generations=1):
+        """
+        Advance the plane, any count works, powers of two jump in one go
+
+        :param generations: Int - Number of generations to advance
+        """
+        if generations <= 0:
+            return
+        node = self._crop(self.root)
+        # room for the pattern to grow at light speed during the jump
+        for _ in range(2 + generations.bit_length()):
+            node = self._centre(node)
+        pending = [j for j in reversed(range(generations.bit_length())) if (generations >> j) & 1]
+        fresh = False # the last attempt started from an empty cache
+        while pending:
+            j = pending.pop(0)
+            self.root = node # kept by a collection
+            try:
+                node = self._centre(self._successor(node, j))
+            except _Full:
+                if not fresh:
+                    pending.insert(0, j)
+                elif j:
+                    pending[:0] = [j - 1, j - 1]
+                else:
+                    # one generation of a root bigger than max_nodes, let it through
+                    self._limit = float('inf')
+                    pending.insert(0, j)
+                self.collect()
+                fresh = True
+                continue
+            self._limit = self.max_nodes
+            fresh = False
+            self.root = node
+            self._maybe_collect()
+        self.generation += generations
+        self.hash = self._hash_board()
+        self._record()
+
+    def update_generation(self):
+        """Calculate the next generation"""
+        self.step(1)
+
+    def _crop(self, node):
+        """Shrink the root while its border ring is empty"""
+        while node.k > 3:
+            a, b, c, d = node.a, node.b, node.c, node.d
+            if a.d.n + b.c.n + c.b.n + d.a.n != node.n:
+                break
+            node = self._join(a.d, b.c, c.b, d.a)
+        return node
+
+    def population(self):
+        return self.root.n
+
+    def _hash_board(self):
+        """
+        Contents hash of the cropped root, the root stays centred on the
+        origin so equal hashes mean the same cells in the same place
+        """
+        if self.root.n == 0:
+            return 0
+        node = self._crop(self.root)
+        return hash((node.k, node.h))
+    ## ---------------------
+
+    ## ---------------------
+    def initialize_grid(self, pattern=None):
+        """
+        Initialize the plane from a pattern or random values in the window
+
+        :param pattern: Cell[][], Int[][] or patterns.Pattern - Optional predefined
+                        pattern, a Pattern is centred on the window
+        """
+        live = []
+        if isinstance(pattern, Pattern):
+            top = (self.rows - pattern.rows) // 2
+            left = (self.cols - pattern.cols) // 2
+            live = [(left + col, top + row) for row, col, _ in pattern.cells()]
+        else:
+            if pattern:
+                self.rows = len(pattern)
+                self.cols = len(pattern[0])
+            else:
+                pattern = self._create_random_grid()
+            for row, grid_row in enumerate(pattern):
+                for col, cell in enumerate(grid_row):
+                    if isinstance(cell, (int, bool)):
+                        alive = bool(cell)
+                    elif not isinstance(cell, StandardCell):
+                        raise ValueError(f"HashLife can't run {type(cell).__name__}")
+                    else:
+                        alive = cell.is_alive
+                    if alive:
+                        live.append((col, row))
+
+        # big enough for the window and for every live cell, a pattern can be wider
+        extent = max((max(abs(x), abs(y)) + 1 for x, y in live), default=0)
+        k = 3
+        while (1 << (k - 1)) < max(self.rows, self.cols, extent):
+            k += 1
+        # a level k root spans [-2**(k-1), 2**(k-1)) on both axes
+        half = 1 << (k - 1)
+        self.root = self._build(live, k, -half, -half)
+        self.current_generation = []
+        self.generation = 0
+        self._start_history()
+
+    def _build(self, live, k, x, y):
+        """Node of level k with top left corner x, y from (x, y) live cells"""
+        if not live:
+            return self._zero(k)
+        if k == 0:
+            return ON
+        h = 1 << (k - 1)
+        quads = ([], [], [], [])
+        for px, py in live:
+            quads[(py >= y + h) * 2 + (px >= x + h)].append((px, py))
+        return self._join(
+            self._build(quads[0], k - 1, x, y), self._build(quads[1], k - 1, x + h, y),
+            self._build(quads[2], k - 1, x, y + h), self._build(quads[3], k - 1, x + h, y + h),
+        )
+
+    def live_cells(self, top=0, left=0, rows=None, cols=None):
+        """Return (col, row) of live cells in a window of the plane"""
+        rows = self.rows if rows is None else rows
+        cols = self.cols if cols is None else cols
+        half = 1 << (self.root.k - 1)
+        out = []
+        stack = [(self.root, -half, -half)]
+        while stack:
+            node, x, y = stack.pop()
+            size = 1 << node.k
+            if (node.n == 0 or x >= left + cols or y >= top + rows
+                    or x + size <= left or y + size <= top):
+                continue
+            if node.k == 0:
+                out.append((x, y))
+                continue
+            h = size >> 1
+            stack.extend((
+                (node.a, x, y), (node.b, x + h, y),
+                (node.c, x, y + h), (node.d, x + h, y + h),
+            ))
+        return out
+
+    def live_points(self):
+        """(row, col, 1) of every live cell on the plane, row major"""
+        half = 1 << (self.root.k - 1)
+        span = 2 * half
+        for col, row in sorted(self.live_cells(-half, -half, span, span), key=lambda p: (p[1], p[0])):
+            yield row, col, 1
+
+    def to_grid(self):
+        """Export the window as an Int[][] pattern, as main2.py uses"""
+        grid = [[0] * self.cols for _ in range(self.rows)]
+        for col, row in self.live_cells():
+            grid[row][col] = 1
+        return grid
+
+    def to_cells(self):
+        """Export the window as a Cell[][] pattern, as initialize_grid uses"""
+        return [
+            [StandardCell(is_alive=bool(v), alive_char='@', death_char='.') for v in row]
+            for row in self.to_grid()
+        ]
+    ## ---------------------
+
+    def get_grid_state(self):
+        """Return current grid state"""
+        return {
+            'generation': self.generation,
+            'grid': self.to_cells(),
+            'rows': self.rows,
+            'cols': self.cols,
+            'paused': self.paused,
+            'speed': self.tsleep,
+            'tiles': None,
+            'cycle': self.cycle,
+            'seed': self.seed
+        }
@@ -2,9 +2,12 @@
 
 import time
 import random
+import threading
 
 from utils import KeyboardHandler, get_value, get_seed, clear_console
-from engine import GameOfLifeEngine, GameOfLifeDisplay
+from engine import GameOfLifeDisplay, GameOfLifeDiffDisplay
+from batch import make_engine
+import patterns
 
 
 #seed = get_seed()
@@ -13,31 +16,163 @@ random.seed(seed)
 
 
 class GameOfLifeController:
-    def __init__(self, mode='original', rows=None, cols=None):
+    def __init__(self, mode='original', rows=None, cols=None, backend='object', tile_size=None, workers=None,
+                 compact=False, full_redraw=False, rule=None, checkpoint_path=None, checkpoint_every=0,
+                 recorder=None, profiler=None, replay=None, cache_size=128):
         """
         Initialize the complete Game of Life system
         
         :param rows: Int - Grid rows
         :param cols: Int - Grid columns
+        :param backend: Str - Engine backend, 'object', 'numpy' or 'parallel', or an
+                        engine of batch.engines ('hashlife', 'sparse', 'generations', 'smoothlife',
+                        'block', 'block-numpy')
+        :param tile_size: Int - Dirty tile size for the object backend (None for off)
+        :param workers: Int - Processes for the parallel backend (None for all cores)
+        :param compact: Bool - Keep the object backend's cells in a CellStore
+        :param full_redraw: Bool - Redraw every cell each frame instead of only changes
+        :param rule: Str or Rule - Life-like rule such as 'B36/S23' (None for B3/S23)
+        :param checkpoint_path: Str - Checkpoint file (None for gol.ckpt)
+        :param checkpoint_every: Int - Write a checkpoint every this many generations (0 for never)
+        :param recorder: recorder.Recorder - Attached once the game is set up, closed when it ends
+        :param profiler: profiler.Profiler - Times the engine and display once the game is set up,
+                         closed (saving its samples) when it ends
+        :param replay: Str - Recording file to play back instead of simulating, the engine
+                       arguments are read from it, see replay.ReplayEngine
+        :param cache_size: Int - Decoded frames a replay keeps in memory
         """
-        self.engine = GameOfLifeEngine(
-            mode=mode,
-            rows=rows, 
-            cols=cols
-        )
-        self.display = GameOfLifeDisplay()
+        self.replay = replay
+        if replay:
+            from replay import ReplayEngine # needs numpy
+            self.engine = ReplayEngine(replay, cache_size)
+        else:
+            self.engine = make_engine(
+                mode=mode,
+                rows=rows, 
+                cols=cols,
+                backend=backend,
+                tile_size=tile_size,
+                workers=workers,
+                compact=compact,
+                rule=rule
+            )
+        self.display = GameOfLifeDisplay() if full_redraw else GameOfLifeDiffDisplay()
         self.keyboard_handler = KeyboardHandler(use_thread=False) 
         self.i = 0
+        
+        # decoupled loop, see start_decoupled
+        self._quit = threading.Event()
+        self._wake = threading.Event()       # cuts the simulation's sleep / pause short
+        self._redraw = threading.Event()     # asks the renderer for a frame now
+        self._want_frame = threading.Event() # asks the simulation for a snapshot
+        self._export = threading.Event()     # asks the simulation to save a pattern file
+        self._snapshot = None
+        self.frames_drawn = 0
+        self.frames_dropped = 0
+        self._paused_for = None # cycle the game was last paused for
+        self.checkpoint_path = checkpoint_path or 'gol.ckpt'
+        self.checkpoint_every = checkpoint_every
+        self.recorder = recorder
+        self.profiler = profiler
     
-    def setup_game(self, fullscreen=False):
-        """Setup the game with specified parameters"""
+    def setup_game(self, fullscreen=False, pattern=None, resume=None):
+        """
+        Setup the game with specified parameters
+        
+        :param pattern: patterns.Pattern - Start from it instead of a random board
+        :param resume: Str - Checkpoint file to carry on from, the engine must run its rule
+        """
+        if self.replay:
+            return # the recording is the board
         if fullscreen:
             self.engine.resize_to_fullscreen()    
-        self.engine.initialize_grid()
+        if resume:
+            import checkpoint # needs numpy
+            checkpoint.restore(self.engine, resume)
+        else:
+            if pattern is None:
+                self.engine.seed = seed
+            self.engine.initialize_grid(pattern)
+        if self.recorder:
+            self.recorder.attach(self.engine)
+        if self.profiler:
+            self.profiler.attach(self.engine, self.display)
+    
+    def close(self):
+        """Finish the recording and the profile, release the engine"""
+        if self.recorder:
+            self.recorder.close()
+        if self.profiler:
+            self.profiler.close()
+        self.engine.close()
+    
+    def export(self, path=None):
+        """
+        Save the current generation as a pattern file
+        
+        :param path: Str - .rle, .cells or .lif file (None for gol-<generation>.rle)
+        :return: Str - The file written
+        """
+        path = path or f"gol-{self.engine.generation}.rle"
+        patterns.save(self.engine, path)
+        return path
+    
+    def save_checkpoint(self, path=None):
+        """
+        Save the engine so the run can be resumed, see setup_game
+        
+        :param path: Str - Checkpoint file (None for checkpoint_path)
+        :return: Str - The file written
+        """
+        import checkpoint # needs numpy
+        path = path or self.checkpoint_path
+        checkpoint.save(self.engine, path)
+        return path
+    
+    def _auto_checkpoint(self):
+        """Checkpoint every checkpoint_every generations, called after each one"""
+        if self.checkpoint_every and self.engine.generation % self.checkpoint_every == 0:
+            self.save_checkpoint()
     
     def is_active(self):
-        """Check if the simulation is still active"""
-        return True  # For now, always return True, can add stopping conditions
+        """Check if the simulation is still active, not died out or repeating"""
+        return self.engine.is_active()
+    
+    def _pause_on_cycle(self):
+        """
+        Pause the first time the board dies out or starts repeating, the
+        status line tells which, space carries on. True if it just paused.
+        """
+        cycle = self.engine.cycle
+        if cycle is None or cycle is self._paused_for:
+            return False
+        self._paused_for = cycle
+        if not self.engine.paused:
+            self.engine.toggle_pause()
+        return True
+    
+    def _replay_key(self, key):
+        """
+        Replay keys: + and - step one record while paused and change the
+        rate while playing (forwards faster, or backwards through -1), 0-9
+        seek to that tenth of the run. False for any other key.
+        """
+        engine = self.engine
+        if key == '+':
+            if engine.paused:
+                engine.step(1)
+            else:
+                engine.faster()
+        elif key == '-':
+            if engine.paused:
+                engine.step(-1)
+            else:
+                engine.slower()
+        elif key.isdigit():
+            engine.seek(int(key) * (len(engine.recording) - 1) // 9)
+        else:
+            return False
+        return True
     
     ## ---------------------------------------
     def _key_handler(self):
@@ -46,12 +181,16 @@ class GameOfLifeController:
             if key.lower() == 'q':
                 return 0
             else:
-                if key == ' ':
+                if self.replay and self._replay_key(key):
+                    pass
+                elif key == ' ':
                     self.engine.toggle_pause()
                 elif key == '+': # + speed (decrease delay)
                     self.engine.adjust_speed(-0.05)
                 elif key == '-': # - speed (increase delay)
                     self.engine.adjust_speed(0.05)
+                elif key == 's' and not self.replay: # save the generation on screen
+                    self.export()
                 
                 grid_state = self.engine.get_grid_state()
                 self.display.print_grid(grid_state)
@@ -82,19 +221,137 @@ class GameOfLifeController:
                     self.display.print_grid(grid_state)
                     
                     self.engine.update_generation()
+                    self._auto_checkpoint()
+                    if self._pause_on_cycle():
+                        self.display.print_grid(self.engine.get_grid_state())
                 
                     time.sleep(self.engine.tsleep)
                     if not self._key_handler(): break
                 
                 ## --------
                 if self.i == gens: break
-                self.i =+ 1
+                self.i += 1
                 ## --------
                 
         except KeyboardInterrupt:
             print("\nGame interrupted by user")
         finally:
             self.keyboard_handler.terminate()
+            self.close()
+            self.display.show_cursor()
+    
+    
+    ## ---------------------------------------
+    def _on_key(self, key):
+        """Keyboard thread callback, applied right away"""
+        if key.lower() == 'q':
+            self._quit.set()
+        elif self.replay and self._replay_key(key):
+            pass
+        elif key == ' ':
+            self.engine.toggle_pause()
+        elif key == '+': # + speed (decrease delay)
+            self.engine.adjust_speed(-0.05)
+        elif key == '-': # - speed (increase delay)
+            self.engine.adjust_speed(0.05)
+        elif key == 's' and not self.replay: # saved by the simulation thread, between generations
+            self._export.set()
+        else:
+            return
+        self._wake.set()
+        self._redraw.set()
+    
+    def _simulate(self, gens):
+        """Simulation thread, steps as fast as tsleep allows"""
+        while not self._quit.is_set():
+            if self._export.is_set():
+                self._export.clear()
+                self.export()
+            if self.engine.paused:
+                # still publish, so the renderer can show the pause
+                if self._want_frame.is_set():
+                    self._publish()
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            
+            self.engine.update_generation()
+            self._auto_checkpoint()
+            if self._pause_on_cycle():
+                self._redraw.set()
+            if self._want_frame.is_set():
+                self._publish()
+            
+            if gens and self.engine.generation >= gens:
+                self._publish()
+                self._quit.set()
+                self._redraw.set()
+            elif self.engine.tsleep:
+                if self._wake.wait(self.engine.tsleep):
+                    self._wake.clear()
+    
+    def _publish(self):
+        self._want_frame.clear()
+        self._snapshot = self.engine.snapshot()
+    ## ---------------------------------------
+    
+    
+    def start_decoupled(self, delay=0.2, gens=1000, fps=30):
+        """
+        Start the animation with the simulation on its own thread.
+        The renderer draws the newest snapshot at most fps times a second,
+        generations produced in between are never drawn.
+        
+        :param delay: Float - Delay between generations
+        :param gens: Int - Stop after this many generations (0 to run forever)
+        :param fps: Int - Target frames per second
+        """
+        self.engine.tsleep = delay
+        interval = 1 / fps
+        
+        self.keyboard_handler = KeyboardHandler(use_thread=True, on_key=self._on_key)
+        self.keyboard_handler.start()
+        
+        self.display.hide_cursor()
+        self.display.clear_screen()
+        
+        self._quit.clear()
+        self._snapshot = self.engine.snapshot()
+        simulation = threading.Thread(target=self._simulate, args=(gens,), daemon=True)
+        simulation.start()
+        
+        drawn = None
+        try:
+            while True:
+                done = self._quit.is_set()
+                snapshot = self._snapshot
+                # pause / speed are read live, a key press shows without a new generation
+                frame = dict(snapshot, paused=self.engine.paused, speed=self.engine.tsleep)
+                # info carries a replay's position and rate
+                shown = (frame['generation'], frame['paused'], frame['speed'], frame.get('info'))
+                if drawn is None or shown != drawn:
+                    self.display.print_grid(frame)
+                    if drawn:
+                        self.frames_dropped += max(0, frame['generation'] - drawn[0] - 1)
+                    drawn = shown
+                    self.frames_drawn += 1
+                if done:
+                    break
+                
+                # the next snapshot is taken after the next generation,
+                # key presses cut the wait short
+                self._want_frame.set()
+                if self._redraw.wait(interval):
+                    self._redraw.clear()
+                
+        except KeyboardInterrupt:
+            print("\nGame interrupted by user")
+        finally:
+            self._quit.set()
+            self._wake.set()
+            simulation.join()
+            self.keyboard_handler.terminate()
+            self.close()
             self.display.show_cursor()
 
 
@@ -125,10 +382,11 @@ def main():
     print("  space - Pause/Resume")
     print("  +     - Increase speed")
     print("  -     - Decrease speed")
+    print("  s     - Save the generation to gol-<gen>.rle")
     print("  q     - Quit")
     input("enter ...")
     
-    controller.start(delay=tsleep, gens=generations)
+    controller.start_decoupled(delay=tsleep, gens=generations)
 
 
 if __name__ == "__main__":
@@ -7,20 +7,36 @@ import sys
 import termios
 import tty
 import select
+import re
 
 from utils import KeyboardHandler
+from tiles import TileTracker
+from rules import CONWAY, get_rule
+from cycles import CycleDetector, zobrist_keys
+from patterns import Pattern, placement
+import seeding
 
 cols_dflt = 32
 rows_dflt = 10
 
+# bit packed board helpers: 0 / 1 bytes -> '0' / '1', runs of non zero
+# bytes, set bit positions of every byte value
+_digits = bytes.maketrans(b'\0\1', b'01')
+_nonzero = re.compile(rb'[^\0]+')
+_byte_bits = [tuple(b for b in range(8) if v >> b & 1) for v in range(256)]
+
 class GameOfLifeEngine:
-    def __init__(self,rows=None, cols=None):
+    def __init__(self,rows=None, cols=None, tile_size=None, rule=None, history=1024):
         """
         Initialize the Game of Life engine
         
         :param rows: Int - Number of rows (None for auto-detect)
         :param cols: Int - Number of columns (None for auto-detect)
+        :param tile_size: Int - Only recompute tiles near last changes (None for off)
+        :param rule: Str or Rule - Life-like rule such as 'B36/S23' (None for B3/S23)
+        :param history: Int - Generations of board hashes kept to spot cycles
         """
+        self.rule = get_rule(rule)
         self.rows = rows or self._detect_terminal_rows()
         self.cols = cols or self._detect_terminal_cols()
         if self.cols < cols_dflt:
@@ -35,6 +51,18 @@ class GameOfLifeEngine:
         self.generation = 0
         self.previous_grid = None
         
+        # board hash, XOR of the keys of the live cells, see cycles.py
+        self.hash = 0
+        self.previous_hash = 0
+        self._keys = None
+        self.cycles = CycleDetector(history)
+        self.cycle = None
+        self.seed = None # seed of the random board, see seeding; drawn at the first random fill if None
+        self.density = 1 / 8 # chance of a live cell on a random board
+        
+        self.tile_size = tile_size
+        self.tiles = None
+        
         self.paused = False
         self.tsleep = 0
         
@@ -73,9 +101,14 @@ class GameOfLifeEngine:
         """
         Initialize the grid with a pattern or random values
         
-        :param pattern: Int[][] - Optional predefined pattern
+        :param pattern: Int[][] or patterns.Pattern - Optional predefined pattern
         """
-        if pattern:
+        if isinstance(pattern, Pattern):
+            self.rows, self.cols, top, left = placement(pattern, self.rows, self.cols)
+            self.current_generation = [[0] * self.cols for _ in range(self.rows)]
+            for row, col, _ in pattern.cells():
+                self.current_generation[top + row][left + col] = 1
+        elif pattern:
             self.current_generation = [row[:] for row in pattern]
             self.rows = len(pattern)
             self.cols = len(pattern[0]) if pattern else self.cols
@@ -87,17 +120,24 @@ class GameOfLifeEngine:
         self.death_cells = [[False for _ in range(self.cols)] for _ in range(self.rows)]
         self.generation = 0
         self.previous_grid = None
+        if self.tile_size:
+            self.tiles = TileTracker(self.rows, self.cols, self.tile_size)
+        self._start_history()
+    
     
+    def _board_seed(self):
+        """Seed of a random board, drawn from the global RNG if not set so random.seed() still fixes it"""
+        if self.seed is None:
+            self.seed = random.getrandbits(32)
+        return self.seed
+    
+    def _random_rows(self):
+        """seeding.rows of the whole board as bytes of 0 / 1, no immortal cells here"""
+        return (alive for alive, _ in seeding.rows(self._board_seed(), self.cols, self.density, 0.0, 0, self.rows))
     
     def _create_random_grid(self):
-        """Create a random grid"""
-        grid = []
-        for row in range(self.rows):
-            grid_row = []
-            for col in range(self.cols):
-                grid_row.append(1 if random.randint(0, 7) == 0 else 0)
-            grid.append(grid_row)
-        return grid
+        """Create a random grid, the same board as engine.py's engines for the seed"""
+        return [list(alive) for alive in self._random_rows()]
     
     def _get_live_neighbors(self, row, col):
         """Count live neighbors with wrapping edges"""
@@ -109,65 +149,101 @@ class GameOfLifeEngine:
         return life_sum
     
     
-    def update_generation(self):
-        """Calculate the next generation"""
+    def _update_cell(self, row, col):
+        """Write the next state of one cell, return True if it changed"""
+        live_neighbors = self._get_live_neighbors(row, col)
         
+        ## --------------------------------------------------------------------
         
-        self.birth_cells = [[False for _ in range(self.cols)] for _ in range(self.rows)]
-        self.death_cells = [[False for _ in range(self.cols)] for _ in range(self.rows)]
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                live_neighbors = self._get_live_neighbors(row, col)
-                
-                ## --------------------------------------------------------------------
-                
-                # Underpopulation - If a live cell has is surrounded 
-                #                   by less than two surrounding neighbours
-                #                   it dies and does not make it to the next generation.
-                # Equilibrium -     If a live cell is surrounded 
-                #                   by two or three living neighbors    
-                #                   the cell stays alive and makes it to the next generation.
-                # Overpopulation -  If a live cell is surrounded 
-                #                   by more than three living neighbors 
-                #                   the cell dies and does not make it to the next generation.
-                # Reproduction -    If a dead cell is surrounded 
-                #                   by three living neighbors 
-                #                   the cell stays alive and makes it to the next generation.
+        # Underpopulation - If a live cell has is surrounded 
+        #                   by less than two surrounding neighbours
+        #                   it dies and does not make it to the next generation.
+        # Equilibrium -     If a live cell is surrounded 
+        #                   by two or three living neighbors    
+        #                   the cell stays alive and makes it to the next generation.
+        # Overpopulation -  If a live cell is surrounded 
+        #                   by more than three living neighbors 
+        #                   the cell dies and does not make it to the next generation.
+        # Reproduction -    If a dead cell is surrounded 
+        #                   by three living neighbors 
+        #                   the cell stays alive and makes it to the next generation.
 
-                if self.current_generation[row][col]:
-                    # Underpopulation
-                    if live_neighbors < 2: 
-                        self.next_generation[row][col] = 0
-                        self.death_cells[row][col] = True
-                    # Equilibrium
-                    elif live_neighbors in [2,3]: 
-                        self.next_generation[row][col] = self.current_generation[row][col]
-                    # Overpopulation
-                    elif live_neighbors > 3:
-                        self.next_generation[row][col] = 0
-                        self.death_cells[row][col] = True
-                else:
-                    # Reproduction
-                    if live_neighbors == 3:
-                        self.next_generation[row][col] = 1
-                        self.birth_cells[row][col] = True  
-                    else:
-                        self.next_generation[row][col] = self.current_generation[row][col]
-                        
-                ## --------------------------------------------------------------------
+        # the rule table holds all four cases, generalized to any B/S rule
+        alive = 1 if self.current_generation[row][col] else 0
+        next_state = self.rule.table[alive * 9 + live_neighbors]
+        self.next_generation[row][col] = next_state
+        self.birth_cells[row][col] = bool(next_state and not alive)
+        self.death_cells[row][col] = bool(alive and not next_state)
                 
+        ## --------------------------------------------------------------------
+        
+        if alive != next_state:
+            self.hash ^= self._keys[row * self.cols + col]
+            return True
+        return False
+    
+    def update_generation(self):
+        """Calculate the next generation"""
+        self.previous_hash = self.hash
+        if self.tiles:
+            self._update_tiles()
+        else:
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    self._update_cell(row, col)
+        
         # Swap grids
         self.current_generation, self.next_generation = self.next_generation, self.current_generation
         self.generation += 1
+        self._record()
+    
+    def _update_tiles(self):
+        """
+        update_generation restricted to the tiles the TileTracker keeps active.
+        A skipped tile did not change last generation, so both buffers already
+        hold its state and its birth/death flags are already cleared.
+        """
+        for tile in self.tiles.begin():
+            rows, cols = self.tiles.ranges(tile)
+            for row in rows:
+                for col in cols:
+                    if self._update_cell(row, col):
+                        self.tiles.mark(row, col)
+        self.tiles.end()
+    
+    def live_points(self):
+        """(row, col, 1) of every live cell, row major, see patterns.save"""
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self.current_generation[row][col]:
+                    yield row, col, 1
     
     def is_grid_changing(self):
-        """Check if grid is still evolving"""
+        """Check if grid is still evolving, the last generation changed something"""
+        return self.hash != self.previous_hash
+    
+    def _hash_board(self):
+        """Hash of the whole board, XOR of the keys of the live cells"""
+        self._keys = zobrist_keys(self.rows * self.cols)
+        h = 0
         for row in range(self.rows):
             for col in range(self.cols):
-                if self.current_generation[row][col] != self.next_generation[row][col]:
-                    return True
-        return False
+                if self.current_generation[row][col]:
+                    h ^= self._keys[row * self.cols + col]
+        return h
+    
+    def _start_history(self):
+        """Hash a new board and restart cycle detection from it"""
+        self.hash = self.previous_hash = self._hash_board()
+        self.cycles.reset()
+        self._record()
+    
+    def _record(self):
+        self.cycle = self.cycles.record(self.generation, self.hash)
+    
+    def is_active(self):
+        """False once the board died out or repeats, see cycle"""
+        return self.cycle is None
     
     def get_grid_state(self):
         """Return current grid state"""
@@ -179,7 +255,9 @@ class GameOfLifeEngine:
             'rows': self.rows,
             'cols': self.cols,
             'paused': self.paused,
-            'speed': self.tsleep
+            'speed': self.tsleep,
+            'tiles': (self.tiles.active_tiles, self.tiles.skipped_tiles) if self.tiles else None,
+            'cycle': self.cycle
         }
     
     def toggle_pause(self):
@@ -205,6 +283,232 @@ class GameOfLifeEngine:
             print("Unable to clear terminal. Your operating system is not supported.\n\r")
 
 
+class BitGrid:
+    """Read-only grid[row][col] view of a packed board, enough for print_grid"""
+    def __init__(self, bits, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        # little endian bytes, so bit i of the board is bit i%8 of byte i//8
+        self._bytes = bits.to_bytes((rows * cols + 7) // 8, 'little')
+    
+    def __len__(self):
+        return self.rows
+    
+    def __getitem__(self, row):
+        return BitRow(self._bytes, row * self.cols, self.cols)
+
+
+class BitRow:
+    def __init__(self, data, start, cols):
+        self._bytes = data
+        self._start = start
+        self.cols = cols
+    
+    def __len__(self):
+        return self.cols
+    
+    def __getitem__(self, col):
+        i = self._start + col
+        return (self._bytes[i >> 3] >> (i & 7)) & 1
+
+
+class BitPackedEngine(GameOfLifeEngine):
+    """
+    Same torus as GameOfLifeEngine, packed one bit per cell into a single
+    Python int where bit row*cols+col is grid[row][col]. A generation is a
+    few whole-board shifts plus a bitwise adder, with no per-cell loop.
+    """
+    def __init__(self, rows=None, cols=None, rule=None):
+        super().__init__(rows, cols, rule=rule)
+        self.current_bits = 0
+        self.previous_bits = 0
+    
+    def _build_masks(self):
+        total = self.rows * self.cols
+        self._full = (1 << total) - 1
+        self._first_row = (1 << self.cols) - 1
+        # one bit per row, doubled up instead of built from a board sized string
+        first_col, filled = 1, 1
+        while filled < self.rows:
+            first_col |= first_col << (filled * self.cols)
+            filled *= 2
+        self._first_col = first_col & self._full
+        self._last_col = self._first_col << (self.cols - 1)
+        self._not_first = self._full ^ self._first_col
+        self._not_last = self._full ^ self._last_col
+    
+    def initialize_grid(self, pattern=None):
+        """
+        Initialize the grid with a pattern or random values
+        
+        :param pattern: Int[][] or patterns.Pattern - Optional predefined pattern
+        """
+        if isinstance(pattern, Pattern):
+            self.rows, self.cols, top, left = placement(pattern, self.rows, self.cols)
+            # one bit per cell, set in a byte buffer then read as one int
+            data = bytearray((self.rows * self.cols + 7) // 8)
+            for row, col, _ in pattern.cells():
+                i = (top + row) * self.cols + left + col
+                data[i >> 3] |= 1 << (i & 7)
+            self.current_bits = int.from_bytes(data, 'little')
+        elif pattern:
+            self.rows = len(pattern)
+            self.cols = len(pattern[0])
+            # most significant digit first, so last row / last col go first
+            self.current_bits = int(''.join(
+                '1' if pattern[row][col] else '0'
+                for row in reversed(range(self.rows))
+                for col in reversed(range(self.cols))
+            ), 2)
+        else:
+            self.current_bits = self._create_random_bits()
+        self._build_masks()
+        
+        self.previous_bits = self.current_bits
+        self.generation = 0
+        self._start_history()
+    
+    def _create_random_bits(self):
+        """_create_random_grid as one int, cell 0 the lowest bit so the digits go in reverse"""
+        digits = b''.join(self._random_rows()).translate(_digits)
+        return int(digits[::-1], 2) if digits else 0
+    
+    def _shift_rows(self, bits):
+        """
+        Return (north, south): each cell holding the cell above / below it.
+        north may carry junk above the board, update_generation masks it off.
+        """
+        up = self.cols
+        down = self.rows * self.cols - up
+        north = (bits << up) | (bits >> down)
+        south = (bits >> up) | ((bits & self._first_row) << down)
+        return north, south
+    
+    def update_generation(self):
+        """Calculate the next generation"""
+        g = self.current_bits
+        cols = self.cols
+        first = self._first_col
+        
+        # west / east neighbours, wrapping inside each row
+        west = ((g << 1) & self._not_first) | ((g >> (cols - 1)) & first)
+        east = ((g >> 1) & self._not_last) | ((g & first) << (cols - 1))
+        
+        # two bit sums: west+east for the own row, west+self+east for the rows around
+        h1 = west ^ east
+        h2 = west & east
+        t1 = h1 ^ g
+        t2 = h2 | (g & h1)
+        
+        n1, s1 = self._shift_rows(t1)
+        n2, s2 = self._shift_rows(t2)
+        
+        # full adder on the ones, its carry joins the twos
+        ones = n1 ^ s1 ^ h1
+        carry = (n1 & s1) | (h1 & (n1 ^ s1))
+        
+        self.previous_bits = g
+        if self.rule == CONWAY:
+            # exactly one of the four twos set means a count of 2 or 3
+            x = n2 ^ s2 ^ h2 ^ carry
+            over = (n2 & s2) | (h2 & carry)
+            
+            # Equilibrium keeps 2 or 3, Reproduction needs exactly 3.
+            # x & ~over without negative ints, which are slow on huge ints
+            two_or_three = (x ^ (x & over)) & self._full
+            self.current_bits = two_or_three & (ones | g)
+        else:
+            self.current_bits = self._apply_rule(g, ones, n2, s2, h2, carry)
+        # births / deaths are derived from the two boards in get_grid_state
+        self.generation += 1
+        self.previous_hash = self.hash
+        self.hash ^= self._hash_bits(self.current_bits ^ self.previous_bits)
+        self._record()
+    
+    def _apply_rule(self, g, ones, n2, s2, h2, carry):
+        """
+        Any B/S rule from the adder outputs: the count is ones + 2 * (n2 +
+        s2 + h2 + carry), summed into the bits c1 c2 c4 c8 of the neighbor
+        count, then the rule's counts are matched bit by bit.
+        """
+        full = self._full
+        a = n2 ^ s2
+        b = h2 ^ carry
+        pa = n2 & s2
+        pb = h2 & carry
+        c2 = a ^ b
+        pc = a & b
+        c4 = pa ^ pb ^ pc
+        c8 = (pa & pb) | (pc & (pa ^ pb)) # only for all eight
+        bits = (ones & full, c2 & full, c4 & full, c8 & full)
+        # complements by XOR with the board, ~x is a slow negative int
+        inverted = tuple(bit ^ full for bit in bits)
+        
+        def matching(counts):
+            hits = 0
+            for n in counts:
+                m = full
+                for i in range(4):
+                    m &= bits[i] if n >> i & 1 else inverted[i]
+                hits |= m
+            return hits
+        
+        dead = g ^ full
+        return (dead & matching(self.rule.birth)) | (g & matching(self.rule.survival))
+    
+    def is_grid_changing(self):
+        """Check if grid is still evolving"""
+        return self.current_bits != self.previous_bits
+    
+    def population(self):
+        return self.current_bits.bit_count()
+    
+    def live_points(self):
+        """(row, col, 1) of every live cell, row major"""
+        mask = self._first_row
+        for row in range(self.rows):
+            bits = (self.current_bits >> (row * self.cols)) & mask
+            while bits:
+                low = bits & -bits # small ints, a negative is cheap here
+                yield row, low.bit_length() - 1, 1
+                bits ^= low
+    
+    def _hash_board(self):
+        """
+        XOR of the keys of the live cells, the list engine's hash of the
+        same board; update_generation XORs in the keys of the changed cells
+        """
+        self._keys = zobrist_keys(self.rows * self.cols)
+        return self._hash_bits(self.current_bits)
+    
+    def _hash_bits(self, bits):
+        """XOR of the keys of the set bits, the non zero bytes are found by a C scan"""
+        keys = self._keys
+        h = 0
+        data = bits.to_bytes((self.rows * self.cols + 7) // 8, 'little')
+        for run in _nonzero.finditer(data):
+            base = run.start()
+            for i, byte in enumerate(run.group(), base):
+                for b in _byte_bits[byte]:
+                    h ^= keys[8 * i + b]
+        return h
+    
+    def get_grid_state(self):
+        """Return current grid state"""
+        both = self.current_bits & self.previous_bits
+        return {
+            'generation': self.generation,
+            'grid': BitGrid(self.current_bits, self.rows, self.cols),
+            'birth_cells': BitGrid(self.current_bits ^ both, self.rows, self.cols),
+            'death_cells': BitGrid(self.previous_bits ^ both, self.rows, self.cols),
+            'rows': self.rows,
+            'cols': self.cols,
+            'paused': self.paused,
+            'speed': self.tsleep,
+            'cycle': self.cycle
+        }
+
+
 class GameOfLifeDisplay:
     def __init__(self):
         """Initialize display handler"""
@@ -278,6 +582,11 @@ class GameOfLifeDisplay:
         else:
             status += "RUNNING | "
         status += f"Speed: {speed:.2f}s | "
+        if grid_state.get('tiles'):
+            active, skipped = grid_state['tiles']
+            status += f"Tiles: {active}/{active + skipped} | "
+        if grid_state.get('cycle'):
+            status += f"{grid_state['cycle']} | "
         status += "Controls: [SPACE]=Pause | +/-=Speed | q=Quit"
         
         # Truncate/pad status to fit screen width
@@ -316,29 +625,41 @@ class GameOfLifeDisplay:
 
 
 class GameOfLifeController:
-    def __init__(self, rows=None, cols=None):
+    def __init__(self, rows=None, cols=None, packed=False, tile_size=None, rule=None):
         """
         Initialize the complete Game of Life system
         
         :param rows: Int - Grid rows
         :param cols: Int - Grid columns
+        :param packed: Bool - Use the bit packed engine
+        :param tile_size: Int - Dirty tile size for the list engine (None for off)
+        :param rule: Str or Rule - Life-like rule (None for B3/S23)
         """
-        self.engine = GameOfLifeEngine(rows, cols)
+        if packed:
+            self.engine = BitPackedEngine(rows, cols, rule=rule)
+        else:
+            self.engine = GameOfLifeEngine(rows, cols, tile_size=tile_size, rule=rule)
         self.display = GameOfLifeDisplay()
+        self._paused_for = None # cycle the game was last paused for
         
         #from multiprocessing import Process
         #self.keyboard_handler = Process(target=KeyboardHandler()) 
         #self.keyboard_handler = KeyboardHandler() 
     
-    def setup_game(self, fullscreen=False):
-        """Setup the game with specified parameters"""
+    def setup_game(self, fullscreen=False, seed=None):
+        """
+        Setup the game with specified parameters
+        
+        :param seed: Int - Seed of the random board, see seeding (None to draw one)
+        """
         if fullscreen:
             self.engine.resize_to_fullscreen()    
+        self.engine.seed = seed
         self.engine.initialize_grid()
     
     def is_active(self):
-        """Check if the simulation is still active"""
-        return True  # For now, always return True, can add stopping conditions
+        """Check if the simulation is still active, not died out or repeating"""
+        return self.engine.is_active()
     
     def start_animation(self, delay=0.2, fullscreen_check=True):
         """
@@ -381,6 +702,11 @@ class GameOfLifeController:
                     grid_state = self.engine.get_grid_state()
                     self.display.print_grid(grid_state)
                     self.engine.update_generation()
+                    if self.engine.cycle and self.engine.cycle is not self._paused_for:
+                        # died out or repeating, stop there, space carries on
+                        self._paused_for = self.engine.cycle
+                        self.engine.toggle_pause()
+                        self.display.print_grid(self.engine.get_grid_state())
                     time.sleep(self.engine.tsleep)
                 
         except KeyboardInterrupt:
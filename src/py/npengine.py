@@ -0,0 +1,248 @@
+import numpy as np
+
+from cell import StandardCell, ImmortalCell
+from rules import CONWAY
+from cycles import zobrist_keys
+from patterns import Pattern, placement
+import seeding
+
+
+def count_neighbors(alive, halo=False):
+    """
+    Live neighbors of every cell with wrapping edges
+
+    :param alive: Bool[][] - Cell states, or a stack of boards [board][row][col]
+    :param halo: Bool - First and last rows are only neighbors (a stripe with
+                 its halo rows), the result then has two rows less. One board only.
+    """
+    a = alive.astype(np.uint8)
+    # sum the 3 rows first, then the 3 columns of that, then drop the center
+    if halo:
+        vert = a[:-2] + a[1:-1] + a[2:]
+        a = a[1:-1]
+    else:
+        vert = a + np.roll(a, 1, axis=-2) + np.roll(a, -1, axis=-2)
+    return vert + np.roll(vert, 1, axis=-1) + np.roll(vert, -1, axis=-1) - a
+
+
+def rule_table(rule=CONWAY):
+    """Rule.table as a (2, 9) bool array, [alive, live neighbors] -> next state"""
+    return np.frombuffer(rule.table, dtype=np.uint8).reshape(2, 9).astype(bool)
+
+
+def next_state(alive, n, age, born, died, last, immortal, table=None):
+    """
+    One generation of StandardCell / ImmortalCell rules on arrays
+
+    :param n: Int[][] - Live neighbor counts from count_neighbors
+    :param immortal: Bool[][] - Cells following ImmortalCell.update
+    :param table: Bool[2][9] - From rule_table (None for Conway's)
+    :return: (alive, age, born, died, last) of the next generation
+    """
+    if table is None:
+        table = rule_table()
+    # both rows looked up once, no per count comparisons
+    can_birth = table[0][n]
+
+    ## StandardCell.update
+    survive = alive & table[1][n]
+    birth = ~alive & can_birth
+    std_alive = survive | birth
+    std_age = np.where(survive, age + 1, 0)
+
+    ## ImmortalCell.update, never dies, ages every generation, born at age 0
+    imm_alive = alive | can_birth
+    imm_age = np.where(birth, 0, age + 1)
+
+    # ImmortalCell leaves its flags untouched
+    return (
+        np.where(immortal, imm_alive, std_alive),
+        np.where(immortal, imm_age, std_age).astype(np.int32),
+        np.where(immortal, born, birth),
+        np.where(immortal, died, alive & ~survive),
+        np.where(immortal, last, alive),
+    )
+
+
+class NumpyBackend:
+    """
+    Array backend for GameOfLifeEngine.
+
+    Keeps the per-cell state of the object engine (is_alive, age,
+    was_born_this_gen, died_this_gen, was_alive_last_gen and the cell type)
+    as 2D arrays and computes a whole generation at once from rolled
+    neighbor counts.
+    """
+    def __init__(self, engine):
+        """
+        :param engine: GameOfLifeEngine - Owner, gives mode/rows/cols
+        """
+        self.engine = engine
+        self.rows = engine.rows
+        self.cols = engine.cols
+        self.table = rule_table(engine.rule)
+
+        # (cell class, alive char, death char), index is the value in self.kind
+        self.kinds = []
+
+        self.alive = None
+        self.age = None
+        self.born = None
+        self.died = None
+        self.last = None
+        self.kind = None
+        self.immortal = None
+        self.keys = None
+        self.hash = 0 # XOR of keys of the live cells, see cycles.zobrist_keys
+
+    ## ---------------------
+    def _kind_id(self, cls, alive_char, death_char):
+        key = (cls, alive_char, death_char)
+        if key not in self.kinds:
+            self.kinds.append(key)
+        return self.kinds.index(key)
+
+    def initialize(self, pattern=None):
+        """
+        Fill the arrays from a pattern or at random
+
+        :param pattern: Cell[][], Int[][] or patterns.Pattern - Optional predefined pattern
+        """
+        if isinstance(pattern, Pattern):
+            self._load_points(pattern)
+        elif pattern:
+            self._load_pattern(pattern)
+        else:
+            self._create_random_arrays()
+        self.immortal = np.zeros(self.alive.shape, dtype=bool)
+        for i, (cls, _, _) in enumerate(self.kinds):
+            if issubclass(cls, ImmortalCell):
+                self.immortal |= (self.kind == i)
+        self._start_hash()
+
+    def _start_hash(self):
+        self.keys = np.frombuffer(zobrist_keys(self.rows * self.cols), dtype=np.uint64).reshape(self.rows, self.cols)
+        self.hash = int(np.bitwise_xor.reduce(self.keys[self.alive]))
+
+    def load_planes(self, alive, age, born, died, last, immortal):
+        """
+        Take the arrays over from a checkpoint, cell kinds follow immortal
+
+        :param alive: Bool[][] - Becomes the board, the other planes must have its shape
+        :param age: Int[][] - Cast to int32
+        """
+        self.rows, self.cols = alive.shape
+        self.kinds = []
+        self._kind_id(StandardCell, '@', '.')
+        self.kind = np.zeros(alive.shape, dtype=np.uint8)
+        if immortal.any():
+            self._kind_id(ImmortalCell, 'R', '.')
+            self.kind[immortal] = 1
+        self.alive = alive
+        self.age = age.astype(np.int32, copy=False)
+        self.born, self.died, self.last, self.immortal = born, died, last, immortal
+        self._start_hash()
+
+    def _load_pattern(self, pattern):
+        self.rows = len(pattern)
+        self.cols = len(pattern[0])
+        shape = (self.rows, self.cols)
+        self.kinds = []
+        self.alive = np.zeros(shape, dtype=bool)
+        self.age = np.zeros(shape, dtype=np.int32)
+        self.born = np.zeros(shape, dtype=bool)
+        self.died = np.zeros(shape, dtype=bool)
+        self.last = np.zeros(shape, dtype=bool)
+        self.kind = np.zeros(shape, dtype=np.uint8)
+
+        for row in range(self.rows):
+            for col in range(self.cols):
+                cell = pattern[row][col]
+                if isinstance(cell, (int, bool)):
+                    # integer grid as used by main2.py
+                    cell = StandardCell(is_alive=bool(cell))
+                self.alive[row, col] = cell.is_alive
+                self.age[row, col] = cell.age
+                self.born[row, col] = cell.was_born_this_gen
+                self.died[row, col] = cell.died_this_gen
+                self.last[row, col] = cell.was_alive_last_gen
+                self.kind[row, col] = self._kind_id(type(cell), cell.alive_char, cell.death_char)
+
+    def _load_points(self, pattern):
+        """Place a Pattern in the middle of the board, straight from its coordinates"""
+        self.rows, self.cols, top, left = placement(pattern, self.rows, self.cols)
+        shape = (self.rows, self.cols)
+        self.kinds = []
+        self._kind_id(StandardCell, '@', '.')
+        rows, cols, _ = pattern.coords()
+        self.alive = np.zeros(shape, dtype=bool)
+        self.alive[np.frombuffer(rows, dtype=np.int32) + top, np.frombuffer(cols, dtype=np.int32) + left] = True
+        self.kind = np.zeros(shape, dtype=np.uint8)
+        self.age = np.zeros(shape, dtype=np.int32)
+        self.born = self.alive.copy() # Cell.__init__ marks initial live cells as born
+        self.died = np.zeros(shape, dtype=bool)
+        self.last = np.zeros(shape, dtype=bool)
+
+    def _create_random_arrays(self):
+        """The board of GameOfLifeEngine._create_random_grid for the seed, bands drawn in parallel"""
+        engine = self.engine
+        shape = (self.rows, self.cols)
+        ratio = engine.immortal_ratio if engine.mode != 'original' else 0.0
+        self.alive, immortal = seeding.planes(
+            engine._board_seed(), self.rows, self.cols, engine.density, ratio,
+            workers=getattr(engine, 'workers', None),
+        )
+
+        self.kinds = []
+        self._kind_id(StandardCell, '@', '.')
+        self.kind = np.zeros(shape, dtype=np.uint8)
+        if engine.mode != 'original':
+            self._kind_id(ImmortalCell, 'R', '.')
+            self.kind[immortal] = 1
+
+        self.age = np.zeros(shape, dtype=np.int32)
+        self.born = self.alive.copy() # Cell.__init__ marks initial live cells as born
+        self.died = np.zeros(shape, dtype=bool)
+        self.last = np.zeros(shape, dtype=bool)
+    ## ---------------------
+
+    def step(self):
+        """Calculate the next generation in place"""
+        old = self.alive
+        n = count_neighbors(self.alive)
+        self.alive, self.age, self.born, self.died, self.last = next_state(
+            self.alive, n, self.age, self.born, self.died, self.last, self.immortal, self.table
+        )
+        self._rehash(old)
+    
+    def _rehash(self, old):
+        """Move hash on from the old alive plane, only changed cells count"""
+        self.hash ^= int(np.bitwise_xor.reduce(self.keys[old ^ self.alive]))
+
+    def population(self):
+        return int(np.count_nonzero(self.alive))
+
+    def live_points(self):
+        """(row, col, 1) of every live cell, row major"""
+        for row, col in np.argwhere(self.alive):
+            yield int(row), int(col), 1
+
+    def to_cells(self):
+        """Build a Cell[][] grid from the arrays, for display or export"""
+        grid = []
+        for row in range(self.rows):
+            grid_row = []
+            for col in range(self.cols):
+                cls, alive_char, death_char = self.kinds[self.kind[row, col]]
+                cell = cls(
+                    is_alive=bool(self.alive[row, col]),
+                    alive_char=alive_char,
+                    death_char=death_char,
+                )
+                cell.age = int(self.age[row, col])
+                cell.was_born_this_gen = bool(self.born[row, col])
+                cell.died_this_gen = bool(self.died[row, col])
+                cell.was_alive_last_gen = bool(self.last[row, col])
+                grid_row.append(cell)
+            grid.append(grid_row)
+        return grid
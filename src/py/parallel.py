@@ -0,0 +1,183 @@
+import os
+import time
+import atexit
+import argparse
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from npengine import NumpyBackend, count_neighbors, next_state
+
+
+def _planes(buf, rows, cols):
+    """
+    Lay the shared planes out over one buffer
+
+    alive is double buffered, the other planes are only read by their own
+    cell so each worker can update its stripe of them in place.
+    """
+    layout = [
+        ('age', np.int32, (rows, cols)),
+        ('alive', np.bool_, (2, rows, cols)),
+        ('born', np.bool_, (rows, cols)),
+        ('died', np.bool_, (rows, cols)),
+        ('last', np.bool_, (rows, cols)),
+        ('immortal', np.bool_, (rows, cols)),
+    ]
+    planes, offset = {}, 0
+    for name, dtype, shape in layout:
+        planes[name] = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return planes
+
+
+def _planes_size(rows, cols):
+    return rows * cols * (4 + 2 + 4)
+
+
+def _worker(shm_name, rows, cols, r0, r1, table, start, done, stop):
+    """Step rows [r0, r1) every time the start barrier opens"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    planes = _planes(shm.buf, rows, cols)
+    # stripe plus one halo row above and below, wrapping
+    halo_rows = np.arange(r0 - 1, r1 + 1) % rows
+    cur = 0
+    alive = None
+    try:
+        while True:
+            start.wait()
+            if stop.value:
+                break
+            alive = planes['alive'][cur]
+            n = count_neighbors(alive[halo_rows], halo=True)
+            s = slice(r0, r1)
+            (planes['alive'][cur ^ 1][s], planes['age'][s], planes['born'][s],
+             planes['died'][s], planes['last'][s]) = next_state(
+                alive[s], n, planes['age'][s], planes['born'][s],
+                planes['died'][s], planes['last'][s], planes['immortal'][s], table,
+            )
+            cur ^= 1
+            done.wait()
+    finally:
+        del planes, alive
+        shm.close()
+
+
+class ParallelBackend(NumpyBackend):
+    """
+    NumpyBackend split into horizontal stripes, one worker process each.
+    The planes live in multiprocessing.shared_memory, alive is double
+    buffered and every generation is one round trip on two barriers.
+    """
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.workers = getattr(engine, 'workers', None) or os.cpu_count()
+        self._shm = None
+        self._procs = []
+        self._cur = 0
+        atexit.register(self.close)
+
+    def initialize(self, pattern=None):
+        """Build the arrays like NumpyBackend, then move them to shared memory"""
+        self.close()
+        super().initialize(pattern)
+        self._share()
+
+    def load_planes(self, *planes):
+        """Take the arrays over like NumpyBackend, then move them to shared memory"""
+        self.close()
+        super().load_planes(*planes)
+        self._share()
+
+    def _share(self):
+        """Copy the planes into a new shared memory block and start the workers on it"""
+        self._shm = shared_memory.SharedMemory(create=True, size=_planes_size(self.rows, self.cols))
+        self._planes = _planes(self._shm.buf, self.rows, self.cols)
+        self._cur = 0
+        for name in ('age', 'born', 'died', 'last', 'immortal'):
+            self._planes[name][:] = getattr(self, name)
+        self._planes['alive'][0] = self.alive
+        self._bind()
+        self._start_workers()
+
+    def _bind(self):
+        """Point the NumpyBackend attributes at the current shared planes"""
+        self.alive = self._planes['alive'][self._cur]
+        self.age = self._planes['age']
+        self.born = self._planes['born']
+        self.died = self._planes['died']
+        self.last = self._planes['last']
+        self.immortal = self._planes['immortal']
+
+    def _start_workers(self):
+        workers = max(1, min(self.workers, self.rows))
+        self._start = mp.Barrier(workers + 1)
+        self._done = mp.Barrier(workers + 1)
+        self._stop = mp.Value('b', 0)
+        bounds = np.linspace(0, self.rows, workers + 1).astype(int)
+        self._procs = [
+            mp.Process(
+                target=_worker,
+                args=(self._shm.name, self.rows, self.cols, bounds[i], bounds[i + 1], self.table,
+                      self._start, self._done, self._stop),
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for proc in self._procs:
+            proc.start()
+
+    def step(self):
+        """Calculate the next generation in place, workers do the stripes"""
+        self._start.wait()
+        self._done.wait()
+        self._cur ^= 1
+        self._bind()
+        self._rehash(self._planes['alive'][self._cur ^ 1])
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        if self._procs:
+            self._stop.value = 1
+            self._start.wait()
+            for proc in self._procs:
+                proc.join()
+            self._procs = []
+        if self._shm:
+            # views must go before the buffer can be released
+            self.alive = self.age = self.born = self.died = self.last = self.immortal = None
+            self._planes = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def main():
+    """Scaling benchmark, generations/s of one board for 1..N workers"""
+    from engine import GameOfLifeEngine
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--size', type=int, default=2000)
+    parser.add_argument('--gens', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    counts = sorted({1, args.workers} | {2 ** i for i in range(args.workers.bit_length()) if 2 ** i <= args.workers})
+    base = None
+    print(f"{'workers':>8} {'gen/s':>10} {'speedup':>8}")
+    for workers in counts:
+        engine = GameOfLifeEngine(rows=args.size, cols=args.size, backend='parallel', workers=workers)
+        engine.initialize_grid()
+        engine.update_generation() # warm up
+        t = time.perf_counter()
+        for _ in range(args.gens):
+            engine.update_generation()
+        rate = args.gens / (time.perf_counter() - t)
+        engine.close()
+        base = base or rate
+        print(f"{workers:>8} {rate:>10.2f} {rate / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+import io
+import os
+import re
+import itertools
+from array import array
+
+
+## --------------------------------------------------------------------
+# Pattern files, read and written one cell at a time:
+#   RLE        .rle   header 'x = 3, y = 3, rule = B3/S23', then runs like
+#                     'bo$2bo$3o!' (b dead, o alive, $ next row, ! end),
+#                     Generations states as '.', 'A', 'B', .. 'pA' ..
+#   plaintext  .cells '!' comment lines, then one line per row of '.' / 'O'
+#   Life 1.06  .lif   '#Life 1.06', then one 'x y' line per live cell
+# Cells are (row, col, state) with state 1 for a live cell.
+## --------------------------------------------------------------------
+
+formats = {
+    '.rle': 'rle',
+    '.cells': 'cells',
+    '.lif': 'life106',
+    '.life': 'life106',
+}
+
+
+def _format(path, fmt):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext not in formats:
+        raise ValueError(f"Unknown pattern format {ext!r}, use one of {list(formats)}")
+    return formats[ext]
+
+
+## ---------------------
+# readers, generators of (row, col, state) over an iterator of lines
+
+_rle_header = re.compile(r'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?', re.IGNORECASE)
+_rle_token = re.compile(r'(\d*)([p-y][A-X]|[^\d\s])')
+
+
+def _rle_state(tag):
+    """State of an RLE tag, 0 for dead"""
+    if tag in 'b.':
+        return 0
+    if len(tag) == 2: # pA .. yX
+        return 24 * (ord(tag[0]) - ord('p') + 1) + ord(tag[1]) - ord('A') + 1
+    if 'A' <= tag <= 'X':
+        return ord(tag) - ord('A') + 1
+    return 1 # o, and any other letter in two state files
+
+
+def read_rle_header(lines):
+    """Return (rows, cols, rule) from the header, lines is left on the first body line"""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = _rle_header.match(line)
+        if not match:
+            raise ValueError(f"Bad RLE header {line!r}")
+        cols, rows, rule = match.groups()
+        return int(rows), int(cols), rule
+    raise ValueError("RLE file without a header line")
+
+
+def read_rle_runs(lines):
+    """Runs (row, col, count, state) of live cells of an RLE body, lines positioned after the header"""
+    row = col = 0
+    carry = ''
+    states = {}
+    for line in lines:
+        text = carry + line.strip()
+        end = 0
+        for match in _rle_token.finditer(text):
+            if match.end() == len(text) and match.group(2) in 'pqrstuvwxy':
+                break # maybe the first half of a two letter state
+            end = match.end()
+            count, tag = match.groups()
+            count = int(count) if count else 1
+            if tag == '$':
+                row += count
+                col = 0
+            elif tag == '!':
+                return
+            else:
+                state = states.get(tag)
+                if state is None:
+                    state = states[tag] = _rle_state(tag)
+                if state:
+                    yield row, col, count, state
+                col += count
+        # a run count split over two lines
+        carry = text[end:]
+
+
+def read_rle(lines):
+    """Cells of an RLE body, lines positioned after the header"""
+    for row, col, count, state in read_rle_runs(lines):
+        for c in range(col, col + count):
+            yield row, c, state
+
+
+def read_cells(lines):
+    """Cells of a plaintext pattern"""
+    row = 0
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.startswith('!'):
+            continue
+        for col, char in enumerate(line):
+            if char in 'O*':
+                yield row, col, 1
+        row += 1
+
+
+def read_life106(lines):
+    """Cells of a Life 1.06 pattern, coordinates as they are in the file"""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        x, y = line.split()[:2]
+        yield int(y), int(x), 1
+## ---------------------
+
+
+class Pattern:
+    """
+    A pattern file, or text in one of the formats. Cells are streamed from
+    the source each time cells() is called, nothing is kept in between.
+
+    rows x cols is the bounding box, from the RLE header or from a first
+    pass over plaintext / Life 1.06 sources, cells are relative to it.
+    """
+    def __init__(self, path=None, fmt=None, text=None):
+        """
+        :param path: Str - Pattern file, the format follows the extension
+        :param fmt: Str - 'rle', 'cells' or 'life106' to override the extension
+        :param text: Str - Pattern text instead of a file (fmt required)
+        """
+        self.path = path
+        self.text = text
+        self.fmt = fmt if text is not None else _format(path, fmt)
+        self.rule = None
+        self.top = self.left = 0 # Life 1.06 origin shift
+
+        if self.fmt == 'rle':
+            with self._open() as lines:
+                self.rows, self.cols, self.rule = read_rle_header(lines)
+        elif self.fmt == 'cells':
+            # plaintext keeps its dead rows / columns around the live cells
+            self.rows, self.cols = self._cells_size()
+        else:
+            top, left, bottom, right = _bounds(self._read())
+            if top is None:
+                self.rows = self.cols = 0
+            else:
+                self.top, self.left = top, left
+                self.rows, self.cols = bottom - top + 1, right - left + 1
+
+    def _open(self):
+        if self.text is not None:
+            return io.StringIO(self.text)
+        return open(self.path)
+
+    def _read(self):
+        with self._open() as lines:
+            if self.fmt == 'rle':
+                read_rle_header(lines)
+                yield from read_rle(lines)
+            elif self.fmt == 'cells':
+                yield from read_cells(lines)
+            elif self.fmt == 'life106':
+                yield from read_life106(lines)
+            else:
+                raise ValueError(f"Unknown pattern format {self.fmt!r}")
+
+    def _cells_size(self):
+        rows = cols = 0
+        with self._open() as lines:
+            for line in lines:
+                line = line.rstrip('\r\n')
+                if not line.startswith('!'):
+                    rows += 1
+                    cols = max(cols, len(line))
+        return rows, cols
+
+    def cells(self):
+        """Stream (row, col, state) of the live cells, relative to the bounding box"""
+        for row, col, state in self._read():
+            yield row - self.top, col - self.left, state
+
+    def coords(self):
+        """
+        Return the live cells as three flat arrays, rows, cols and states,
+        for engines that place them in bulk
+        """
+        rows, cols, states = array('i'), array('i'), array('B')
+        if self.fmt == 'rle':
+            # whole runs at a time
+            with self._open() as lines:
+                read_rle_header(lines)
+                for row, col, count, state in read_rle_runs(lines):
+                    rows.extend(itertools.repeat(row, count))
+                    cols.extend(range(col, col + count))
+                    states.extend(itertools.repeat(min(state, 255), count))
+            return rows, cols, states
+        for row, col, state in self.cells():
+            rows.append(row)
+            cols.append(col)
+            states.append(min(state, 255))
+        return rows, cols, states
+
+    def __repr__(self):
+        return f"Pattern({self.path or self.fmt!r}, {self.cols} * {self.rows}, rule={self.rule})"
+
+
+def load(path, fmt=None):
+    """Pattern of a file, see Pattern"""
+    return Pattern(path, fmt)
+
+
+def placement(pattern, rows, cols):
+    """
+    Where a pattern goes on a rows x cols board: the board grows to fit it
+    and the pattern sits in the middle
+
+    :return: (rows, cols, top, left)
+    """
+    rows = max(rows, pattern.rows)
+    cols = max(cols, pattern.cols)
+    return rows, cols, (rows - pattern.rows) // 2, (cols - pattern.cols) // 2
+
+
+## ---------------------
+# writers, from an engine's live_points(): (row, col, state), row major
+
+def _bounds(cells):
+    top = left = bottom = right = None
+    for row, col, _ in cells:
+        if top is None:
+            top, left, bottom, right = row, col, row, col
+        else:
+            top, bottom = min(top, row), max(bottom, row)
+            left, right = min(left, col), max(right, col)
+    return top, left, bottom, right
+
+
+def write_rle(f, cells, rows, cols, top=0, left=0, rule=None, states=2):
+    """
+    Write cells as RLE, 70 characters a line at most
+
+    :param cells: Iterator of (row, col, state), row major
+    :param rows: Int - Bounding box rows, cols its columns, top / left its corner
+    """
+    header = f"x = {cols}, y = {rows}"
+    if rule:
+        header += f", rule = {rule}"
+    f.write(header + "\n")
+
+    line = []
+    width = 0
+    def put(count, tag):
+        nonlocal width
+        token = (str(count) if count > 1 else '') + tag
+        if width + len(token) > 70:
+            f.write(''.join(line) + "\n")
+            line.clear()
+            width = 0
+        line.append(token)
+        width += len(token)
+
+    def tag(state):
+        if states <= 2:
+            return 'o'
+        if state <= 24:
+            return chr(ord('A') + state - 1)
+        return chr(ord('p') + (state - 1) // 24 - 1) + chr(ord('A') + (state - 1) % 24)
+
+    row, col = top, left
+    run_tag, run = None, 0
+    for r, c, state in cells:
+        t = tag(state)
+        if r == row and c == col and t == run_tag:
+            run += 1
+            col += 1
+            continue
+        if run:
+            put(run, run_tag)
+        if r != row:
+            put(r - row, '$')
+            row, col = r, left
+        if c != col:
+            put(c - col, 'b' if states <= 2 else '.')
+        run_tag, run = t, 1
+        col = c + 1
+    if run:
+        put(run, run_tag)
+    put(1, '!')
+    f.write(''.join(line) + "\n")
+
+
+def write_cells(f, cells, top=0, left=0, name=None):
+    """Write cells as plaintext, one '.' / 'O' line per row"""
+    if name:
+        f.write(f"!Name: {name}\n")
+    row, line = top, []
+    for r, c, state in cells:
+        if state != 1:
+            raise ValueError("Plaintext only holds dead and alive cells, use RLE")
+        while row < r:
+            f.write((''.join(line) or '.') + "\n")
+            row, line = row + 1, []
+        line.extend('.' * (c - left - len(line)))
+        line.append('O')
+    f.write((''.join(line) or '.') + "\n")
+
+
+def write_life106(f, cells):
+    """Write cells as Life 1.06, 'x y' per live cell"""
+    f.write("#Life 1.06\n")
+    for row, col, state in cells:
+        if state != 1:
+            raise ValueError("Life 1.06 only holds live cells, use RLE")
+        f.write(f"{col} {row}\n")
+
+
+def save(engine, path, fmt=None):
+    """
+    Export the current generation of an engine, cropped to its live cells
+
+    :param engine: Any engine with live_points() and rule
+    :param path: Str - Output file, the format follows the extension
+    """
+    fmt = _format(path, fmt)
+    top, left, bottom, right = _bounds(engine.live_points())
+    if top is None:
+        top = left = bottom = right = 0
+        rows = cols = 0
+    else:
+        rows, cols = bottom - top + 1, right - left + 1
+    with open(path, 'w') as f:
+        if fmt == 'rle':
+            write_rle(f, engine.live_points(), rows, cols, top, left,
+                      rule=engine.rule, states=engine.rule.states)
+        elif fmt == 'cells':
+            write_cells(f, engine.live_points(), top, left)
+        else:
+            write_life106(f, engine.live_points())
+## ---------------------
@@ -0,0 +1,211 @@
+import csv
+import json
+import time
+import threading
+from collections import deque
+
+
+## --------------------------------------------------------------------
+# Per phase timers and counters of a run, one sample per generation.
+# Engines and displays hold a profiler attribute that stays None unless a
+# Profiler is attached, a run without one only pays for that check.
+#   engine   step      the whole update_generation, hooks included
+#            sync      catching skipped tiles up (tiled object engine)
+#            neighbors get_neighbors of every cell (object engine)
+#            update    Cell.update of every cell (object engine)
+#            apply     Cell.apply_update and the board hash (object engine)
+#   display  frame     (color, char) of every cell, from Cells or 'render'
+#            write     escape sequences built and written to the terminal
+# Frames drawn between two generations belong to the later one's sample.
+## --------------------------------------------------------------------
+
+engine_phases = ('step', 'sync', 'neighbors', 'update', 'apply')
+display_phases = ('frame', 'write')
+columns = (
+    ['generation', 'population', 'births', 'deaths']
+    + [f"{phase}_ms" for phase in engine_phases]
+    + ['frames'] + [f"{phase}_ms" for phase in display_phases] + ['frame_bytes']
+)
+
+
+def _births_deaths(engine):
+    """(births, deaths) of the engine's last generation, None where it can't tell"""
+    if engine.multistate:
+        # born at age 0, a live cell that did not survive starts decaying at 2
+        born = (engine.state == 1) & (engine.age == 0)
+        return int(born.sum()), int((engine.state == 2).sum())
+    if engine.backend:
+        return int(engine.backend.born.sum()), int(engine.backend.died.sum())
+    if hasattr(engine, 'live') and hasattr(engine, 'previous'): # sparse.SparseEngine
+        return len(engine.live - engine.previous), len(engine.previous - engine.live)
+    return None, None
+
+
+class Profiler:
+    """
+    Collects phase times, births, deaths and population of every generation
+    and the frames drawn, as a time series for export and a rolling
+    average for the status line HUD.
+
+    attach() times the engine's update_generation through an instance
+    attribute and sets the engine's and display's profiler, detach()
+    takes all of it back off.
+    """
+    def __init__(self, path=None, hud=True, window=30, limit=None):
+        """
+        :param path: Str - .csv or .json file the samples are saved to on close (None for none)
+        :param hud: Bool - Show the HUD on the status line
+        :param window: Int - Generations the HUD averages over
+        :param limit: Int - Samples kept, oldest dropped first (None for all)
+        """
+        self.path = path
+        self.show_hud = hud
+        self.window = window
+        self.samples = deque(maxlen=limit)
+        self.engine = None
+        self.display = None
+        self._lock = threading.Lock() # frames may come from a render thread
+        self._reset()
+
+    def _reset(self):
+        self._times = dict.fromkeys(engine_phases + display_phases, 0.0)
+        self._births = self._deaths = None
+        self._frames = 0
+        self._frame_bytes = 0
+
+    ## ---------------------
+    def attach(self, engine, display=None):
+        """Profile every generation of engine from now on, and the frames of display"""
+        if self.engine:
+            raise RuntimeError("Profiler already attached")
+        self.engine = engine
+        step = engine.update_generation
+
+        def update_generation():
+            t = time.perf_counter()
+            step()
+            self._times['step'] += time.perf_counter() - t
+            self._sample()
+
+        engine.update_generation = update_generation
+        engine.profiler = self
+        if display:
+            self.display = display
+            display.profiler = self
+
+    def detach(self):
+        """Stop profiling, the samples stay"""
+        if self.engine:
+            del self.engine.update_generation # back to the class method
+            self.engine.profiler = None
+            self.engine = None
+        if self.display:
+            self.display.profiler = None
+            self.display = None
+    ## ---------------------
+
+    ## ---------------------
+    # called by the engine / display being profiled
+    def add(self, phase, seconds):
+        self._times[phase] += seconds
+
+    def count(self, births, deaths):
+        """Births and deaths of the generation, engines that count them as they go"""
+        self._births, self._deaths = births, deaths
+
+    def frame(self, frame_time, write_time, size):
+        """
+        One frame drawn
+
+        :param size: Int - Bytes written to the terminal
+        """
+        with self._lock:
+            self._times['frame'] += frame_time
+            self._times['write'] += write_time
+            self._frames += 1
+            self._frame_bytes += size
+    ## ---------------------
+
+    def _sample(self):
+        engine = self.engine
+        births, deaths = self._births, self._deaths
+        if births is None:
+            births, deaths = _births_deaths(engine)
+        with self._lock:
+            times, frames, size = self._times, self._frames, self._frame_bytes
+            self._reset()
+        sample = {
+            'generation': engine.generation,
+            'population': engine.population(),
+            'births': births,
+            'deaths': deaths,
+        }
+        for phase in engine_phases:
+            sample[f"{phase}_ms"] = round(1000 * times[phase], 4)
+        sample['frames'] = frames
+        for phase in display_phases:
+            sample[f"{phase}_ms"] = round(1000 * times[phase], 4)
+        sample['frame_bytes'] = size
+        self.samples.append(sample)
+
+    def _recent(self):
+        n = min(self.window, len(self.samples))
+        return [self.samples[-i] for i in range(n, 0, -1)]
+
+    def hud(self):
+        """Status line text: rolling step time and its split, counts, frame cost"""
+        recent = self._recent()
+        if not recent:
+            return "Perf -"
+        last = recent[-1]
+        step = sum(s['step_ms'] for s in recent) / len(recent)
+        text = f"Step {step:.2f}ms"
+        split = [(phase, sum(s[f"{phase}_ms"] for s in recent) / len(recent))
+                 for phase in ('neighbors', 'update', 'apply', 'sync')]
+        if step and any(ms for _, ms in split):
+            text += " (" + " ".join(f"{phase[:3]} {100 * ms / step:.0f}%" for phase, ms in split if ms) + ")"
+        text += f" | Pop {last['population']}"
+        if last['births'] is not None:
+            text += f" +{last['births']} -{last['deaths']}"
+        frames = sum(s['frames'] for s in recent)
+        if frames:
+            render = sum(s['frame_ms'] + s['write_ms'] for s in recent) / frames
+            size = sum(s['frame_bytes'] for s in recent) / frames
+            text += f" | Frame {render:.2f}ms {size / 1024:.1f}KB"
+        return text
+
+    def totals(self):
+        """Whole run: generations sampled, frames, bytes and ms per phase"""
+        samples = self.samples
+        totals = {'generations': len(samples), 'frames': sum(s['frames'] for s in samples),
+                  'frame_bytes': sum(s['frame_bytes'] for s in samples)}
+        for phase in engine_phases + display_phases:
+            totals[f"{phase}_ms"] = round(sum(s[f"{phase}_ms"] for s in samples), 3)
+        return totals
+
+    def save(self, path):
+        """
+        Write the samples, CSV with a header row unless path ends in .json
+
+        :param path: Str - .csv or .json file
+        """
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.json'):
+                json.dump({'columns': columns, 'totals': self.totals(), 'samples': list(self.samples)}, f, indent=1)
+            else:
+                writer = csv.DictWriter(f, columns)
+                writer.writeheader()
+                writer.writerows(self.samples)
+        return path
+
+    def close(self):
+        """Detach and save the samples to path, if given"""
+        self.detach()
+        if self.path:
+            self.save(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
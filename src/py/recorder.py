@@ -0,0 +1,360 @@
+import lzma
+import zlib
+import queue
+import bisect
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+
+## --------------------------------------------------------------------
+# Recording of a run, one frame per generation:
+#   header   see _header
+#   records  generation, kind, payload size, payload. A keyframe holds the
+#            whole board, a delta the XOR with the frame before it as runs:
+#            count, then count zero run lengths, count literal run lengths
+#            (uint32) and the literal XOR bytes. Payloads are compressed
+#            one by one when the header says so.
+#   index    generation / offset / kind of every record, then _footer.
+#            A recording without one (the writer died) is scanned instead.
+# Frames are bit packed alive planes, each row starting on a new byte, or
+# the uint8 state plane of Generations boards (ages are not recorded).
+## --------------------------------------------------------------------
+
+MAGIC = b'GOLREC1\0'
+INDEX_MAGIC = b'GOLRIDX\0'
+MULTISTATE = 1 # flags bit, frames are state planes
+KEYFRAME, DELTA = 0, 1
+
+# magic, flags, rows, cols, keyframe_every, compression, mode, rule
+_header = struct.Struct('<8sHIIIB16s64s')
+_record = struct.Struct('<QBQ')
+_footer = struct.Struct('<QQ8s') # index offset, records, INDEX_MAGIC
+
+compressions = {
+    None: (0, None, None),
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lzma': (2, lzma.compress, lzma.decompress),
+}
+_decompress = {cid: decompress for cid, _, decompress in compressions.values()}
+
+# zero bytes shorter than this between two changes stay inside one literal run
+_gap = 8
+
+
+def board(engine):
+    """
+    The generation on screen as an array [row][col], bool or uint8 states
+    for Generations engines, for the unbounded ones their viewport
+    """
+    if engine.multistate:
+        return engine.state
+    if engine.backend:
+        return engine.backend.alive
+    if engine.store:
+        return np.frombuffer(engine.store.alive, dtype=np.uint8).reshape(engine.rows, engine.cols).view(bool)
+    if engine.current_generation:
+        grid = engine.current_generation
+        return np.array([[cell.is_alive for cell in row] for row in grid], dtype=bool)
+    return np.array(engine.to_grid(), dtype=bool)
+
+
+def _pack(board):
+    if board.dtype == bool:
+        return np.packbits(board, axis=1).ravel()
+    return board.ravel().copy()
+
+
+def _unpack(frame, rows, cols, multistate):
+    if multistate:
+        return frame.reshape(rows, cols).copy()
+    return np.unpackbits(frame.reshape(rows, -1), axis=1, count=cols).view(bool)
+
+
+def _literal_index(starts, lengths):
+    """Flat positions covered by the runs, in order"""
+    before = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum())) + np.repeat(starts - before, lengths)
+
+
+def encode_delta(previous, frame):
+    """XOR of two frames as zero runs / literal runs, see the file layout"""
+    x = np.bitwise_xor(previous, frame)
+    changed = np.flatnonzero(x)
+    if not len(changed):
+        return struct.pack('<I', 0)
+    split = np.flatnonzero(np.diff(changed) > _gap)
+    starts = changed[np.r_[0, split + 1]]
+    ends = changed[np.r_[split, len(changed) - 1]] + 1
+    lengths = ends - starts
+    skips = starts - np.r_[0, ends[:-1]]
+    return b''.join((
+        struct.pack('<I', len(starts)),
+        skips.astype('<u4').tobytes(),
+        lengths.astype('<u4').tobytes(),
+        x[_literal_index(starts, lengths)].tobytes(),
+    ))
+
+
+def apply_delta(previous, payload):
+    """Frame following previous, from encode_delta's payload"""
+    frame = previous.copy()
+    count, = struct.unpack_from('<I', payload)
+    if count:
+        skips = np.frombuffer(payload, dtype='<u4', count=count, offset=4).astype(np.int64)
+        lengths = np.frombuffer(payload, dtype='<u4', count=count, offset=4 + 4 * count).astype(np.int64)
+        starts = np.cumsum(skips + np.r_[0, lengths[:-1]])
+        literal = np.frombuffer(payload, dtype=np.uint8, offset=4 + 8 * count)
+        frame[_literal_index(starts, lengths)] ^= literal
+    return frame
+
+
+class Recorder:
+    """
+    Writes one frame per generation of an engine to a recording, a
+    keyframe every keyframe_every frames and deltas in between.
+
+    attach() hooks it onto the engine's on_generation, which only packs
+    the board and queues it. Encoding, compression and writing run on a
+    writer thread. When that thread falls queue_size frames behind the
+    simulation waits for it, frames are never dropped.
+    """
+    def __init__(self, path, keyframe_every=64, compression=None, queue_size=64):
+        """
+        :param path: Str - Recording file
+        :param keyframe_every: Int - Frames from one keyframe to the next
+        :param compression: Str - None, 'zlib' or 'lzma' for every payload
+        :param queue_size: Int - Frames queued for the writer at most
+        """
+        if compression not in compressions:
+            raise ValueError(f"Unknown compression {compression!r}, use one of {list(compressions)}")
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self.compression = compression
+        self.engine = None
+        self.frames = 0
+        self.bytes_written = 0
+        self._queue = queue.Queue(queue_size)
+        self._thread = None
+        self._error = None
+        self._last = -1 # generation of the last frame queued
+
+    def attach(self, engine):
+        """Record the engine's current generation and every one after it"""
+        if self.engine:
+            raise RuntimeError("Recorder already attached")
+        self.engine = engine
+        self._shape = (engine.rows, engine.cols)
+        self._file = open(self.path, 'wb')
+        cid, _, _ = compressions[self.compression]
+        self._file.write(_header.pack(
+            MAGIC, MULTISTATE if engine.multistate else 0, engine.rows, engine.cols,
+            self.keyframe_every, cid, engine.mode.encode(), str(engine.rule).encode(),
+        ))
+        self._thread = threading.Thread(target=self._write, name='recorder', daemon=True)
+        self._thread.start()
+        engine.on_generation.append(self)
+        self(engine)
+
+    def __call__(self, engine):
+        """on_generation hook, queue the generation unless already recorded"""
+        if self._error:
+            raise self._error
+        if engine.generation <= self._last:
+            return # board re-initialized or restored under the recorder
+        if (engine.rows, engine.cols) != self._shape:
+            raise ValueError(f"Board went from {self._shape} to {(engine.rows, engine.cols)} while recording")
+        self._last = engine.generation
+        self._queue.put((engine.generation, _pack(board(engine))))
+
+    def _write(self):
+        """Writer thread"""
+        _, compress, _ = compressions[self.compression]
+        gens, offsets, kinds = array('Q'), array('Q'), array('B')
+        previous = None
+        done = False
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    done = True
+                    break
+                generation, frame = item
+                if previous is None or self.frames % self.keyframe_every == 0:
+                    kind, payload = KEYFRAME, frame.tobytes()
+                else:
+                    kind, payload = DELTA, encode_delta(previous, frame)
+                if compress:
+                    payload = compress(payload)
+                gens.append(generation)
+                offsets.append(self._file.tell())
+                kinds.append(kind)
+                self._file.write(_record.pack(generation, kind, len(payload)))
+                self._file.write(payload)
+                previous = frame
+                self.frames += 1
+
+            index = self._file.tell()
+            for a in (gens, offsets, kinds):
+                self._file.write(a.tobytes())
+            self._file.write(_footer.pack(index, len(gens), INDEX_MAGIC))
+            self.bytes_written = self._file.tell()
+        except Exception as e:
+            self._error = e
+            # keep taking frames so the simulation never blocks on a dead writer
+            while not done and self._queue.get() is not None:
+                pass
+        finally:
+            self._file.close()
+
+    def close(self):
+        """Detach, write what is queued and the index"""
+        if not self.engine:
+            return
+        if self in self.engine.on_generation:
+            self.engine.on_generation.remove(self)
+        self._queue.put(None)
+        self._thread.join()
+        self.engine = None
+        if self._error:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Recording:
+    """
+    Reader of a recording with random access. frame(generation) decodes
+    from the keyframe before it, or from the closest decoded frame in
+    between. Decoded frames are kept in a small LRU cache, so stepping
+    back and forth around a position costs a delta at most.
+    """
+    def __init__(self, path, cache_size=128):
+        """
+        :param path: Str - Recording file written by Recorder
+        :param cache_size: Int - Decoded frames kept, memory is this many packed frames
+        """
+        self.path = path
+        self.cache_size = max(1, cache_size)
+        self._file = open(path, 'rb')
+        magic, flags, self.rows, self.cols, self.keyframe_every, cid, mode, rule = \
+            _header.unpack(self._file.read(_header.size))
+        if magic != MAGIC:
+            raise ValueError("Not a recording")
+        self.multistate = bool(flags & MULTISTATE)
+        self.mode = mode.rstrip(b'\0').decode()
+        self.rule = rule.rstrip(b'\0').decode()
+        self._decompress = _decompress[cid]
+        # typed arrays, 8 bytes an offset instead of a list slot and an int object
+        self.generations, self._offsets, self._kinds = self._read_index()
+        self._keyframes = array('Q', (i for i, kind in enumerate(self._kinds) if kind == KEYFRAME))
+        self._cache = OrderedDict() # record index -> packed frame, least recently used first
+
+    def _read_index(self):
+        f = self._file
+        size = f.seek(0, 2)
+        if size >= _header.size + _footer.size:
+            f.seek(size - _footer.size)
+            index, count, magic = _footer.unpack(f.read(_footer.size))
+            if magic == INDEX_MAGIC:
+                f.seek(index)
+                gens, offsets, kinds = array('Q'), array('Q'), array('B')
+                gens.frombytes(f.read(8 * count))
+                offsets.frombytes(f.read(8 * count))
+                kinds.frombytes(f.read(count))
+                return gens, offsets, kinds
+        # no index, walk the records up to the first incomplete one
+        gens, offsets, kinds = array('Q'), array('Q'), array('B')
+        offset = _header.size
+        while offset + _record.size <= size:
+            f.seek(offset)
+            generation, kind, length = _record.unpack(f.read(_record.size))
+            if offset + _record.size + length > size:
+                break
+            gens.append(generation)
+            offsets.append(offset)
+            kinds.append(kind)
+            offset += _record.size + length
+        return gens, offsets, kinds
+
+    def __len__(self):
+        return len(self.generations)
+
+    def _payload(self, i):
+        self._file.seek(self._offsets[i])
+        _, _, length = _record.unpack(self._file.read(_record.size))
+        payload = self._file.read(length)
+        return self._decompress(payload) if self._decompress else payload
+
+    def _remember(self, i, frame):
+        self._cache[i] = frame
+        self._cache.move_to_end(i)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _frame(self, i):
+        """Packed frame of record i"""
+        if i in self._cache:
+            self._cache.move_to_end(i)
+            return self._cache[i]
+        key = self._keyframes[bisect.bisect_right(self._keyframes, i) - 1]
+        # the closest frame already decoded on the way from the keyframe
+        start = max((j for j in self._cache if key <= j < i), default=None)
+        if start is None:
+            start, frame = key, np.frombuffer(self._payload(key), dtype=np.uint8)
+            self._remember(key, frame)
+        else:
+            frame = self._cache[start]
+        for j in range(start + 1, i + 1):
+            frame = apply_delta(frame, self._payload(j))
+            self._remember(j, frame)
+        return frame
+
+    def index(self, generation):
+        """Record index of a generation, the last one recorded before it if missing"""
+        return max(0, bisect.bisect_right(self.generations, generation) - 1)
+
+    def board(self, i):
+        """Board of record i, [row][col] bool, uint8 states for Generations"""
+        return _unpack(self._frame(i), self.rows, self.cols, self.multistate)
+
+    def frame(self, generation):
+        """
+        The board of a generation, see board
+
+        :param generation: Int - A generation in generations
+        """
+        i = bisect.bisect_left(self.generations, generation)
+        if i == len(self.generations) or self.generations[i] != generation:
+            raise KeyError(f"Generation {generation} is not in the recording")
+        return self.board(i)
+
+    def frames(self, start=0, step=1):
+        """
+        Lazy (generation, board) from record start on, step records at a
+        time, negative steps play backwards. Nothing is decoded ahead.
+        """
+        i = start
+        while 0 <= i < len(self.generations):
+            yield self.generations[i], self.board(i)
+            i += step
+
+    def __iter__(self):
+        """(generation, board) in order"""
+        return self.frames()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
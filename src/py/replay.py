@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+import argparse
+
+import numpy as np
+
+from main import GameOfLifeController
+from recorder import Recording
+from rules import get_rule
+
+
+# records advanced per frame, negative plays backwards
+rates = [-(1 << k) for k in reversed(range(11))] + [1 << k for k in range(11)]
+
+
+def render(display, board, previous, multistate, states):
+    """
+    (color, char) frame of a recorded board. Births and deaths show against
+    the previous record, ages are not recorded so live cells keep the first
+    age color.
+
+    :param board: Bool[][] or Int[][] - States for Generations recordings
+    :param previous: Same - Board of the record before it
+    """
+    colors = display.colors
+    if multistate:
+        decay = display.decay_palette
+        table = np.array([colors['grey'], display.age_palette[0][1]] + decay, dtype=object)
+        index = np.minimum(board, 1).astype(np.intp)
+        dying = board > 1
+        index[dying] = 2 + (board[dying].astype(np.intp) - 2) * len(decay) // max(1, states - 2)
+        chars = np.array(['.', '@', '+'], dtype=object)[np.minimum(board, 2)]
+    else:
+        # dead, died, alive, born
+        table = np.array([colors['grey'], colors['red'], display.age_palette[0][1], colors['bright_green']], dtype=object)
+        index = board.astype(np.intp) * 2 + (board != previous)
+        chars = np.where(board, '@', '.').astype(object)
+    return np.stack([table[index], chars], axis=-1).tolist()
+
+
+class ReplayEngine:
+    """
+    Plays a recording back in place of an engine: get_grid_state, pause and
+    speed work as on GameOfLifeEngine, update_generation moves rate records
+    on (back if negative) instead of simulating. main.GameOfLifeController
+    runs it with replay=path, its replay keys call step / faster / slower /
+    seek. Boards come from the
+    recording's LRU cache, memory stays bounded whatever the run's length.
+    """
+    def __init__(self, path, cache_size=128):
+        """
+        :param path: Str - Recording file from recorder.Recorder
+        :param cache_size: Int - Decoded frames kept around the position
+        """
+        self.recording = Recording(path, cache_size)
+        self.rows = self.recording.rows
+        self.cols = self.recording.cols
+        self.mode = self.recording.mode
+        self.rule = get_rule(self.recording.rule)
+        self.position = 0 # record shown
+        self.rate = 1
+        self.paused = False
+        self.tsleep = 0.2
+        self.cycle = None
+        print(f"Replay {self.mode} {self.rule}: [{self.cols} * {self.rows}] {len(self.recording)} records")
+
+    @property
+    def generation(self):
+        return self.recording.generations[self.position]
+
+    ## ---------------------
+    def seek(self, position):
+        """Show record position, clamped to the recording"""
+        self.position = max(0, min(position, len(self.recording) - 1))
+
+    def step(self, records=None):
+        """
+        Move records on (rate if None), pause on reaching either end
+
+        :param records: Int - Records to move, negative moves back
+        """
+        records = self.rate if records is None else records
+        self.seek(self.position + records)
+        if self.position in (0, len(self.recording) - 1) and not self.paused and records:
+            self.paused = True
+
+    def update_generation(self):
+        """Next frame of the playback"""
+        self.step()
+
+    def faster(self):
+        """Next rate up, backwards playback slows down through it to forwards"""
+        self.rate = rates[min(rates.index(self.rate) + 1, len(rates) - 1)]
+
+    def slower(self):
+        """Next rate down, forwards playback slows down through it to backwards"""
+        self.rate = rates[max(rates.index(self.rate) - 1, 0)]
+    ## ---------------------
+
+    def get_grid_state(self):
+        """Return the grid state of the record shown"""
+        i = self.position
+        board = self.recording.board(i)
+        previous = self.recording.board(i - 1) if i else board
+        multistate, states = self.recording.multistate, self.rule.states
+        return {
+            'generation': self.generation,
+            'grid': board,
+            'render': lambda display: render(display, board, previous, multistate, states),
+            'rows': self.rows,
+            'cols': self.cols,
+            'paused': self.paused,
+            'speed': self.tsleep,
+            'tiles': None,
+            'cycle': None,
+            'info': f"Replay {i + 1}/{len(self.recording)} x{self.rate}",
+        }
+
+    def is_active(self):
+        return True
+
+    def toggle_pause(self):
+        """Toggle pause state, playing from an end starts over from the other one"""
+        self.paused = not self.paused
+        if not self.paused:
+            last = len(self.recording) - 1
+            if self.rate > 0 and self.position == last:
+                self.seek(0)
+            elif self.rate < 0 and self.position == 0:
+                self.seek(last)
+
+    def adjust_speed(self, delta):
+        """Adjust the delay between frames"""
+        self.tsleep = min(3.0, max(0.01, self.tsleep + delta))
+        return self.tsleep
+
+    def snapshot(self):
+        """get_grid_state, recorded boards are never written to"""
+        return self.get_grid_state()
+
+    def close(self):
+        self.recording.close()
+
+
+def main():
+    """Play a recording back, GameOfLifeController in replay mode"""
+    parser = argparse.ArgumentParser(description="Replay a Game of Life recording")
+    parser.add_argument('recording', help="file written with --record")
+    parser.add_argument('--delay', type=float, default=0.2)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--cache', type=int, default=128, help="decoded frames kept in memory")
+    parser.add_argument('--full-redraw', action='store_true')
+    args = parser.parse_args()
+
+    print("  space - Play/Pause")
+    print("  +     - Step forward (paused) / faster")
+    print("  -     - Step back (paused) / slower, then backwards")
+    print("  0-9   - Seek to that tenth of the run")
+    print("  q     - Quit")
+    controller = GameOfLifeController(full_redraw=args.full_redraw, replay=args.recording, cache_size=args.cache)
+    controller.setup_game()
+    controller.start_decoupled(delay=args.delay, gens=0, fps=args.fps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import re
+
+
+class Rule:
+    """
+    Life-like rule in B/S notation, B3/S23 is Conway's.
+
+    Compiled once into table, indexed by state * 9 + live neighbors:
+    table[n] is birth on n (dead cell), table[9 + n] survival on n
+    (live cell). Backends look the next state up instead of branching.
+    """
+    _pattern = re.compile(r'^B([0-8]*)/S([0-8]*)$', re.IGNORECASE)
+    states = 2
+
+    def __init__(self, birth=(3,), survival=(2, 3)):
+        """
+        :param birth: Int[] - Neighbor counts that bring a dead cell to life
+        :param survival: Int[] - Neighbor counts that keep a live cell alive
+        """
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        if not self.birth | self.survival <= set(range(9)):
+            raise ValueError(f"Neighbor counts go from 0 to 8, got {sorted(self.birth | self.survival)}")
+        self.table = bytes(
+            [n in self.birth for n in range(9)] + [n in self.survival for n in range(9)]
+        )
+
+    @classmethod
+    def parse(cls, rule):
+        """
+        Rule from a rulestring, 'B36/S23' or the older '23/36' (S/B) form
+
+        :param rule: Str or Rule - Returned as is if already a Rule
+        """
+        if isinstance(rule, Rule):
+            return rule
+        text = rule.strip()
+        match = cls._pattern.match(text)
+        if match:
+            birth, survival = match.groups()
+        elif re.match(r'^[0-8]*/[0-8]*$', text):
+            survival, birth = text.split('/')
+        else:
+            raise ValueError(f"Bad rulestring {rule!r}, expected something like 'B3/S23'")
+        return cls(map(int, birth), map(int, survival))
+
+    def __str__(self):
+        return 'B{}/S{}'.format(
+            ''.join(map(str, sorted(self.birth))),
+            ''.join(map(str, sorted(self.survival))),
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and (self.table, self.states) == (other.table, other.states)
+
+    def __hash__(self):
+        return hash((self.table, self.states))
+
+    def next_state(self, alive, live_neighbors):
+        """Next state of one cell"""
+        return bool(self.table[alive * 9 + live_neighbors])
+
+
+class GenerationsRule(Rule):
+    """
+    Generations rule, B/S plus a state count: 'B2/S/C3' is Brian's Brain.
+
+    0 is dead, 1 alive, 2 .. states-1 dying. Births and survival only count
+    live neighbors, a live cell that does not survive starts dying and a
+    dying cell moves one state on each generation until it is dead again.
+    states 2 is the plain Life-like rule.
+    """
+    _generations = re.compile(r'^B([0-8]*)/S([0-8]*)/C?(\d+)$', re.IGNORECASE)
+
+    def __init__(self, birth=(2,), survival=(), states=3):
+        """
+        :param states: Int - Number of states, dead and alive included (2 to 256)
+        """
+        super().__init__(birth, survival)
+        if not 2 <= states <= 256:
+            raise ValueError(f"Generations rules have 2 to 256 states, got {states}")
+        self.states = states
+
+    @classmethod
+    def parse(cls, rule):
+        """
+        Rule from 'B2/S/C3', Golly's '/2/3' (S/B/C) form or a B/S rulestring
+
+        :param rule: Str or Rule - A Rule is widened to a 2 state GenerationsRule
+        """
+        if isinstance(rule, GenerationsRule):
+            return rule
+        if isinstance(rule, Rule):
+            return cls(rule.birth, rule.survival, 2)
+        text = rule.strip()
+        match = cls._generations.match(text)
+        if match:
+            birth, survival, states = match.groups()
+        elif re.match(r'^[0-8]*/[0-8]*/\d+$', text):
+            survival, birth, states = text.split('/')
+        else:
+            return cls.parse(Rule.parse(text))
+        return cls(map(int, birth), map(int, survival), int(states))
+
+    def __str__(self):
+        return f"{super().__str__()}/C{self.states}"
+
+
+class SmoothRule:
+    """
+    SmoothLife rule, 'R6/B.278-.365/D.267-.445' with an optional '/T.1'.
+
+    A cell's filling m averages the disk of radius R/3 around it, n the
+    annulus from there to R. A dead cell (m < 0.5) comes alive for n in
+    the birth interval, a live one stays alive for n in the death one,
+    with smooth steps of widths alpha_n / alpha_m in between. T is the
+    time step: 0 replaces the state each generation, T > 0 moves it by
+    T * (2 s - 1).
+    """
+    _pattern = re.compile(
+        r'^R(\d+)/B([\d.]+)-([\d.]+)/D([\d.]+)-([\d.]+)(?:/T([\d.]+))?$', re.IGNORECASE
+    )
+    states = 2 # dead / alive once thresholded, for whatever can't show densities
+    continuous = True
+
+    def __init__(self, radius=6, birth=(0.278, 0.365), death=(0.267, 0.445), dt=0.0,
+                 alpha_n=0.028, alpha_m=0.147):
+        """
+        :param radius: Int - Outer radius of the annulus, in cells (the disk is a third of it)
+        :param birth: (Float, Float) - Annulus fillings that bring a dead cell to life
+        :param death: (Float, Float) - Annulus fillings that keep a live cell alive
+        :param dt: Float - Time step, 0 for discrete generations
+        """
+        if radius < 3:
+            raise ValueError(f"SmoothLife needs a radius of 3 cells at least, got {radius}")
+        self.radius = int(radius)
+        self.birth = tuple(birth)
+        self.death = tuple(death)
+        self.dt = dt
+        self.alpha_n = alpha_n
+        self.alpha_m = alpha_m
+
+    @classmethod
+    def parse(cls, rule):
+        """
+        :param rule: Str or SmoothRule - Returned as is if already a SmoothRule
+        """
+        if isinstance(rule, SmoothRule):
+            return rule
+        match = cls._pattern.match(rule.strip())
+        if not match:
+            raise ValueError(f"Bad SmoothLife rule {rule!r}, expected something like 'R6/B.278-.365/D.267-.445'")
+        radius, b1, b2, d1, d2, dt = match.groups()
+        return cls(int(radius), (float(b1), float(b2)), (float(d1), float(d2)), float(dt or 0))
+
+    def __str__(self):
+        def f(x):
+            return f"{x:g}".lstrip('0') or '0'
+        text = f"R{self.radius}/B{f(self.birth[0])}-{f(self.birth[1])}/D{f(self.death[0])}-{f(self.death[1])}"
+        return text + (f"/T{f(self.dt)}" if self.dt else "")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, SmoothRule) and str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+CONWAY = Rule.parse('B3/S23')
+
+# a few well known ones, any B/S string works too
+named = {
+    'life': 'B3/S23',
+    'highlife': 'B36/S23',
+    'seeds': 'B2/S',
+    'daynight': 'B3678/S34678',
+    'maze': 'B3/S12345',
+    'replicator': 'B1357/S1357',
+    'brianbrain': 'B2/S/C3',
+    'starwars': 'B2/S345/C4',
+    'frogs': 'B34/S12/C3',
+    'smoothlife': 'R6/B.278-.365/D.267-.445',
+    'smoothlife-l': 'R10/B.257-.336/D.365-.549/T.1',
+}
+
+
+def get_rule(rule):
+    """Rule, GenerationsRule or SmoothRule from a rule, a rulestring or a name of named"""
+    if rule is None:
+        return CONWAY
+    if isinstance(rule, SmoothRule):
+        return rule
+    if isinstance(rule, str):
+        rule = named.get(rule.lower(), rule)
+        if rule[:1] in ('R', 'r'):
+            return SmoothRule.parse(rule)
+        if rule.count('/') == 2:
+            return GenerationsRule.parse(rule)
+    return Rule.parse(rule)
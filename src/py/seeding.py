@@ -0,0 +1,138 @@
+import struct
+import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+## --------------------------------------------------------------------
+# Random boards from a seed, counter based: every row has its own stream,
+# SHAKE-128 of (seed, row), so any range of rows can be drawn on its own,
+# in any order and on any worker, and still be the same rows of the same
+# board. Each row's stream holds two 16 bit draws per cell, alive if the
+# first is below density * 65536, immortal if the second is below
+# immortal * 65536.
+#   rows()   pure Python, rows as bytes of 0 / 1, for the object engine
+#   fill()   the same bits into numpy arrays, a band of rows at a time
+#   planes() a whole board, bands filled on a thread pool
+# All three give the same board for the same seed. hashlib and numpy let
+# go of the GIL on large buffers, so the bands really go in parallel.
+## --------------------------------------------------------------------
+
+_tag = b'gameoflife.board.v1'
+_mask = (1 << 64) - 1
+_scale = 1 << 16
+
+
+def threshold(p):
+    """16 bit threshold of a chance, draws below it hit"""
+    if not 0 <= p <= 1:
+        raise ValueError(f"A chance goes from 0 to 1, got {p}")
+    return round(p * _scale)
+
+
+def row_stream(seed, row, cols):
+    """
+    Raw stream of one row: cols alive draws then cols immortal draws,
+    big endian 16 bit each
+
+    :param seed: Int - Board seed, taken modulo 2**64
+    :param row: Int - Row number, the counter
+    :return: Bytes - 4 * cols bytes
+    """
+    return hashlib.shake_128(_tag + struct.pack('<QQ', seed & _mask, row)).digest(4 * cols)
+
+
+## ---------------------
+@functools.lru_cache(maxsize=None)
+def _tables(t):
+    """translate() tables: byte < t, byte == t"""
+    return bytes(v < t for v in range(256)), bytes(v == t for v in range(256))
+
+
+def _below(draws, t):
+    """
+    Bytes of 0 / 1, 1 where a big endian 16 bit draw is below t: the high
+    byte below t's, or equal and the low byte below, with translate() and
+    big int bit operations instead of a loop over the cells
+    """
+    n = len(draws) // 2
+    if t >= _scale:
+        return b'\1' * n
+    if t <= 0:
+        return bytes(n)
+    hi, lo = divmod(t, 256)
+    high, low = draws[0::2], draws[1::2]
+    high_lt, high_eq = _tables(hi)
+    bits = int.from_bytes(high.translate(high_lt), 'little') | (
+        int.from_bytes(high.translate(high_eq), 'little')
+        & int.from_bytes(low.translate(_tables(lo)[0]), 'little')
+    )
+    return bits.to_bytes(n, 'little')
+
+
+def rows(seed, cols, density, immortal=0.0, start=0, stop=None):
+    """
+    Rows start .. stop-1 of a random board, pure Python
+
+    :param seed: Int - Board seed
+    :param cols: Int - Columns of the board
+    :param density: Float - Chance of a live cell
+    :param immortal: Float - Chance of an immortal cell, alive or not
+    :param stop: Int - Row after the last one (None for start + 1)
+    :return: Iterator of (alive, immortal) Bytes of 0 / 1, one pair per row
+    """
+    t_alive, t_immortal = threshold(density), threshold(immortal)
+    for row in range(start, start + 1 if stop is None else stop):
+        stream = row_stream(seed, row, cols)
+        yield _below(stream[:2 * cols], t_alive), _below(stream[2 * cols:], t_immortal)
+## ---------------------
+
+
+## ---------------------
+def fill(alive, immortal, seed, density, ratio=0.0, start=0):
+    """
+    Draw rows start .. start+len(alive)-1 of a board into arrays
+
+    :param alive: Bool[][] - numpy rows to fill, any band of the board
+    :param immortal: Bool[][] - numpy rows of the same shape (None to skip)
+    :param seed: Int - Board seed
+    :param density: Float - Chance of a live cell
+    :param ratio: Float - Chance of an immortal cell
+    :param start: Int - Board row of alive[0]
+    """
+    import numpy as np # needs numpy
+
+    band, cols = alive.shape
+    streams = b''.join(row_stream(seed, row, cols) for row in range(start, start + band))
+    draws = np.frombuffer(streams, dtype='>u2').reshape(band, 2, cols)
+    np.less(draws[:, 0], threshold(density), out=alive)
+    if immortal is not None:
+        np.less(draws[:, 1], threshold(ratio), out=immortal)
+
+
+def planes(seed, rows, cols, density, immortal=0.0, workers=None, band=64):
+    """
+    Whole random board as numpy arrays, bands of rows filled in parallel
+
+    :param workers: Int - Threads (None for the pool's default), the board is the same for any
+    :param band: Int - Rows per task
+    :return: (alive, immortal) Bool[rows][cols] arrays
+    """
+    import numpy as np # needs numpy
+
+    alive = np.empty((rows, cols), dtype=bool)
+    immortal_plane = np.empty((rows, cols), dtype=bool)
+    starts = range(0, rows, band)
+
+    def task(r0):
+        r1 = min(r0 + band, rows)
+        fill(alive[r0:r1], immortal_plane[r0:r1], seed, density, immortal, r0)
+
+    if workers == 1 or len(starts) == 1:
+        for r0 in starts:
+            task(r0)
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(task, starts))
+    return alive, immortal_plane
+## ---------------------
@@ -0,0 +1,189 @@
+import functools
+
+import numpy as np
+
+from engine import GameOfLifeEngine
+from rules import SmoothRule
+from patterns import Pattern, placement
+
+
+# densities to glyphs, empty to full
+ramp = np.array(list('.,:-=+*#%@'), dtype=object)
+
+
+@functools.lru_cache(maxsize=8)
+def kernels(rows, cols, radius):
+    """
+    Spectra of SmoothLife's disk (radius / 3) and annulus (out to radius)
+    kernels on a rows x cols torus, each summing to 1 so a convolution is
+    the filling of the area. Edges are anti-aliased, a cell on the rim
+    counts for the part of it inside.
+
+    :return: (disk, annulus) complex64 rfft2 spectra, shared between callers so read only
+    """
+    # torus distance of every cell from cell (0, 0), where the kernels are centred
+    dr = np.minimum(np.arange(rows), rows - np.arange(rows)).astype(np.float32)
+    dc = np.minimum(np.arange(cols), cols - np.arange(cols)).astype(np.float32)
+    d = np.hypot(dr[:, None], dc[None, :])
+    disk = np.clip(radius / 3 + 0.5 - d, 0, 1)
+    annulus = np.clip(radius + 0.5 - d, 0, 1) - disk
+    spectra = []
+    for kernel in (disk, annulus):
+        spectrum = np.fft.rfft2(kernel / kernel.sum())
+        spectrum.flags.writeable = False
+        spectra.append(spectrum)
+    return tuple(spectra)
+
+
+def _sigmoid(x, a, alpha):
+    """Smooth step from 0 to 1 around a, alpha wide"""
+    with np.errstate(over='ignore'): # far from a, exp overflows to the right 0 / 1
+        return 1 / (1 + np.exp((a - x) * (4 / alpha)))
+
+
+def transition(n, m, rule):
+    """
+    SmoothLife's s(n, m): 1 where the annulus filling n is inside the birth
+    interval for a dead cell (disk filling m near 0), inside the death one
+    for a live cell (m near 1), blended in between
+
+    :param rule: SmoothRule - Intervals and step widths
+    """
+    alive = _sigmoid(m, 0.5, rule.alpha_m)
+    low = rule.birth[0] * (1 - alive) + rule.death[0] * alive
+    high = rule.birth[1] * (1 - alive) + rule.death[1] * alive
+    return _sigmoid(n, low, rule.alpha_n) * (1 - _sigmoid(n, high, rule.alpha_n))
+
+
+class SmoothLifeEngine(GameOfLifeEngine):
+    """
+    SmoothLife on a torus: every cell holds a float32 density in [0, 1],
+    disk and annulus fillings come from FFT convolutions with the kernel
+    spectra cached by kernels(), so a generation is O(N log N) whatever
+    the radius.
+
+    population() counts cells above 0.5, the board hash is taken over
+    densities rounded to 8 bits so a board that settled (or emptied)
+    still reads as a cycle. Frames map densities to a glyph ramp and the
+    display's greens, there are no Cell objects. mode has no effect.
+    """
+    continuous = True
+
+    def __init__(self, mode='original', rows=None, cols=None, rule=None):
+        """
+        :param rows: Int - Number of rows (None for auto-detect)
+        :param cols: Int - Number of columns (None for auto-detect)
+        :param rule: Str or SmoothRule - SmoothLife rule (None for 'smoothlife')
+        """
+        super().__init__(mode=mode, rows=rows, cols=cols, rule=rule or 'smoothlife')
+        self.rule = SmoothRule.parse(self.rule)
+        self.state = None
+
+    ## ---------------------
+    def initialize_grid(self, pattern=None):
+        """
+        Fill the board from a pattern or with random squares
+
+        :param pattern: Cell[][], Float[][] or patterns.Pattern - Optional pattern,
+                        numbers are densities. Patterns smaller than the kernel die out.
+        """
+        if isinstance(pattern, Pattern):
+            self.rows, self.cols, top, left = placement(pattern, self.rows, self.cols)
+            self.state = np.zeros((self.rows, self.cols), dtype=np.float32)
+            rows, cols, _ = pattern.coords()
+            self.state[np.frombuffer(rows, dtype=np.int32) + top, np.frombuffer(cols, dtype=np.int32) + left] = 1
+        elif pattern:
+            self.rows = len(pattern)
+            self.cols = len(pattern[0])
+            self.state = np.array(
+                [[cell if isinstance(cell, (int, float)) else cell.is_alive for cell in row] for row in pattern],
+                dtype=np.float32,
+            ).clip(0, 1)
+        else:
+            self._create_random_state()
+        if 2 * self.rule.radius >= min(self.rows, self.cols):
+            raise ValueError(f"{self.rule} needs a board wider than {2 * self.rule.radius} cells")
+        self.generation = 0
+        self._start_history()
+
+    def _create_random_state(self):
+        """Squares of a radius side at random, about a quarter of the board full"""
+        shape = (self.rows, self.cols)
+        rng = np.random.default_rng(self._board_seed())
+        r = self.rule.radius
+        self.state = np.zeros(shape, dtype=np.float32)
+        for _ in range(max(1, self.rows * self.cols // (4 * r * r))):
+            top, left = rng.integers(self.rows), rng.integers(self.cols)
+            self.state[np.ix_((top + np.arange(r)) % self.rows, (left + np.arange(r)) % self.cols)] = 1
+    ## ---------------------
+
+    def update_generation(self):
+        """Calculate the next generation"""
+        rule = self.rule
+        disk, annulus = kernels(self.rows, self.cols, rule.radius)
+        spectrum = np.fft.rfft2(self.state)
+        m = np.fft.irfft2(spectrum * disk, s=self.state.shape)
+        n = np.fft.irfft2(spectrum * annulus, s=self.state.shape)
+        s = transition(n, m, rule)
+        if rule.dt:
+            self.state = np.clip(self.state + rule.dt * (2 * s - 1), 0, 1)
+        else:
+            self.state = s
+        self.hash = self._hash_board()
+        self.generation += 1
+        self._record()
+
+    def population(self):
+        """Number of cells above half density"""
+        return int(np.count_nonzero(self.state > 0.5))
+
+    def mass(self):
+        """Sum of the densities"""
+        return float(self.state.sum(dtype=np.float64))
+
+    def live_points(self):
+        """(row, col, 1) of every cell above half density, row major"""
+        for row, col in np.argwhere(self.state > 0.5):
+            yield int(row), int(col), 1
+
+    def to_grid(self):
+        """Cells above half density as Int[][], for what only takes 2 states"""
+        return (self.state > 0.5).astype(int).tolist()
+
+    def _hash_board(self):
+        """Hash of the densities rounded to 8 bits, 0 once they all round to 0"""
+        q = (self.state * 255 + 0.5).astype(np.uint8)
+        return hash(q.tobytes()) if q.any() else 0
+
+    ## ---------------------
+    def render(self, display, state):
+        """
+        (color, char) frame of the densities: a glyph from ramp, grey when
+        empty then the display's greens from darkest to brightest
+
+        :param display: GameOfLifeDisplay - Gives colors and age_palette
+        """
+        colors = display.colors
+        shades = [color for _, color in reversed(display.age_palette)] + [colors['bright_green']]
+        table = np.array([colors['grey']] + shades, dtype=object)
+        level = np.minimum((state * len(ramp)).astype(np.intp), len(ramp) - 1)
+        index = np.where(level > 0, 1 + (level - 1) * len(shades) // (len(ramp) - 1), 0)
+        return np.stack([table[index], ramp[level]], axis=-1).tolist()
+
+    def get_grid_state(self):
+        """Return current grid state, grid is a copy of the densities"""
+        state = self.state.copy()
+        return {
+            'generation': self.generation,
+            'grid': state,
+            'render': lambda display: self.render(display, state),
+            'rows': self.rows,
+            'cols': self.cols,
+            'paused': self.paused,
+            'speed': self.tsleep,
+            'tiles': None,
+            'cycle': self.cycle,
+            'seed': self.seed,
+            'info': f"Mass {self.mass():.0f}",
+        }
+    ## ---------------------
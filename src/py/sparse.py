@@ -0,0 +1,190 @@
+from collections import Counter
+
+from cell import StandardCell, ImmortalCell
+from engine import GameOfLifeEngine
+from cycles import point_key
+from patterns import Pattern
+
+
+# (row, col) offsets of the Moore neighborhood
+neighborhood = [(i, j) for i in range(-1, 2) for j in range(-1, 2) if not (i == 0 and j == 0)]
+
+
+class SparseEngine(GameOfLifeEngine):
+    """
+    Unbounded plane that only stores live cells as a set of (row, col).
+    A generation touches the live cells and their neighbors, so its cost
+    follows the population instead of the board area.
+
+    rows x cols is the viewport get_grid_state renders, set_viewport /
+    center_viewport move it around the plane.
+    """
+    def __init__(self, mode='original', rows=None, cols=None, rule=None):
+        """
+        :param rows: Int - Viewport rows (None for auto-detect)
+        :param cols: Int - Viewport columns (None for auto-detect)
+        :param rule: Str or Rule - Life-like rule, B0 rules are refused
+        """
+        super().__init__(mode=mode, rows=rows, cols=cols, rule=rule)
+        if 0 in self.rule.birth:
+            raise ValueError(f"{self.rule} turns the whole unbounded plane on, use a bounded engine")
+        self.live = set()
+        self.previous = set()
+        self.ages = {}         # (row, col) -> age, live cells only
+        self.immortal = set()  # (row, col) holding an ImmortalCell, dead or alive
+        self.top = 0
+        self.left = 0
+
+    ## ---------------------
+    def initialize_grid(self, pattern=None):
+        """
+        Seed the plane from a pattern or random values in the viewport
+
+        :param pattern: Cell[][], Int[][] or patterns.Pattern - Optional predefined
+                        pattern, a Pattern is centred on the viewport
+        """
+        self.live = set()
+        self.immortal = set()
+        self.ages = {}
+        if isinstance(pattern, Pattern):
+            top = (self.rows - pattern.rows) // 2
+            left = (self.cols - pattern.cols) // 2
+            self.live = {(top + row, left + col) for row, col, _ in pattern.cells()}
+            self.ages = dict.fromkeys(self.live, 0)
+        else:
+            if pattern:
+                self.rows = len(pattern)
+                self.cols = len(pattern[0])
+            else:
+                pattern = self._create_random_grid()
+            for row, grid_row in enumerate(pattern):
+                for col, cell in enumerate(grid_row):
+                    if isinstance(cell, (int, bool)):
+                        alive, age = bool(cell), 0
+                    else:
+                        alive, age = cell.is_alive, cell.age
+                        if isinstance(cell, ImmortalCell):
+                            self.immortal.add((row, col))
+                    if alive:
+                        self.live.add((row, col))
+                        self.ages[(row, col)] = age
+        # Cell.__init__ marks initial live cells as born
+        self.previous = set()
+        self.top = 0
+        self.left = 0
+        self.current_generation = []
+        self.generation = 0
+        self._start_history()
+    ## ---------------------
+
+    def update_generation(self):
+        """Calculate the next generation"""
+        live = self.live
+        table = self.rule.table
+        counts = Counter(
+            (row + i, col + j) for row, col in live for i, j in neighborhood
+        )
+        # Birth / Survival from the rule table, ImmortalCell never dies
+        nxt = {p for p, n in counts.items() if table[(p in live) * 9 + n]}
+        if table[9]:
+            # S0, isolated cells have no entry in counts
+            nxt |= {p for p in live if p not in counts}
+        nxt |= live & self.immortal
+
+        ages = self.ages
+        self.ages = {p: ages[p] + 1 if p in live else 0 for p in nxt}
+        self.previous = live
+        self.live = nxt
+        for p in live ^ nxt:
+            self.hash ^= point_key(*p)
+        self.generation += 1
+        self._record()
+
+    def population(self):
+        return len(self.live)
+    
+    def _hash_board(self):
+        h = 0
+        for p in self.live:
+            h ^= point_key(*p)
+        return h
+
+    def live_points(self):
+        """(row, col, 1) of every live cell, row major"""
+        for row, col in sorted(self.live):
+            yield row, col, 1
+
+    def bounds(self):
+        """Return (top, left, bottom, right) of the live cells, None if extinct"""
+        if not self.live:
+            return None
+        rows = [row for row, _ in self.live]
+        cols = [col for _, col in self.live]
+        return min(rows), min(cols), max(rows), max(cols)
+
+    ## ---------------------
+    def set_viewport(self, top, left, rows=None, cols=None):
+        """
+        Move the rendered window
+
+        :param top: Int - Plane row shown on the first line
+        :param left: Int - Plane column shown on the first column
+        """
+        self.top = top
+        self.left = left
+        if rows:
+            self.rows = rows
+        if cols:
+            self.cols = cols
+
+    def center_viewport(self):
+        """Center the window on the live cells bounding box"""
+        box = self.bounds()
+        if box:
+            top, left, bottom, right = box
+            self.set_viewport((top + bottom - self.rows) // 2 + 1, (left + right - self.cols) // 2 + 1)
+    ## ---------------------
+
+    def to_grid(self):
+        """Export the viewport as an Int[][] pattern, as main2.py uses"""
+        grid = [[0] * self.cols for _ in range(self.rows)]
+        for row, col in self.live:
+            if 0 <= row - self.top < self.rows and 0 <= col - self.left < self.cols:
+                grid[row - self.top][col - self.left] = 1
+        return grid
+
+    def to_cells(self):
+        """Build the Cell[][] grid of the viewport"""
+        grid = []
+        for row in range(self.top, self.top + self.rows):
+            grid_row = []
+            for col in range(self.left, self.left + self.cols):
+                p = (row, col)
+                alive = p in self.live
+                was_alive = p in self.previous
+                if p in self.immortal:
+                    cell = ImmortalCell(is_alive=alive, alive_char='R', death_char='.')
+                else:
+                    cell = StandardCell(is_alive=alive, alive_char='@', death_char='.')
+                if self.generation:
+                    cell.was_born_this_gen = alive and not was_alive
+                    cell.died_this_gen = was_alive and not alive
+                    cell.was_alive_last_gen = was_alive
+                cell.age = self.ages.get(p, 0)
+                grid_row.append(cell)
+            grid.append(grid_row)
+        return grid
+
+    def get_grid_state(self):
+        """Return current grid state"""
+        return {
+            'generation': self.generation,
+            'grid': self.to_cells(),
+            'rows': self.rows,
+            'cols': self.cols,
+            'paused': self.paused,
+            'speed': self.tsleep,
+            'tiles': None,
+            'cycle': self.cycle,
+            'seed': self.seed
+        }
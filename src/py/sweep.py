@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import json
+import hashlib
+import inspect
+import argparse
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import batch
+
+
+## --------------------------------------------------------------------
+# Parameter sweeps: a grid of batch.run keywords is expanded into runs,
+# the runs go out over a process pool and every summary is appended to a
+# JSONL file as soon as it comes back. A second JSONL file caches the
+# summaries by run key, a sweep run again (or after being interrupted)
+# only runs what is missing from it.
+## --------------------------------------------------------------------
+
+# batch.run keywords a sweep may vary, 'size' sets rows and cols together
+parameters = ('seed', 'mode', 'rows', 'cols', 'size', 'gens', 'backend', 'rule', 'density',
+              'immortal', 'tile_size', 'compact', 'stop', 'pattern')
+
+# batch.run's defaults for them, filled in before hashing so a keyword left
+# out and the same keyword given its default are one run
+_defaults = {
+    name: p.default for name, p in inspect.signature(batch.run).parameters.items()
+    if name in parameters and p.default is not inspect.Parameter.empty
+}
+
+
+def expand(grid):
+    """
+    Every combination of a parameter grid, in a fixed order
+
+    :param grid: Dict - Parameter -> value or list of values
+    :return: Dict[] - batch.run keywords, one per run
+    """
+    unknown = set(grid) - set(parameters)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters {sorted(unknown)}, use some of {list(parameters)}")
+    names = sorted(grid)
+    values = [v if isinstance(v, (list, tuple, range)) else [v] for v in (grid[n] for n in names)]
+    runs = []
+    for combo in itertools.product(*values):
+        params = dict(zip(names, combo))
+        if 'size' in params:
+            size = params.pop('size')
+            params['rows'] = params['cols'] = size
+        runs.append(params)
+    return runs
+
+
+def run_key(params):
+    """
+    Cache key of a run: seed, size, rule, mode, generations and whatever
+    else changes its outcome (density, backend, ...), as a hex digest
+    """
+    keyed = {k: v for k, v in dict(_defaults, **params).items() if v is not None}
+    return hashlib.sha1(json.dumps(keyed, sort_keys=True).encode()).hexdigest()
+
+
+class Cache:
+    """
+    Summaries of finished runs by run key, kept in a JSONL file that is
+    only ever appended to. A line cut short by a crash is skipped on load.
+    """
+    def __init__(self, path):
+        """
+        :param path: Str - Cache file, created on the first put
+        """
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[entry['key']] = entry['summary']
+        self._file = None
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, summary):
+        if self._file is None:
+            self._file = open(self.path, 'a')
+        self.entries[key] = summary
+        self._file.write(json.dumps({'key': key, 'summary': summary}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def _run(params):
+    """Worker side, one batch.run without its banners"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return batch.run(**params)
+
+
+def sweep(grid, output, cache_path=None, workers=None, log=None):
+    """
+    Run every combination of grid, cached runs are not run again
+
+    :param grid: Dict - Parameter -> value or list of values, see expand;
+                 seed is required so every run is reproducible
+    :param output: Str - JSONL file, one line per run (params, key, cached,
+                   the summary or an error) appended in completion order
+    :param cache_path: Str - Cache file (None for no cache)
+    :param workers: Int - Processes (None for all cores)
+    :param log: Callable - Called with every line written
+    :return: Dict[] - The lines written
+    """
+    runs = expand(grid)
+    if any('seed' not in params for params in runs):
+        raise ValueError("A sweep needs seed in its grid")
+    cache = Cache(cache_path) if cache_path else None
+    lines = []
+    try:
+        with open(output, 'a') as out:
+            def write(params, key, cached, result):
+                line = {'params': params, 'key': key, 'cached': cached, **result}
+                out.write(json.dumps(line) + "\n")
+                out.flush()
+                lines.append(line)
+                if log:
+                    log(line)
+
+            todo = []
+            for params in runs:
+                key = run_key(params)
+                if cache and key in cache:
+                    write(params, key, True, cache.get(key))
+                else:
+                    todo.append((params, key))
+
+            pool = ProcessPoolExecutor(workers)
+            try:
+                futures = {pool.submit(_run, params): (params, key) for params, key in todo}
+                for future in as_completed(futures):
+                    params, key = futures[future]
+                    try:
+                        summary = future.result()
+                    except Exception as e: # a bad combination, the others carry on
+                        write(params, key, False, {'error': f"{type(e).__name__}: {e}"})
+                        continue
+                    if cache:
+                        cache.put(key, summary)
+                    write(params, key, False, summary)
+            finally:
+                # on Ctrl-C only the runs already going are waited for, the
+                # queued ones are dropped and the cache keeps what finished
+                pool.shutdown(cancel_futures=True)
+    finally:
+        if cache:
+            cache.close()
+    return lines
+
+
+def _line(line):
+    params = ' '.join(f"{k}={v}" for k, v in line['params'].items())
+    if 'error' in line:
+        return f"{params} | {line['error']}"
+    outcome = line['outcome'] + (f" period {line['period']}" if line['period'] else "")
+    return (f"{params} | Gen {line['generations']} | Population {line['population']} | {outcome}"
+            + (" (cached)" if line['cached'] else ""))
+
+
+def main(argv=None):
+    """Parameter sweep"""
+    parser = argparse.ArgumentParser(description="Sweep batch runs over a parameter grid on a process pool")
+    parser.add_argument('--seeds', type=int, nargs='+', default=None, help="seeds to run")
+    parser.add_argument('--runs', type=int, default=None, help="seeds 0 .. runs-1, instead of --seeds")
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.125])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64])
+    parser.add_argument('--modes', nargs='+', default=['original'], choices=['original', 'other'])
+    parser.add_argument('--rules', nargs='+', default=[None], help="B/S rulestrings or names")
+    parser.add_argument('--backends', nargs='+', default=['object'],
+                        choices=list(batch.backends) + list(batch.engines))
+    parser.add_argument('--gens', type=int, nargs='+', default=[100])
+    parser.add_argument('--grid', default=None, help="JSON file of parameter -> values, instead of the flags above")
+    parser.add_argument('--workers', type=int, default=None, help="processes (default all cores)")
+    parser.add_argument('--output', default='sweep.jsonl', help="JSONL file the results are appended to")
+    parser.add_argument('--cache', default='sweep-cache.jsonl', help="JSONL cache of finished runs")
+    parser.add_argument('--no-cache', action='store_true', help="run everything, cache nothing")
+    args = parser.parse_args(argv)
+
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+    else:
+        if args.runs is None and args.seeds is None:
+            parser.error("give --seeds, --runs or --grid")
+        grid = {
+            'seed': list(range(args.runs)) if args.runs is not None else args.seeds,
+            'density': args.densities,
+            'size': args.sizes,
+            'mode': args.modes,
+            'rule': args.rules,
+            'backend': args.backends,
+            'gens': args.gens,
+        }
+    lines = sweep(grid, args.output, None if args.no_cache else args.cache, args.workers,
+                  log=lambda line: print(_line(line), flush=True))
+    cached = sum(line['cached'] for line in lines)
+    errors = sum('error' in line for line in lines)
+    print(f"{len(lines)} runs, {cached} from the cache, {errors} failed -> {args.output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
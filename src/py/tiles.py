@@ -0,0 +1,57 @@
+class TileTracker:
+    """
+    Splits a torus into size x size tiles and remembers which ones had a
+    cell change state. A tile only needs recomputing when it or one of its
+    8 neighbor tiles changed last generation, everything else is stable.
+    """
+    def __init__(self, rows, cols, size=16):
+        """
+        :param rows: Int - Grid rows
+        :param cols: Int - Grid columns
+        :param size: Int - Tile side in cells
+        """
+        self.rows = rows
+        self.cols = cols
+        self.size = size
+        self.tile_rows = -(-rows // size)
+        self.tile_cols = -(-cols // size)
+        self.total_tiles = self.tile_rows * self.tile_cols
+
+        # first generation computes everything
+        self.active = {(tr, tc) for tr in range(self.tile_rows) for tc in range(self.tile_cols)}
+        self.changed = set()
+
+        # last generation
+        self.active_tiles = 0
+        self.skipped_tiles = 0
+        # whole run
+        self.total_active = 0
+        self.total_skipped = 0
+
+    def ranges(self, tile):
+        """Return (range of rows, range of cols) covered by a tile"""
+        tr, tc = tile
+        r0, c0 = tr * self.size, tc * self.size
+        return range(r0, min(r0 + self.size, self.rows)), range(c0, min(c0 + self.size, self.cols))
+
+    def begin(self):
+        """Start a generation, return the tiles to recompute"""
+        self.active_tiles = len(self.active)
+        self.skipped_tiles = self.total_tiles - self.active_tiles
+        self.total_active += self.active_tiles
+        self.total_skipped += self.skipped_tiles
+        self.changed = set()
+        return self.active
+
+    def mark(self, row, col):
+        """Record that the cell at row, col changed state"""
+        self.changed.add((row // self.size, col // self.size))
+
+    def end(self):
+        """Finish a generation, changed tiles and their neighbors go next"""
+        active = set()
+        for tr, tc in self.changed:
+            for i in range(-1, 2):
+                for j in range(-1, 2):
+                    active.add(((tr + i) % self.tile_rows, (tc + j) % self.tile_cols))
+        self.active = active
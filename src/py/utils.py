@@ -9,56 +9,67 @@ import os
 
 
 class KeyboardHandler:
-    def __init__(self, use_thread=False):
+    def __init__(self, use_thread=False, on_key=None):
+        """
+        :param use_thread: Bool - Read keys on a background thread
+        :param on_key: Callable - Called from that thread with every key,
+                       instead of queueing it for get_key
+        """
         self.input_queue = queue.Queue(maxsize=-1)
         self.running = False
         self.use_thread = use_thread
+        self.on_key = on_key
         self.thread = None
         self.old_settings = None
+        self._wake_r = self._wake_w = None
 
     def _keyboard_listener(self):
         """Background thread function to listen for keyboard input"""
         try:
             while self.running:
-                if select.select([sys.stdin], [], []) == ([sys.stdin], [], []):
+                # blocks until a key or terminate() writes to the wake pipe
+                ready, _, _ = select.select([sys.stdin, self._wake_r], [], [])
+                if sys.stdin in ready:
                     key = sys.stdin.read(1)
-                    self.input_queue.put(key)
-                time.sleep(0.01)  
+                    if not key: # stdin closed
+                        break
+                    if self.on_key:
+                        self.on_key(key)
+                    else:
+                        self.input_queue.put(key)
         except Exception as e:
             pass
-        finally:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
         
             
     def start(self):
         """Start the keyboard listener thread"""
+        #if sys.platform.startswith('linux') or sys.platform.startswith('darwin'):
+        self.old_settings = termios.tcgetattr(sys.stdin)
+        tty.setcbreak(sys.stdin.fileno())
         if self.use_thread:
             self.running = True
+            self._wake_r, self._wake_w = os.pipe()
             self.thread = threading.Thread(target=self._keyboard_listener, daemon=True)
             self.thread.start()
-        else:
-            #if sys.platform.startswith('linux') or sys.platform.startswith('darwin'):
-            self.old_settings = termios.tcgetattr(sys.stdin)
-            tty.setcbreak(sys.stdin.fileno())
         
     def terminate(self):
         """Stop the keyboard listener"""
         if self.thread:
             self.running = False
+            os.write(self._wake_w, b'x')
             self.thread.join(timeout=0.5)
-        else:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self.thread = None
+        termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
 
     def get_key(self):
         """Get a key from the input queue (non-blocking)"""
         if self.thread:
-            # TODO
-            
             try:
-                #return self.input_queue.get_nowait()
-                return self.input_queue.get()
+                return self.input_queue.get_nowait()
             except queue.Empty:
-                return 'Nada'
+                return None
         else:
             if select.select([sys.stdin], [], [], 0.1) == ([sys.stdin], [], []):
                 return sys.stdin.read(1)
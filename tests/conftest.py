@@ -0,0 +1,20 @@
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+# the modules are flat scripts in src/py, imported the way they import each other
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'py'))
+
+# blocks.cache_dir is read from XDG_CACHE_HOME when blocks is imported, set
+# before any test module imports it so lookup tables stay out of ~/.cache
+_cache_home = tempfile.mkdtemp(prefix='gameoflife-tests-')
+os.environ['XDG_CACHE_HOME'] = _cache_home
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _cache_dir():
+    yield _cache_home
+    shutil.rmtree(_cache_home, ignore_errors=True)
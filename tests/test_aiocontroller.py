@@ -0,0 +1,78 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+import aiocontroller
+from aiocontroller import AsyncGameOfLifeController
+from patterns import Pattern
+
+
+glider = Pattern(text="x = 3, y = 3\nbo$2bo$3o!", fmt='rle')
+
+
+class Keys:
+    """KeyboardHandler without a terminal, stdin is a pipe here"""
+    def __init__(self, use_thread=False, on_key=None):
+        pass
+
+    def start(self):
+        pass
+
+    def terminate(self):
+        pass
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    """Write end of a pipe that stands in for stdin"""
+    monkeypatch.setattr(aiocontroller, 'KeyboardHandler', Keys)
+    r, w = os.pipe()
+    monkeypatch.setattr(sys, 'stdin', os.fdopen(r))
+    yield w
+    sys.stdin.close()
+    os.close(w)
+
+
+def controller():
+    game = AsyncGameOfLifeController(rows=12, cols=20)
+    # a glider on a 12 x 20 torus comes back after 240 generations, no cycle before
+    game.setup_game(pattern=glider)
+    return game
+
+
+def test_runs_to_the_generation_limit(stdin, capsys):
+    game = controller()
+    asyncio.run(asyncio.wait_for(game.run(delay=0, gens=25, fps=1000), 5))
+    assert game.engine.generation == 25
+    assert game.frames_drawn >= 1
+    assert 'Gen 25' in capsys.readouterr().out
+
+
+def test_control_socket_and_stdin_keys(stdin, tmp_path):
+    game = controller()
+    path = str(tmp_path / 'control')
+
+    async def client():
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b' ')
+        paused = await reader.readline()
+        writer.write(b'x') # not a command, only the status comes back
+        still = await reader.readline()
+        os.write(stdin, b'q')
+        await reader.read() # the controller closes the connection on its way out
+        writer.close()
+        return paused.decode(), still.decode()
+
+    async def both():
+        return await asyncio.gather(game.run(delay=0.01, gens=0, control_socket=path), client())
+
+    _, (paused, still) = asyncio.run(asyncio.wait_for(both(), 5))
+    assert 'paused True' in paused and 'paused True' in still
+    generation = int(paused.split()[1])
+    # paused from the socket, quit from stdin, no generation in between
+    assert game.engine.generation == generation
+    assert not os.path.exists(path)
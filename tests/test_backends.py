@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+import batch
+from patterns import Pattern
+
+
+np = pytest.importorskip('numpy')
+import recorder # noqa: E402, needs numpy
+
+# engines wrapping the board around, the same seed gives the same soup
+torus = ['object', 'compact', 'tiles', 'numpy', 'parallel', 'block', 'block-numpy']
+# every engine running two state rules, unbounded ones included
+two_state = list(batch.backends) + [name for name in batch.engines if name != 'smoothlife']
+
+
+def make(name, rows, cols, rule='B3/S23'):
+    if name == 'compact':
+        return batch.make_engine(rows=rows, cols=cols, backend='object', compact=True, rule=rule)
+    if name == 'tiles':
+        return batch.make_engine(rows=rows, cols=cols, backend='object', tile_size=8, rule=rule)
+    return batch.make_engine(rows=rows, cols=cols, backend=name, rule=rule)
+
+
+def board(engine):
+    """Alive plane as a copy, the parallel backend's lives in shared memory"""
+    return np.array(recorder.board(engine)).astype(bool)
+
+
+def run(engine, gens, pattern=None):
+    try:
+        engine.initialize_grid(pattern)
+        for _ in range(gens):
+            engine.update_generation()
+        return board(engine)
+    finally:
+        engine.close()
+
+
+def soup(size, seed, density=0.35):
+    rng = random.Random(seed)
+    rows = [''.join('O' if rng.random() < density else '.' for _ in range(size)) for _ in range(size)]
+    return Pattern(text='\n'.join(rows) + '\n', fmt='cells')
+
+
+@pytest.mark.parametrize('name', torus)
+def test_same_seed_same_board(name):
+    engines = []
+    for backend in ('object', name):
+        engine = make(backend, 32, 40)
+        engine.seed = 11
+        engines.append(engine)
+    expected, got = (run(engine, 12) for engine in engines)
+    assert expected.any()
+    assert (got == expected).all()
+
+
+@pytest.mark.parametrize('name', two_state)
+@pytest.mark.parametrize('rule', ['B3/S23', 'B36/S23'])
+def test_pattern_away_from_the_edges(name, rule):
+    # 10 generations grow a 16 x 16 soup by 10 cells at most, the 48 x 48
+    # board never wraps it, so bounded and unbounded engines agree
+    pattern = soup(16, 3)
+    expected = run(make('object', 48, 48, rule), 10, pattern)
+    got = run(make(name, 48, 48, rule), 10, pattern)
+    assert expected.any()
+    assert (got == expected).all()
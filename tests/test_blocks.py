@@ -0,0 +1,63 @@
+import os
+import random
+
+import pytest
+
+import batch
+import blocks
+from rules import Rule
+
+
+def centre(index, rule):
+    """Next 2x2 centre of a 4x4 neighborhood index, cell by cell"""
+    cells = [[index >> blocks._bit(row, col) & 1 for col in range(4)] for row in range(4)]
+    value = 0
+    for k, (row, col) in enumerate((r, c) for r in (1, 2) for c in (1, 2)):
+        count = sum(cells[row + i][col + j] for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j)
+        value |= rule.next_state(cells[row][col], count) << (3 - k)
+    return value
+
+
+@pytest.mark.parametrize('text', ['B3/S23', 'B36/S23', 'B2/S'])
+def test_table_entries(text, tmp_path):
+    rule = Rule.parse(text)
+    data = blocks.table(rule, str(tmp_path))
+    for index in random.Random(0).sample(range(1 << 16), 2000):
+        assert data[index] == centre(index, rule)
+
+
+def test_table_cache(tmp_path):
+    directory = str(tmp_path / 'luts')
+    rule = Rule.parse('B34/S34')
+    built = blocks.table(rule, directory)
+    [name] = os.listdir(directory)
+    # a table cut short is built again and rewritten
+    with open(os.path.join(directory, name), 'wb') as f:
+        f.write(built[:100])
+    blocks.table.cache_clear()
+    assert blocks.table(rule, directory) == built
+    assert os.path.getsize(os.path.join(directory, name)) == 1 << 16
+
+
+@pytest.mark.parametrize('name', ['block', 'block-numpy'])
+@pytest.mark.parametrize('size', [(21, 27), (30, 34)])
+def test_immortal_cells_and_odd_sides(name, size):
+    if name == 'block-numpy':
+        pytest.importorskip('numpy')
+    rows, cols = size
+    boards = []
+    for backend in ('object', name):
+        engine = batch.make_engine('other', rows + rows % 2, cols + cols % 2, backend,
+                                   density=0.3, immortal=0.05)
+        engine.seed = 13
+        engine.initialize_grid()
+        for _ in range(9):
+            engine.update_generation()
+        boards.append(sorted((row, col) for row, col, _ in engine.live_points()))
+        engine.close()
+    assert boards[0] == boards[1]
+
+    # odd sides are padded with a dead row / column
+    engine = batch.make_engine('original', rows, cols, name)
+    engine.initialize_grid()
+    assert (engine.rows, engine.cols) == (rows + rows % 2, cols + cols % 2)
@@ -0,0 +1,99 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+import batch # noqa: E402
+import checkpoint # noqa: E402, needs numpy
+
+
+names = ['object', 'compact', 'tiles', 'numpy', 'parallel', 'generations']
+
+
+def make(name, rule=None):
+    kwargs = {'backend': name}
+    if name == 'compact':
+        kwargs = {'backend': 'object', 'compact': True}
+    elif name == 'tiles':
+        kwargs = {'backend': 'object', 'tile_size': 8}
+    if name == 'generations':
+        rule = rule or 'starwars'
+    return batch.make_engine('other', 24, 32, rule=rule, **kwargs)
+
+
+def planes(engine):
+    """Copies of the checkpointed planes, ages as int64"""
+    return {name: np.array(plane, dtype=np.int64) for name, plane in checkpoint._get_planes(engine).items()}
+
+
+@pytest.mark.parametrize('name', names)
+def test_resume_carries_on_the_same(name, tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    engine, resumed = make(name), make(name)
+    try:
+        engine.seed = 9
+        engine.initialize_grid()
+        for _ in range(6):
+            engine.update_generation()
+        checkpoint.save(engine, path)
+        header = checkpoint.restore(resumed, path)
+        assert (header.generation, header.seed) == (6, 9)
+        assert (resumed.rows, resumed.cols, resumed.generation) == (24, 32, 6)
+
+        for _ in range(5):
+            engine.update_generation()
+            resumed.update_generation()
+        expected, got = planes(engine), planes(resumed)
+        assert expected.keys() == got.keys()
+        for plane in expected:
+            assert (got[plane] == expected[plane]).all(), plane
+        assert resumed.generation == 11
+    finally:
+        engine.close()
+        resumed.close()
+
+
+@pytest.mark.parametrize('name', ['compact', 'numpy']) # Generations ages saturate at 255 by design
+def test_old_cells_keep_their_age(name, tmp_path):
+    path = str(tmp_path / 'old.ckpt')
+    engine, resumed = make(name), make(name)
+    try:
+        engine.initialize_grid()
+        age = checkpoint._get_planes(engine)['age']
+        age[:] = 70000 # past uint16, version 1 files clamped it
+        age[0, 0] = 1 << 20
+        checkpoint.save(engine, path)
+        checkpoint.restore(resumed, path)
+        got = checkpoint._get_planes(resumed)['age']
+        assert got[0, 0] == 1 << 20
+        assert (got.ravel()[1:] == 70000).all()
+    finally:
+        engine.close()
+        resumed.close()
+
+
+def test_header_and_mismatches(tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    engine = make('numpy', 'B36/S23')
+    try:
+        engine.initialize_grid()
+        checkpoint.save(engine, path)
+    finally:
+        engine.close()
+    header = checkpoint.read_header(path)
+    assert (header.rows, header.cols, header.rule, header.version) == (24, 32, 'B36/S23', checkpoint.VERSION)
+
+    with pytest.raises(ValueError):
+        checkpoint.restore(make('numpy'), path) # B3/S23
+    with pytest.raises(ValueError):
+        checkpoint.restore(make('generations'), path)
+
+    with open(path, 'r+b') as f:
+        f.truncate(1024)
+    with pytest.raises(ValueError):
+        checkpoint.restore(make('numpy', 'B36/S23'), path)
+
+
+def test_unbounded_engines_refuse(tmp_path):
+    engine = batch.make_engine(rows=16, cols=16, backend='sparse')
+    engine.initialize_grid()
+    with pytest.raises(TypeError):
+        checkpoint.save(engine, str(tmp_path / 'run.ckpt'))
@@ -0,0 +1,82 @@
+import time
+import threading
+
+import main
+from main import GameOfLifeController
+from patterns import Pattern
+
+
+glider = Pattern(text="x = 3, y = 3\nbo$2bo$3o!", fmt='rle')
+
+
+class Keys:
+    """KeyboardHandler without a terminal, keys are sent with on_key"""
+    def __init__(self, use_thread=False, on_key=None):
+        self.on_key = on_key
+
+    def start(self):
+        pass
+
+    def terminate(self):
+        pass
+
+
+def controller():
+    game = GameOfLifeController(rows=12, cols=20)
+    # a glider on a 12 x 20 torus comes back after 240 generations, no cycle before
+    game.setup_game(pattern=glider)
+    return game
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.005)
+
+
+def test_every_generation_drawn_or_counted_dropped(monkeypatch, capsys):
+    monkeypatch.setattr(main, 'KeyboardHandler', Keys)
+    game = controller()
+    game.start_decoupled(delay=0, gens=30, fps=1000)
+    assert game.engine.generation == 30
+    assert game._snapshot['generation'] == 30
+    assert game.frames_drawn >= 2
+    assert game.frames_drawn + game.frames_dropped == 31
+    assert 'Gen 30' in capsys.readouterr().out
+
+
+def test_keys_pause_and_quit_the_simulation_thread():
+    game = controller()
+    game.engine.tsleep = 10 # only keys wake it
+    simulation = threading.Thread(target=game._simulate, args=(0,), daemon=True)
+    simulation.start()
+    try:
+        wait_for(lambda: game.engine.generation >= 1)
+        game._on_key('+') # cuts the 10 s sleep short
+        wait_for(lambda: game.engine.generation >= 2)
+        game._on_key(' ')
+        assert game.engine.paused
+        time.sleep(0.05)
+        generation = game.engine.generation
+        time.sleep(0.05)
+        assert game.engine.generation == generation
+
+        # a snapshot asked for while paused is published on the next wake,
+        # and it stays as it was while the board moves on
+        game._want_frame.set()
+        game._wake.set()
+        wait_for(lambda: not game._want_frame.is_set())
+        snapshot = game._snapshot
+        assert snapshot['generation'] == generation
+        live = sorted((row, col) for row, col, _ in game.engine.live_points())
+        game._on_key(' ')
+        wait_for(lambda: game.engine.generation > generation)
+        game._on_key(' ')
+        drawn = [(row, col) for row, line in enumerate(snapshot['grid']) for col, cell in enumerate(line) if cell.is_alive]
+        assert drawn == live
+    finally:
+        game._on_key('q')
+        simulation.join(timeout=5)
+    assert not simulation.is_alive()
+    game.close()
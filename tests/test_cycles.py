@@ -0,0 +1,108 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+import batch
+import main2
+from cycles import Cycle, CycleDetector
+from patterns import Pattern
+
+
+_numpy = {'numpy', 'parallel', 'generations', 'block-numpy'}
+names = list(batch.backends) + [name for name in batch.engines if name != 'smoothlife'] + ['list', 'bits']
+
+shapes = {
+    'blinker': ("x = 3, y = 1\n3o!", Cycle('oscillator', 2, 0)),
+    'block': ("x = 2, y = 2\n2o$2o!", Cycle('still', 1, 0)),
+    'lone cell': ("x = 1, y = 1\no!", Cycle('extinct', 1, 1)),
+}
+
+
+def make(name):
+    if name in _numpy:
+        pytest.importorskip('numpy')
+    with contextlib.redirect_stdout(io.StringIO()):
+        if name == 'list':
+            return main2.GameOfLifeEngine(rows=16, cols=16)
+        if name == 'bits':
+            return main2.BitPackedEngine(rows=16, cols=16)
+        return batch.make_engine(rows=16, cols=16, backend=name, rule='B3/S23')
+
+
+@pytest.mark.parametrize('shape', list(shapes))
+@pytest.mark.parametrize('name', names)
+def test_cycle_found(name, shape):
+    text, expected = shapes[shape]
+    engine = make(name)
+    try:
+        engine.initialize_grid(Pattern(text=text, fmt='rle'))
+        for _ in range(4):
+            engine.update_generation()
+        assert engine.cycle == expected
+        assert not engine.is_active()
+    finally:
+        getattr(engine, 'close', lambda: None)()
+
+
+@pytest.mark.parametrize('name', names)
+def test_glider_keeps_going(name):
+    # 4 * 16 generations bring a glider back on a 16 x 16 torus, less must not
+    engine = make(name)
+    try:
+        engine.initialize_grid(Pattern(text="x = 3, y = 3\nbo$2bo$3o!", fmt='rle'))
+        for _ in range(40):
+            engine.update_generation()
+        assert engine.cycle is None
+        assert engine.is_active()
+    finally:
+        getattr(engine, 'close', lambda: None)()
+
+
+def test_detector_history():
+    detector = CycleDetector(history=2)
+    for generation, key in enumerate([5, 6, 7]):
+        assert detector.record(generation, key) is None
+    # 5 fell out of the history, its return goes unnoticed
+    assert detector.record(3, 5) is None
+    assert detector.record(4, 7) == Cycle('oscillator', 2, 2)
+    assert detector.record(5, 0) == Cycle('oscillator', 2, 2)
+
+
+def test_packed_board_moved_61_cells_is_no_cycle():
+    # a glider travelling past a block: hash() of the board int repeats
+    # every 61 bits, it used to report Period 244 here
+    cells = [(2, 3), (3, 4), (4, 2), (4, 3), (4, 4), (97, 97), (97, 98), (98, 97), (98, 98)]
+    pattern = [[int((row, col) in cells) for col in range(100)] for row in range(100)]
+    engines = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        # tiles keep the list engine on the glider's corner of the board
+        for engine in (main2.GameOfLifeEngine(rows=100, cols=100, tile_size=10),
+                       main2.BitPackedEngine(rows=100, cols=100)):
+            engine.initialize_grid(pattern)
+            engines.append(engine)
+    listed, packed = engines
+    for _ in range(250):
+        listed.update_generation()
+        packed.update_generation()
+    assert listed.cycle is None
+    assert packed.cycle is None
+
+
+@pytest.mark.parametrize('tile_size', [None, 8])
+def test_packed_hash_follows_the_list_engine(tile_size):
+    # both XOR the same keys, the packed engine only over the changed bits
+    rng = random.Random(6)
+    pattern = [[int(rng.random() < 0.3) for _ in range(40)] for _ in range(24)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        listed = main2.GameOfLifeEngine(rows=24, cols=40, tile_size=tile_size)
+        packed = main2.BitPackedEngine(rows=24, cols=40)
+    listed.initialize_grid(pattern)
+    packed.initialize_grid(pattern)
+    for _ in range(60):
+        assert packed.hash == listed.hash
+        listed.update_generation()
+        packed.update_generation()
+    assert packed.hash == packed._hash_board() == listed.hash
+    assert packed.cycle == listed.cycle
@@ -0,0 +1,83 @@
+import io
+import re
+import contextlib
+
+import batch
+from engine import GameOfLifeDisplay, GameOfLifeDiffDisplay
+from patterns import Pattern
+
+
+_escape = re.compile(r'\033\[([0-9;]*)([A-Za-z])')
+
+
+class Screen:
+    """Just enough of a terminal: cursor moves, colors, and text"""
+    def __init__(self):
+        self.cells = {} # (line, column) -> (color, char), 1 based like the terminal
+        self.line = self.column = 1
+        self.color = ''
+
+    def feed(self, data):
+        pos = 0
+        for match in _escape.finditer(data):
+            self._text(data[pos:match.start()])
+            args, command = match.groups()
+            if command == 'H':
+                self.line, self.column = (int(n) for n in args.split(';')) if args else (1, 1)
+            elif command == 'm':
+                self.color = '' if args in ('', '0') else match.group()
+            pos = match.end()
+        self._text(data[pos:])
+
+    def _text(self, text):
+        for char in text:
+            if char == '\n':
+                self.line, self.column = self.line + 1, 1
+            else:
+                self.cells[(self.line, self.column)] = (self.color, char)
+                self.column += 1
+
+    def board(self, rows, cols):
+        """(color, char) of every cell, each cell is 2 columns wide below the status line"""
+        return [[self.cells.get((row + 2, col * 2 + 1)) for col in range(cols)] for row in range(rows)]
+
+
+def render(display, state):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        display.print_grid(state)
+    return out.getvalue()
+
+
+def test_diff_display_shows_what_a_full_redraw_shows():
+    engine = batch.make_engine('other', 14, 22, 'object')
+    engine.seed = 8
+    engine.initialize_grid()
+    full, diff = GameOfLifeDisplay(), GameOfLifeDiffDisplay()
+    screen = Screen()
+    sizes = []
+    for _ in range(12):
+        state = engine.get_grid_state()
+        expected = Screen()
+        expected.feed(render(full, state))
+        data = render(diff, state)
+        screen.feed(data)
+        assert screen.board(14, 22) == expected.board(14, 22)
+        sizes.append((len(render(GameOfLifeDisplay(), state).encode()), diff.last_frame_bytes))
+        engine.update_generation()
+    assert diff.last_frame_bytes == len(data.encode())
+    # after the first frame only changes go out
+    assert all(changed < whole for whole, changed in sizes[1:])
+
+
+def test_unchanged_frame_writes_no_cells():
+    engine = batch.make_engine('original', 10, 20, 'object')
+    engine.initialize_grid(Pattern(text="x = 2, y = 2\n2o$2o!", fmt='rle'))
+    diff = GameOfLifeDiffDisplay()
+    state = engine.get_grid_state()
+    render(diff, state)
+    data = render(diff, state)
+    # the cursor home, the status line and the reset, no cell moves
+    assert not re.search(r'\033\[\d+;\d+H', data)
+    diff.invalidate()
+    assert len(re.findall(r'\033\[\d+;\d+H', render(diff, state))) == 10
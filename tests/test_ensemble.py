@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+import batch # noqa: E402
+import recorder # noqa: E402, needs numpy
+from ensemble import EnsembleEngine # noqa: E402, needs numpy
+
+
+def test_every_board_runs_as_a_numpy_engine():
+    singles = []
+    for seed in range(6):
+        engine = batch.make_engine('original', 16, 20, 'numpy', density=0.3)
+        engine.seed = seed
+        engine.initialize_grid()
+        singles.append(engine)
+    ensemble = EnsembleEngine(len(singles), history=256)
+    ensemble.initialize_grid(np.array([recorder.board(engine) for engine in singles]))
+    assert (ensemble.rows, ensemble.cols) == (16, 20)
+    for _ in range(150):
+        ensemble.update_generation()
+        for k, engine in enumerate(singles):
+            engine.update_generation()
+            assert (ensemble.alive[k] == recorder.board(engine)).all(), (k, engine.generation)
+
+    results = ensemble.results()
+    assert list(results['population']) == [engine.population() for engine in singles]
+    for k, engine in enumerate(singles):
+        cycle = engine.cycle
+        if cycle is None:
+            assert results['outcome'][k] == 'running'
+        else:
+            assert (results['outcome'][k], results['period'][k], results['cycle_start'][k]) == \
+                (cycle.kind, cycle.period, cycle.start)
+        engine.close()
+
+
+def test_seed_fixes_the_boards():
+    first = batch.run_ensemble(4, 8, rows=12, cols=12, gens=40, densities=(0.1, 0.4))
+    second = batch.run_ensemble(4, 8, rows=12, cols=12, gens=40, densities=(0.1, 0.4))
+    assert first['density'] == [0.1] * 4 + [0.4] * 4
+    for name in ('generations', 'population', 'outcome', 'extinct_at', 'cycle_start', 'period'):
+        assert first[name] == second[name]
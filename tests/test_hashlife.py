@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import batch
+from hashlife import HashLifeEngine
+
+
+def _soup(size, seed):
+    rng = random.Random(seed)
+    return [[rng.random() < 0.3 for _ in range(size)] for _ in range(size)]
+
+
+def test_small_cache_same_result():
+    grid = _soup(32, 1)
+    free = HashLifeEngine(rows=32, cols=32)
+    free.initialize_grid(grid)
+    free.step(256)
+    tight = HashLifeEngine(rows=32, cols=32, max_nodes=4000)
+    tight.initialize_grid(grid)
+    tight.step(256)
+    assert tight.collections > 0
+    assert (tight.hash, tight.population()) == (free.hash, free.population())
+
+
+def test_cache_bounded_inside_a_jump():
+    tight = HashLifeEngine(rows=32, cols=32, max_nodes=4000)
+    tight.initialize_grid(_soup(32, 2))
+    peak = 0
+    successor = tight._successor
+
+    def counted(m, j):
+        nonlocal peak
+        peak = max(peak, len(tight._nodes) + len(tight._memo))
+        return successor(m, j)
+
+    tight._successor = counted
+    tight.step(1 << 8)
+    # a successor call adds a handful of nodes past the check, and a
+    # collection keeps the root's nodes
+    assert peak < 2 * tight.max_nodes
+
+
+def test_cli_refuses_other_mode(capsys):
+    with pytest.raises(SystemExit) as exit:
+        batch.main(['--backend', 'hashlife', '--mode', 'other', '--gens', '1'])
+    assert exit.value.code == 2
+    assert 'hashlife only runs --mode original' in capsys.readouterr().err
@@ -0,0 +1,103 @@
+import io
+
+import pytest
+
+import batch
+import patterns
+from patterns import Pattern
+
+
+def live(cells):
+    """Cells as a set, moved so the bounding box starts at 0, 0"""
+    cells = list(cells)
+    if not cells:
+        return set()
+    top = min(row for row, _, _ in cells)
+    left = min(col for _, col, _ in cells)
+    return {(row - top, col - left, state) for row, col, state in cells}
+
+
+@pytest.fixture
+def engine():
+    engine = batch.make_engine(rows=24, cols=30, backend='object')
+    engine.seed = 4
+    engine.initialize_grid()
+    for _ in range(5):
+        engine.update_generation()
+    yield engine
+    engine.close()
+
+
+@pytest.mark.parametrize('ext', ['.rle', '.cells', '.lif'])
+def test_save_load_round_trip(engine, ext, tmp_path):
+    path = str(tmp_path / ('board' + ext))
+    patterns.save(engine, path)
+    pattern = patterns.load(path)
+    assert live(pattern.cells()) == live(engine.live_points())
+    # coords() is the same cells in bulk
+    rows, cols, states = pattern.coords()
+    assert set(zip(rows, cols, states)) == set(pattern.cells())
+
+
+@pytest.mark.parametrize('ext', ['.rle', '.cells', '.lif'])
+def test_load_into_engine_and_save_again(engine, ext, tmp_path):
+    first, second = str(tmp_path / ('first' + ext)), str(tmp_path / ('second' + ext))
+    patterns.save(engine, first)
+    copy = batch.make_engine(rows=8, cols=8, backend='object')
+    try:
+        copy.initialize_grid(patterns.load(first)) # the board grows to fit
+        patterns.save(copy, second)
+    finally:
+        copy.close()
+    if ext == '.lif':
+        # Life 1.06 keeps board coordinates, the copy sits elsewhere
+        assert live(patterns.load(second).cells()) == live(patterns.load(first).cells())
+    else:
+        with open(first) as f, open(second) as g:
+            assert f.read() == g.read()
+
+
+def test_rle_reader_details():
+    text = (
+        "#N glider\n"
+        "#C comment lines before the header\n"
+        "x = 3, y = 3, rule = B3/S23\n"
+        "b\n"
+        "o$2bo$3\n" # run count split over two lines
+        "o!\n"
+        "ignored after the end\n"
+    )
+    pattern = Pattern(text=text, fmt='rle')
+    assert (pattern.rows, pattern.cols, pattern.rule) == (3, 3, 'B3/S23')
+    assert set(pattern.cells()) == {(0, 1, 1), (1, 2, 1), (2, 0, 1), (2, 1, 1), (2, 2, 1)}
+
+
+def test_rle_generations_states():
+    # states past 24 take two letter tags, pA and on
+    cells = [(0, 0, 1), (0, 1, 2), (0, 3, 24), (1, 0, 25), (1, 1, 60), (2, 2, 255)]
+    f = io.StringIO()
+    patterns.write_rle(f, iter(cells), 3, 4, rule='B2/S/C256', states=256)
+    pattern = Pattern(text=f.getvalue(), fmt='rle')
+    assert pattern.rule == 'B2/S/C256'
+    assert list(pattern.cells()) == cells
+
+
+def test_long_rle_lines_wrap():
+    cells = [(0, col, 1) for col in range(0, 400, 2)]
+    f = io.StringIO()
+    patterns.write_rle(f, iter(cells), 1, 399)
+    assert max(len(line) for line in f.getvalue().splitlines()) <= 70
+    assert list(Pattern(text=f.getvalue(), fmt='rle').cells()) == cells
+
+
+def test_life106_keeps_negative_coordinates():
+    pattern = Pattern(text="#Life 1.06\n-1 -2\n0 -2\n1 0\n", fmt='life106')
+    assert (pattern.rows, pattern.cols) == (3, 3)
+    assert set(pattern.cells()) == {(0, 0, 1), (0, 1, 1), (2, 2, 1)}
+
+
+def test_plaintext_rejects_states(tmp_path):
+    with pytest.raises(ValueError):
+        patterns.write_cells(io.StringIO(), iter([(0, 0, 2)]))
+    with pytest.raises(ValueError):
+        patterns.load(str(tmp_path / 'board.txt'))
@@ -0,0 +1,41 @@
+import io
+import csv
+import contextlib
+
+import pytest
+
+import batch
+import profiler
+from engine import GameOfLifeDisplay, GameOfLifeDiffDisplay
+
+
+# backends and engines that import numpy
+_numpy = {'numpy', 'parallel', 'generations', 'smoothlife', 'block-numpy'}
+
+
+@pytest.mark.parametrize('backend', list(batch.backends) + list(batch.engines))
+def test_profile_every_backend(backend, tmp_path):
+    if backend in _numpy:
+        pytest.importorskip('numpy')
+    path = str(tmp_path / 'profile.csv')
+    summary = batch.run(7, rows=32, cols=32, gens=4, backend=backend, stop=False, profile=path)
+    assert summary['profile']['generations'] == 4
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row['generation']) for row in rows] == [1, 2, 3, 4]
+    assert list(rows[0]) == list(profiler.columns)
+
+
+@pytest.mark.parametrize('diff', [False, True])
+def test_frame_bytes_are_the_bytes_written(diff):
+    engine = batch.make_engine(rows=12, cols=20)
+    engine.seed = 1
+    engine.initialize_grid()
+    display = GameOfLifeDiffDisplay() if diff else GameOfLifeDisplay()
+    prof = profiler.Profiler()
+    prof.attach(engine, display)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        display.print_grid(engine.get_grid_state())
+    # as bench.py counts frame_bytes
+    assert prof._frame_bytes == len(out.getvalue().encode())
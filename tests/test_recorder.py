@@ -0,0 +1,71 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+import batch # noqa: E402
+import recorder # noqa: E402, needs numpy
+from recorder import Recorder, Recording # noqa: E402
+
+
+def record(path, backend='numpy', gens=30, rule=None, **kwargs):
+    """Boards of a run, recorded to path on the way"""
+    engine = batch.make_engine('other', 20, 28, backend, rule=rule)
+    engine.seed = 2
+    boards = []
+    try:
+        with Recorder(path, **kwargs) as rec:
+            engine.initialize_grid()
+            rec.attach(engine)
+            boards.append(np.array(recorder.board(engine)))
+            for _ in range(gens):
+                engine.update_generation()
+                boards.append(np.array(recorder.board(engine)))
+    finally:
+        engine.close()
+    return boards
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma'])
+@pytest.mark.parametrize('backend', ['object', 'numpy', 'generations'])
+def test_every_frame_reads_back(backend, compression, tmp_path):
+    path = str(tmp_path / 'run.rec')
+    boards = record(path, backend, keyframe_every=8, compression=compression)
+    with Recording(path, cache_size=4) as rec:
+        assert len(rec) == len(boards)
+        assert list(rec.generations) == list(range(len(boards)))
+        assert rec.multistate == (backend == 'generations')
+        for (generation, board), expected in zip(rec, boards):
+            assert (board == expected).all(), generation
+
+
+def test_random_access_and_backwards(tmp_path):
+    path = str(tmp_path / 'run.rec')
+    boards = record(path, gens=50, keyframe_every=16)
+    with Recording(path, cache_size=3) as rec:
+        for generation in (37, 3, 50, 16, 15, 0):
+            assert (rec.frame(generation) == boards[generation]).all()
+        backwards = list(rec.frames(start=50, step=-7))
+        assert [generation for generation, _ in backwards] == list(range(50, -1, -7))
+        for generation, board in backwards:
+            assert (board == boards[generation]).all()
+        with pytest.raises(KeyError):
+            rec.frame(51)
+
+
+def test_recording_without_index(tmp_path):
+    # a writer that died leaves the records but no index, they are scanned
+    path = str(tmp_path / 'run.rec')
+    boards = record(path, gens=20, keyframe_every=4)
+    with open(path, 'r+b') as f:
+        f.truncate(f.seek(0, 2) - 10)
+    with Recording(path) as rec:
+        assert len(rec) == len(boards)
+        assert (rec.board(len(rec) - 1) == boards[-1]).all()
+
+
+def test_delta_round_trip():
+    rng = np.random.default_rng(1)
+    previous = rng.integers(0, 256, 4096, dtype=np.uint8)
+    frame = previous.copy()
+    frame[[3, 4, 5, 100, 2000, 4095]] ^= 0x5A
+    assert (recorder.apply_delta(previous, recorder.encode_delta(previous, frame)) == frame).all()
+    assert (recorder.apply_delta(previous, recorder.encode_delta(previous, previous)) == previous).all()
@@ -0,0 +1,98 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+import batch # noqa: E402
+import recorder # noqa: E402, needs numpy
+from main import GameOfLifeController # noqa: E402
+from recorder import Recorder # noqa: E402, needs numpy
+from replay import ReplayEngine, rates # noqa: E402, needs numpy
+
+
+def record(path, gens=40):
+    """Boards of a numpy run, recorded to path with a keyframe every 8 records"""
+    engine = batch.make_engine('original', 18, 24, 'numpy')
+    engine.seed = 6
+    boards = []
+    try:
+        with Recorder(path, keyframe_every=8) as rec:
+            engine.initialize_grid()
+            rec.attach(engine)
+            boards.append(np.array(recorder.board(engine)))
+            for _ in range(gens):
+                engine.update_generation()
+                boards.append(np.array(recorder.board(engine)))
+    finally:
+        engine.close()
+    return boards
+
+
+def shown(engine):
+    return np.array(engine.get_grid_state()['grid'])
+
+
+def test_seek_and_step_round_trip(tmp_path):
+    path = str(tmp_path / 'run.rec')
+    boards = record(path)
+    engine = ReplayEngine(path, cache_size=3)
+    try:
+        for position in (33, 2, 40, 17, 16, 0):
+            engine.seek(position)
+            assert engine.generation == position
+            assert (shown(engine) == boards[position]).all()
+        engine.seek(20)
+        for _ in range(5):
+            engine.step(-3)
+        assert engine.position == 5
+        assert (shown(engine) == boards[5]).all()
+        # seeks are clamped, a step onto either end pauses
+        engine.seek(-4)
+        assert engine.position == 0
+        engine.seek(38)
+        engine.step(4)
+        assert (engine.position, engine.paused) == (40, True)
+        # playing from the end starts over
+        engine.toggle_pause()
+        assert (engine.position, engine.paused) == (0, False)
+    finally:
+        engine.close()
+
+
+def test_rates_run_out_at_both_ends(tmp_path):
+    path = str(tmp_path / 'run.rec')
+    record(path, gens=4)
+    engine = ReplayEngine(path)
+    try:
+        for _ in range(len(rates)):
+            engine.faster()
+        assert engine.rate == rates[-1]
+        for _ in range(len(rates)):
+            engine.slower()
+        assert engine.rate == rates[0] < 0
+    finally:
+        engine.close()
+
+
+def test_controller_replay_keys(tmp_path):
+    path = str(tmp_path / 'run.rec')
+    boards = record(path, gens=45)
+    controller = GameOfLifeController(replay=path, cache_size=4)
+    engine = controller.engine
+    try:
+        assert controller._replay_key('9') and engine.position == 45
+        assert controller._replay_key('3') and engine.position == 15
+        engine.toggle_pause()
+        assert controller._replay_key('+') and engine.position == 16
+        assert controller._replay_key('-') and controller._replay_key('-') and engine.position == 14
+        assert (shown(engine) == boards[14]).all()
+        # while playing + and - change the rate instead
+        engine.toggle_pause()
+        controller._replay_key('+')
+        assert engine.rate == 2
+        controller._replay_key('-')
+        controller._replay_key('-')
+        assert engine.rate == -1
+        engine.update_generation()
+        assert engine.position == 13
+        assert not controller._replay_key('x')
+    finally:
+        controller.close()
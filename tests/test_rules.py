@@ -0,0 +1,38 @@
+import pytest
+
+import rules
+from rules import Rule, GenerationsRule, SmoothRule, get_rule
+
+
+@pytest.mark.parametrize('text', ['B3/S23', 'B36/S23', 'B2/S', 'B/S012345678', 'B3678/S34678'])
+def test_rulestring_round_trip(text):
+    assert str(Rule.parse(text)) == text
+    assert Rule.parse(str(Rule.parse(text))) == Rule.parse(text)
+
+
+def test_sb_form_and_case():
+    assert Rule.parse('23/36') == Rule.parse('b36/s23')
+
+
+@pytest.mark.parametrize('text', ['B9/S23', 'B3S23', 'life', ''])
+def test_bad_rulestrings(text):
+    with pytest.raises(ValueError):
+        Rule.parse(text)
+
+
+def test_table_matches_birth_and_survival():
+    rule = Rule.parse('B36/S23')
+    for n in range(9):
+        assert rule.next_state(False, n) == (n in (3, 6))
+        assert rule.next_state(True, n) == (n in (2, 3))
+
+
+def test_get_rule_names_and_families():
+    assert get_rule(None) is rules.CONWAY
+    assert get_rule('HighLife') == Rule.parse('B36/S23')
+    brain = get_rule('brianbrain')
+    assert isinstance(brain, GenerationsRule) and brain.states == 3
+    assert str(get_rule('/2/3')) == 'B2/S/C3'
+    assert isinstance(get_rule('smoothlife'), SmoothRule)
+    # a plain rule widened to Generations keeps its table
+    assert GenerationsRule.parse(rules.CONWAY).table == rules.CONWAY.table
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+import batch
+import main2
+import seeding
+
+
+def rows_plane(seed, rows, cols, density, immortal=0.0):
+    alive, immortals = [], []
+    for a, i in seeding.rows(seed, cols, density, immortal, 0, rows):
+        alive.append(list(a))
+        immortals.append(list(i))
+    return alive, immortals
+
+
+def test_same_seed_same_rows():
+    assert rows_plane(5, 10, 33, 0.3, 0.1) == rows_plane(5, 10, 33, 0.3, 0.1)
+    assert rows_plane(5, 10, 33, 0.3) != rows_plane(6, 10, 33, 0.3)
+
+
+def test_any_range_of_rows():
+    whole, _ = rows_plane(8, 12, 20, 0.5)
+    # drawn on their own and out of order, rows are the same rows
+    for start, stop in ((7, 12), (0, 3), (3, 7)):
+        band = [list(a) for a, _ in seeding.rows(8, 20, 0.5, 0.0, start, stop)]
+        assert band == whole[start:stop]
+
+
+def test_density_edges():
+    alive, _ = rows_plane(1, 4, 50, 0.0)
+    assert not any(map(any, alive))
+    alive, _ = rows_plane(1, 4, 50, 1.0)
+    assert all(map(all, alive))
+    with pytest.raises(ValueError):
+        seeding.threshold(1.5)
+
+
+@pytest.mark.parametrize('band', [1, 5, 64])
+@pytest.mark.parametrize('workers', [1, 3])
+def test_planes_match_rows(band, workers):
+    np = pytest.importorskip('numpy')
+    alive, immortal = seeding.planes(21, 40, 37, 0.25, 0.05, workers=workers, band=band)
+    expected_alive, expected_immortal = rows_plane(21, 40, 37, 0.25, 0.05)
+    assert (alive == np.array(expected_alive, dtype=bool)).all()
+    assert (immortal == np.array(expected_immortal, dtype=bool)).all()
+
+
+def test_global_rng_fixes_the_seed():
+    boards = []
+    for _ in range(2):
+        random.seed(1234)
+        engine = batch.make_engine(rows=16, cols=16, backend='object')
+        engine.initialize_grid()
+        boards.append((engine.seed, sorted(engine.live_points())))
+        engine.close()
+    assert boards[0] == boards[1]
+
+
+@pytest.mark.parametrize('name', ['numpy', 'parallel', 'generations', 'block-numpy'])
+def test_engines_draw_the_same_soup(name):
+    pytest.importorskip('numpy')
+    soups = []
+    for backend in ('object', name):
+        engine = batch.make_engine('other', 18, 26, backend, rule='B3/S23', density=0.3, immortal=0.05)
+        engine.seed = 77
+        engine.initialize_grid()
+        soups.append(sorted((row, col) for row, col, _ in engine.live_points()))
+        engine.close()
+    assert soups[0] and soups[0] == soups[1]
+
+
+@pytest.mark.parametrize('name', ['list', 'bits'])
+@pytest.mark.parametrize('density', [1 / 8, 0.4])
+def test_main2_engines_draw_the_same_soup(name, density):
+    cls = main2.GameOfLifeEngine if name == 'list' else main2.BitPackedEngine
+    engine = cls(rows=18, cols=37)
+    engine.seed, engine.density = 31, density
+    engine.initialize_grid()
+    reference = batch.make_engine(rows=18, cols=37, backend='object', density=density)
+    reference.seed = 31
+    reference.initialize_grid()
+    expected = sorted(reference.live_points())
+    reference.close()
+    assert expected and sorted(engine.live_points()) == expected
@@ -0,0 +1,57 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+import batch # noqa: E402
+from rules import SmoothRule # noqa: E402
+import smoothlife # noqa: E402, needs numpy
+
+
+def fillings(state, radius):
+    """Disk and annulus fillings summed cell by cell, what the FFTs stand in for"""
+    rows, cols = state.shape
+    dr = np.minimum(np.arange(rows), rows - np.arange(rows))
+    dc = np.minimum(np.arange(cols), cols - np.arange(cols))
+    d = np.hypot(dr[:, None], dc[None, :])
+    disk = np.clip(radius / 3 + 0.5 - d, 0, 1)
+    annulus = np.clip(radius + 0.5 - d, 0, 1) - disk
+    m, n = np.zeros_like(state, dtype=float), np.zeros_like(state, dtype=float)
+    for dy in range(rows):
+        for dx in range(cols):
+            if disk[dy, dx] or annulus[dy, dx]:
+                shifted = np.roll(state, (dy, dx), axis=(0, 1))
+                m += disk[dy, dx] * shifted
+                n += annulus[dy, dx] * shifted
+    return m / disk.sum(), n / annulus.sum()
+
+
+@pytest.mark.parametrize('rule', ['R6/B.278-.365/D.267-.445', 'R4/B.257-.336/D.365-.549/T.1'])
+def test_generation_matches_direct_sums(rule):
+    engine = batch.make_engine(rows=20, cols=26, backend='smoothlife', rule=rule)
+    engine.seed = 3
+    engine.initialize_grid()
+    rule = engine.rule
+    for _ in range(3):
+        before = engine.state.astype(float)
+        engine.update_generation()
+        m, n = fillings(before, rule.radius)
+        s = smoothlife.transition(n, m, rule)
+        expected = np.clip(before + rule.dt * (2 * s - 1), 0, 1) if rule.dt else s
+        assert np.allclose(engine.state, expected, atol=1e-4)
+    assert engine.generation == 3
+
+
+def test_empty_board_is_extinct():
+    engine = batch.make_engine(rows=16, cols=16, backend='smoothlife')
+    engine.initialize_grid([[0.0] * 16 for _ in range(16)])
+    engine.update_generation()
+    assert engine.population() == 0 and engine.mass() < 1e-6
+    assert engine.cycle is not None and engine.cycle.kind == 'extinct'
+
+
+def test_rule_round_trip_and_small_boards():
+    rule = SmoothRule.parse('r10/b.257-.336/d.365-.549/t.1')
+    assert str(rule) == 'R10/B.257-.336/D.365-.549/T.1'
+    assert SmoothRule.parse(str(rule)) == rule
+    engine = batch.make_engine(rows=12, cols=40, backend='smoothlife')
+    with pytest.raises(ValueError):
+        engine.initialize_grid()
@@ -0,0 +1,52 @@
+import pytest
+
+import batch
+from cell import ImmortalCell, StandardCell
+from patterns import Pattern
+
+
+glider = "x = 3, y = 3\nbo$2bo$3o!"
+
+
+def make(**kwargs):
+    return batch.make_engine(rows=16, cols=16, backend='sparse', **kwargs)
+
+
+def test_glider_leaves_the_viewport_and_keeps_going():
+    engine = make()
+    engine.initialize_grid(Pattern(text=glider, fmt='rle'))
+    start = engine.bounds()
+    shape = {(row - start[0], col - start[1]) for row, col in engine.live}
+    for _ in range(400):
+        engine.update_generation()
+    # a glider moves one cell down and right every 4 generations, no wrapping
+    top, left, bottom, right = engine.bounds()
+    assert (top - start[0], left - start[1]) == (100, 100)
+    assert {(row - top, col - left) for row, col in engine.live} == shape
+    assert engine.population() == 5
+    assert engine.cycle is None
+    # it is far outside the 16 x 16 viewport until the viewport follows it
+    assert not any(map(any, engine.to_grid()))
+    engine.center_viewport()
+    assert sum(map(sum, engine.to_grid())) == 5
+
+
+def test_ages_and_immortal_cells():
+    dead = StandardCell(is_alive=False)
+    grid = [[dead] * 6 for _ in range(6)]
+    grid[1] = [dead, ImmortalCell(is_alive=True), dead, dead, dead, dead] # alone, would die
+    grid[4] = [dead, dead, StandardCell(is_alive=True), StandardCell(is_alive=True), dead, dead]
+    grid[5] = [dead, dead, StandardCell(is_alive=True), StandardCell(is_alive=True), dead, dead]
+    engine = make(mode='other')
+    engine.initialize_grid(grid)
+    for _ in range(3):
+        engine.update_generation()
+    assert (1, 1) in engine.live
+    assert engine.ages[(1, 1)] == 3
+    assert engine.ages[(4, 2)] == 3 # the block is a still life
+    assert engine.population() == 5
+
+
+def test_b0_rules_refused():
+    with pytest.raises(ValueError):
+        make(rule='B0/S8')
@@ -0,0 +1,35 @@
+import json
+
+import sweep
+
+
+def test_defaults_share_a_key():
+    assert sweep.run_key({'seed': 1}) == sweep.run_key({'seed': 1, 'gens': 100, 'mode': 'original'})
+    assert sweep.run_key({'seed': 1, 'rule': None}) == sweep.run_key({'seed': 1})
+    assert sweep.run_key({'seed': 1}) != sweep.run_key({'seed': 1, 'gens': 101})
+    assert sweep.run_key({'seed': 1}) != sweep.run_key({'seed': 2})
+
+
+def test_expand_size():
+    runs = sweep.expand({'seed': [1, 2], 'size': 16, 'gens': 5})
+    assert runs == [{'gens': 5, 'rows': 16, 'cols': 16, 'seed': 1}, {'gens': 5, 'rows': 16, 'cols': 16, 'seed': 2}]
+
+
+def test_second_sweep_comes_from_the_cache(tmp_path):
+    output, cache = str(tmp_path / 'out.jsonl'), str(tmp_path / 'cache.jsonl')
+    grid = {'seed': [1, 2], 'size': 16, 'gens': 5}
+    first = sweep.sweep(grid, output, cache, workers=1)
+    assert [line['cached'] for line in first] == [False, False]
+
+    # one more seed, and mode given at its default for the runs already done
+    second = sweep.sweep({'seed': [1, 2, 3], 'size': 16, 'gens': 5, 'mode': 'original'}, output, cache, workers=1)
+    cached = {line['params']['seed']: line['cached'] for line in second}
+    assert cached == {1: True, 2: True, 3: False}
+    by_seed = {line['params']['seed']: line for line in first}
+    for line in second:
+        if line['cached']:
+            assert line['generations'] == by_seed[line['params']['seed']]['generations']
+            assert line['population'] == by_seed[line['params']['seed']]['population']
+
+    with open(output) as f:
+        assert len([json.loads(line) for line in f]) == 5